@@ -1,16 +1,35 @@
+import logging
+import os
+import threading
+
 from fastapi import APIRouter, Depends, HTTPException
 from models.cluster_models import ClusterRequest, ClusterResponse
 from services.cluster_service import ClusterService
 
 router = APIRouter(prefix="/cluster", tags=["cluster"])
 
+ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts")
+
 _service: ClusterService | None = None
+_service_lock = threading.Lock()
 
-def get_service() -> ClusterService:
+def load_service() -> ClusterService:
+    # built by the startup warm-up, or by the first request that needs it
+    global _service
     if _service is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
+        with _service_lock:
+            if _service is None:
+                _service = ClusterService(ARTIFACTS_DIR)
+                logging.info("ClusterService loaded successfully")
     return _service
 
+def get_service() -> ClusterService:
+    try:
+        return load_service()
+    except Exception as e:
+        logging.exception(f"Failed to load ClusterService: {e}")
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
 @router.post("/predict", response_model=ClusterResponse)
 def predict(req: ClusterRequest, svc: ClusterService = Depends(get_service)):
     # convert Pydantic model to dict
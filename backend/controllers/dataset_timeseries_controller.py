@@ -18,7 +18,7 @@ from models.stock_model import (
     StockPriceResponse,
     LatestSnapshotResponse,
 )
-from services.dataset_time_series_service import DatasetTimeSeriesService
+from services.dataset_time_series_service import get_dataset_service
 from services import far_service
 from schemas import DatasetRecommendationsResponse, DatasetRecommendationItem
 
@@ -26,7 +26,7 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/dataset/timeseries", tags=["dataset time series"])
 
-dataset_service = DatasetTimeSeriesService()
+dataset_service = get_dataset_service()
 
 LATEST_AVAILABLE_DATE: date = date(2022, 11, 29)
 
@@ -43,6 +43,11 @@ def list_datasets():
     })
 
 
+@router.get("/cache-stats")
+def cache_stats():
+    return {"cohorts": far_service.cohort_cache_stats()}
+
+
 @router.get("/transactions/{customer_id}")
 def get_transactions(customer_id: str):
     rows = far_service.get_customer_transactions(customer_id)
@@ -149,3 +154,16 @@ def risk_return_matrix(req: RiskReturnMatrixRequest):
 @router.post("/affinity-matrix")
 def affinity_matrix(req: AffinityMatrixRequest):
     return _clean(far_service.get_affinity_matrix(req.filters.model_dump(exclude_none=True), req.attributes, req.asset_column))
+
+
+@router.post("/dashboard")
+def dashboard(req: DashboardRequest):
+    """
+    Compute several dashboard panels for one set of filters in a single round trip.
+
+    Each panel takes the parameters of its single endpoint (e.g. ``top_n`` for
+    ``top_assets``, ``column``/``bins`` for ``histogram``) and is returned under its
+    ``id`` (or its type) with either ``data`` or an ``error``.
+    """
+    panels = [panel.model_dump(exclude_none=True) for panel in req.panels]
+    return _clean(far_service.get_dashboard(req.filters.model_dump(exclude_none=True), panels))
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from models.recommendation_model import (
+    BatchRecommendationRequest,
+    BatchRecommendationResponse,
     PortfolioAllocationRequest,
     PortfolioAllocationResponse,
     RecommendationRequest,
     RecommendationResponse,
 )
-from services.recommendation_service import get_recommendations
+from services.recommendation_service import get_recommendations, get_recommendations_batch
 from services.markowitz_service import allocate_recommendation_shares
 
 router = APIRouter(prefix="/api/recommendation", tags=["recommendation"])
@@ -22,6 +24,19 @@ def recommend_assets(req: RecommendationRequest):
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post("/recommend-batch", response_model=BatchRecommendationResponse)
+def recommend_assets_batch(req: BatchRecommendationRequest):
+    outcomes = get_recommendations_batch(
+        [(item.customer_id, item.existing_portfolio, item.cluster_id) for item in req.customers]
+    )
+    return {
+        "results": [
+            {"customer_id": item.customer_id, "recommendations": recs, "error": error}
+            for item, (recs, error) in zip(req.customers, outcomes)
+        ]
+    }
+
+
 @router.post("/allocate", response_model=PortfolioAllocationResponse)
 def allocate_portfolio(req: PortfolioAllocationRequest):
     try:
@@ -1,15 +1,15 @@
 import logging
 from fastapi import APIRouter, HTTPException, status
-from typing import Dict, List
-import logging
-from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict
 
 from models.sentiment_model import (
     NewsSentimentRequest, NewsSentimentResponse,
-    SymbolSentiment, HeadlineSentiment
+    SymbolSentiment
 )
 from services.news_service import NewsService
 from services.sentiment_service import SentimentService
+from services.sentiment_snapshots import sentiment_snapshots
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/sentiment", tags=["news & sentiment"])
@@ -24,56 +24,62 @@ async def news_sentiment(request: NewsSentimentRequest):
     if not request.symbols:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No symbols provided")
 
-    sentiments: Dict[str, SymbolSentiment] = {}
-
-    for raw_symbol in request.symbols:
-        symbol = raw_symbol.upper()
+    # First use imports nltk and may download the lexicon: keep that off the event loop.
+    if not SentimentService.is_loaded():
         try:
-            headlines_raw = NewsService.get_news(symbol, limit=request.max_headlines_per_symbol)
+            await run_in_threadpool(SentimentService.analyzer)
         except Exception as e:
-            logger.error("Failed to get news for %s: %s", symbol, e)
-            headlines_raw = []
+            logger.error("Sentiment analyzer unavailable: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Sentiment analyzer unavailable",
+            )
+
+    limit = request.max_headlines_per_symbol
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in request.symbols))
+
+    # Watchlist symbols with a fresh background snapshot need no upstream call.
+    snapshots = {}
+    for symbol in symbols:
+        snapshot = sentiment_snapshots.get(symbol, limit)
+        if snapshot is not None:
+            snapshots[symbol] = snapshot
+
+    # Fetch the remaining symbols' news concurrently; symbols that fail or time out come
+    # back as None and are reported as neutral instead of failing the whole request.
+    live = [symbol for symbol in symbols if symbol not in snapshots]
+    news = await NewsService.get_news_many(live, limit=limit) if live else {}
 
-        scored: List[HeadlineSentiment] = []
-        for item in headlines_raw:
-            comp = SentimentService.score_headline(item.get("title") or "")
-            scored.append(HeadlineSentiment(
-                title=item.get("title") or "",
-                score=comp,
-                score100=SentimentService.to_score100(comp),
-                label=SentimentService.to_label(comp),
-                url=item.get("link"),
-                source=item.get("publisher"),
-                published_at=item.get("published_at"),
-            ))
+    # Many symbols share market-wide headlines: score each distinct title once.
+    headline_lists = [items for items, _ in snapshots.values()] + [items or [] for items in news.values()]
+    scores = SentimentService.score_headlines(
+        item.get("title") or "" for items in headline_lists for item in items
+    )
 
-        # Choose a representative "picked" headline:
-        # priority: newest; tie-breaker: highest absolute sentiment
-        picked = None
-        if scored:
-            scored_sorted = sorted(
-                scored,
-                key=lambda h: (
-                    h.published_at or datetime.min,  # newest first
-                    abs(h.score),                    # stronger sentiment
-                ),
-                reverse=True
+    sentiments: Dict[str, SymbolSentiment] = {}
+    for symbol in symbols:
+        if symbol in snapshots:
+            items, as_of = snapshots[symbol]
+            sentiments[symbol] = SentimentService.summarize(
+                symbol, items, scores, from_snapshot=True, as_of=as_of
             )
-            picked = scored_sorted[0]
-            # summary could be mean of most recent 3 or picked only; keep simple:
-            summary_score100 = picked.score100
-            summary_label = picked.label
         else:
-            summary_score100 = 0
-            summary_label = "Neutral"
-
-        sentiments[symbol] = SymbolSentiment(
-            symbol=symbol,
-            summary_label=summary_label,
-            summary_score100=summary_score100,
-            direction=SentimentService.direction_from_score(summary_score100),
-            picked_headline=picked,
-            headlines=scored
-        )
+            items = news.get(symbol)
+            sentiments[symbol] = SentimentService.summarize(
+                symbol, items or [], scores, timed_out=items is None
+            )
 
     return NewsSentimentResponse(sentiments=sentiments)
+
+
+@router.get(
+    "/cache-stats",
+    summary="News cache statistics",
+    description="Hit counts of the headline cache and sentiment memo, and snapshot freshness."
+)
+async def news_cache_stats():
+    return {
+        "news": NewsService.cache_stats(),
+        "sentiment": SentimentService.cache_stats(),
+        "snapshots": sentiment_snapshots.stats(),
+    }
@@ -2,6 +2,7 @@ import logging
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 
 from models.stock_model import (
     BatchStockPriceRequest,
@@ -56,6 +57,18 @@ async def search_stocks(q: str, limit: int = 10):
         )
 
 
+@router.get(
+    "/cache-stats",
+    summary="Quote cache statistics",
+    description="Hit rates per cached field, coalesced upstream calls and store size.",
+)
+async def get_cache_stats():
+    """
+    Report quote cache statistics.
+    """
+    return yfinance_service.cache_stats()
+
+
 @router.get(
     "/{symbol}",
     response_model=StockPriceResponse,
@@ -71,7 +84,7 @@ async def get_stock_price(symbol: str):
     Get the real-time stock price for the requested symbol.
     """
     try:
-        price_data = yfinance_service.get_realtime_stock_data(symbol)
+        price_data = await run_in_threadpool(yfinance_service.get_realtime_stock_data, symbol)
         return StockPriceResponse(**price_data)
     except ValueError as error:
         raise HTTPException(
@@ -107,7 +120,9 @@ async def get_batch_realtime_prices(request: BatchStockPriceRequest):
                 detail="No symbols provided",
             )
 
-        prices = yfinance_service.get_batch_realtime_prices(request.symbols)
+        prices = await run_in_threadpool(
+            yfinance_service.get_batch_realtime_prices, request.symbols
+        )
         return BatchStockPriceResponse(prices=prices)
     except HTTPException:
         raise
@@ -156,7 +171,9 @@ async def get_historical_price(
                 detail="Date cannot be in the future.",
             )
 
-        historical_data = yfinance_service.get_historical_price(symbol, target_date)
+        historical_data = await run_in_threadpool(
+            yfinance_service.get_historical_price, symbol, target_date
+        )
 
         return HistoricalPriceResponse(
             symbol=symbol.upper(),
@@ -239,7 +256,8 @@ async def get_historical_series(request: HistoricalSeriesRequest):
                 detail="startDate cannot be after endDate.",
             )
 
-        series_data = yfinance_service.get_historical_series(
+        series_data = await run_in_threadpool(
+            yfinance_service.get_historical_series,
             request.symbols,
             start_date=start_date,
             end_date=end_date,
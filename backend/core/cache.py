@@ -0,0 +1,247 @@
+"""Small in-process caches shared by the services."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def canonical_key(payload: Any) -> str:
+  """
+  Stable hash of a JSON-like payload (e.g. a filters dict).
+
+  Dict keys are sorted, ``None`` entries and empty containers are dropped, and lists
+  are sorted, so payloads that select the same data hash to the same key.
+  """
+
+  def normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+      items = {str(k): normalize(v) for k, v in value.items()}
+      return {k: v for k, v in items.items() if v is not None and v != [] and v != {}}
+    if isinstance(value, (list, tuple, set, frozenset)):
+      return sorted((normalize(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True, default=str))
+    return value
+
+  encoded = json.dumps(normalize(payload), sort_keys=True, default=str, separators=(",", ":"))
+  return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+  """
+  Thread-safe LRU cache whose entries also expire after ``ttl_seconds``.
+
+  ``maxsize`` bounds the number of entries (least recently used is evicted first);
+  ``ttl_seconds <= 0`` disables expiry. ``set`` can override the TTL per entry.
+  Hit/miss/eviction counters are kept for ``stats()``.
+  """
+
+  def __init__(self, maxsize: int = 256, ttl_seconds: float = 0.0, name: str = "") -> None:
+    self.name = name
+    self.maxsize = max(1, int(maxsize))
+    self.ttl_seconds = float(ttl_seconds)
+    self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def get(self, key: Hashable, default: Any = None) -> Any:
+    now = time.monotonic()
+    with self._lock:
+      entry = self._data.get(key, _MISSING)
+      if entry is _MISSING or now > entry[0]:
+        if entry is not _MISSING:
+          del self._data[key]
+        self.misses += 1
+        return default
+      self._data.move_to_end(key)
+      self.hits += 1
+      return entry[1]
+
+  def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+    ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+    expires_at = time.monotonic() + ttl if ttl > 0 else float("inf")
+    with self._lock:
+      self._data[key] = (expires_at, value)
+      self._data.move_to_end(key)
+      while len(self._data) > self.maxsize:
+        self._data.popitem(last=False)
+        self.evictions += 1
+
+  def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the cached value for ``key`` or compute, store and return ``factory()``."""
+    value = self.get(key, _MISSING)
+    if value is _MISSING:
+      value = factory()
+      self.set(key, value)
+    return value
+
+  def clear(self) -> None:
+    with self._lock:
+      self._data.clear()
+
+  def __len__(self) -> int:
+    return len(self._data)
+
+  def stats(self) -> Dict[str, Optional[float]]:
+    lookups = self.hits + self.misses
+    return {
+      "size": len(self._data),
+      "maxsize": self.maxsize,
+      "ttl_seconds": self.ttl_seconds,
+      "hits": self.hits,
+      "misses": self.misses,
+      "evictions": self.evictions,
+      "hit_rate": (self.hits / lookups) if lookups else None,
+    }
+
+
+class _Call:
+  def __init__(self) -> None:
+    self.done = threading.Event()
+    self.value: Any = None
+    self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+  """
+  Coalesces concurrent loads of the same key.
+
+  While a key is being loaded, other callers asking for it wait for that load and
+  share its result (or its exception) instead of starting their own.
+  """
+
+  def __init__(self) -> None:
+    self._lock = threading.Lock()
+    self._calls: Dict[Hashable, _Call] = {}
+    self.leaders = 0
+    self.coalesced = 0
+
+  def do_many(self, keys: Iterable[Hashable], load: Callable[[List[Hashable]], Dict[Hashable, Any]]) -> Dict[Hashable, Any]:
+    """
+    Values for ``keys``; ``load(keys)`` is called once for the keys nobody else is loading.
+
+    Keys ``load`` leaves out of its result map to ``None``.
+    """
+    owned: Dict[Hashable, _Call] = {}
+    joined: Dict[Hashable, _Call] = {}
+    with self._lock:
+      for key in dict.fromkeys(keys):
+        call = self._calls.get(key)
+        if call is None:
+          owned[key] = self._calls[key] = _Call()
+        else:
+          joined[key] = call
+      self.coalesced += len(joined)
+      self.leaders += 1 if owned else 0
+
+    if owned:
+      try:
+        values = load(list(owned))
+        for key, call in owned.items():
+          call.value = values.get(key)
+      except BaseException as error:
+        for call in owned.values():
+          call.error = error
+        raise
+      finally:
+        with self._lock:
+          for key, call in owned.items():
+            self._calls.pop(key, None)
+            call.done.set()
+
+    results: Dict[Hashable, Any] = {key: call.value for key, call in owned.items()}
+    for key, call in joined.items():
+      call.done.wait()
+      if call.error is not None:
+        raise call.error
+      results[key] = call.value
+    return results
+
+  def do(self, key: Hashable, load: Callable[[], Any]) -> Any:
+    return self.do_many([key], lambda keys: {key: load()})[key]
+
+
+class MemoryBackend:
+  """Per-process LRU store for the service-level caches (the default)."""
+
+  name = "memory"
+
+  def __init__(self, maxsize: int = 2048, name: str = "") -> None:
+    self._cache = TTLCache(maxsize=maxsize, name=name)
+
+  def get(self, key: str) -> Optional[Any]:
+    return self._cache.get(key)
+
+  def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+    self._cache.set(key, value, ttl_seconds=ttl_seconds)
+
+  def clear(self) -> None:
+    self._cache.clear()
+
+  def stats(self) -> Dict[str, Any]:
+    return {"backend": self.name, **self._cache.stats()}
+
+
+class RedisBackend:
+  """
+  Store shared by every worker through a Redis-compatible client.
+
+  Values must be JSON-serialisable; they are stored under ``prefix`` with the TTL as
+  expiry, so Redis handles eviction (configure ``maxmemory-policy allkeys-lru`` on
+  the server). Any client exposing ``get``/``set(ex=...)``/``scan_iter``/``delete``
+  works, e.g. ``fakeredis`` for local runs.
+  """
+
+  name = "redis"
+
+  def __init__(self, client: Any, prefix: str = "") -> None:
+    self._client = client
+    self._prefix = prefix
+
+  @classmethod
+  def from_url(cls, url: str, prefix: str = "") -> "RedisBackend":
+    import redis
+
+    client = redis.Redis.from_url(url)
+    client.ping()
+    return cls(client, prefix)
+
+  def get(self, key: str) -> Optional[Any]:
+    raw = self._client.get(self._prefix + key)
+    return None if raw is None else json.loads(raw)
+
+  def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+    self._client.set(self._prefix + key, json.dumps(value), ex=max(1, math.ceil(ttl_seconds)))
+
+  def clear(self) -> None:
+    keys = list(self._client.scan_iter(match=self._prefix + "*"))
+    if keys:
+      self._client.delete(*keys)
+
+  def stats(self) -> Dict[str, Any]:
+    return {"backend": self.name}
+
+
+def build_backend(kind: str, redis_url: str, maxsize: int, prefix: str):
+  """``RedisBackend`` when ``kind`` is ``"redis"`` and reachable, else a ``MemoryBackend``."""
+  if kind.lower() == "redis":
+    try:
+      return RedisBackend.from_url(redis_url, prefix)
+    except ImportError:
+      logger.warning(
+        "Redis cache %r needs the 'redis' package (pip install redis); using in-process cache", prefix
+      )
+    except Exception as error:
+      logger.warning("Redis cache %r unavailable (%s); using in-process cache", prefix, error)
+  return MemoryBackend(maxsize, name=prefix.rstrip(":"))
@@ -57,6 +57,245 @@ class Settings(BaseSettings):
     env="FIRESTORE_PORTFOLIO_COLLECTION",
     description="Sub-collection name under each user for portfolio items.",
   )
+  preload_recommendation_models: bool = Field(
+    default=True,
+    env="PRELOAD_RECOMMENDATION_MODELS",
+    description=(
+      "Load the NCF, LSTM and content-based pipelines in the startup warm-up, so /readyz waits for them; "
+      "off, they load on the first recommendation request."
+    ),
+  )
+  model_reload_check_seconds: float = Field(
+    default=30.0,
+    env="MODEL_RELOAD_CHECK_SECONDS",
+    description="How often loaded model pipelines check exported_models/ for changed files.",
+  )
+  warm_up_components: str = Field(
+    default="",
+    env="WARM_UP_COMPONENTS",
+    description=(
+      "Comma-separated warm-up components to load at startup (see GET /ready); empty loads all of them, "
+      "minus recommendation_models/far_positions when their PRELOAD_* flag is off."
+    ),
+  )
+  warm_up_workers: int = Field(
+    default=4,
+    env="WARM_UP_WORKERS",
+    description="Threads used to load warm-up components in parallel.",
+  )
+  warm_up_in_background: bool = Field(
+    default=True,
+    env="WARM_UP_IN_BACKGROUND",
+    description="Run the startup warm-up (VADER, cluster model, heavy imports, preloads) after the worker starts serving.",
+  )
+  preload_far_portfolios: bool = Field(
+    default=False,
+    env="PRELOAD_FAR_PORTFOLIOS",
+    description="Build every FAR customer's positions during startup instead of on the first portfolio request.",
+  )
+  far_cohort_cache_size: int = Field(
+    default=256,
+    env="FAR_COHORT_CACHE_SIZE",
+    description="Maximum number of filtered FAR cohorts (masks and transaction views) kept in memory.",
+  )
+  far_cohort_cache_ttl_seconds: float = Field(
+    default=900.0,
+    env="FAR_COHORT_CACHE_TTL_SECONDS",
+    description="Seconds a cached FAR cohort stays valid; 0 disables expiry.",
+  )
+  recommendation_inference_mode: str = Field(
+    default="eager",
+    env="RECOMMENDATION_INFERENCE_MODE",
+    description=(
+      "How the NCF and LSTM models run on CPU: eager, torchscript, quantized (dynamic int8) or "
+      "quantized_torchscript. Check the trade-off with `python -m services.torch_inference`."
+    ),
+  )
+  torch_num_threads: int = Field(
+    default=0,
+    env="TORCH_NUM_THREADS",
+    description="torch intra-op threads per worker process; 0 keeps torch's default.",
+  )
+  recommendation_backend: str = Field(
+    default="torch",
+    env="RECOMMENDATION_BACKEND",
+    description=(
+      "Runtime for the NCF and LSTM models: torch, or onnx to serve the graphs exported by "
+      "`python -m services.onnx_backend` through onnxruntime without importing torch."
+    ),
+  )
+  onnx_num_threads: int = Field(
+    default=0,
+    env="ONNX_NUM_THREADS",
+    description="onnxruntime intra-op threads per session; 0 keeps onnxruntime's default.",
+  )
+  recommendation_ensemble_workers: int = Field(
+    default=4,
+    env="RECOMMENDATION_ENSEMBLE_WORKERS",
+    description=(
+      "Threads shared by all requests to run the recommender models concurrently. Each request uses "
+      "up to two (one per ensemble member) and a timed-out model keeps its thread until it finishes, "
+      "so size it at about twice the concurrent recommendation requests per worker."
+    ),
+  )
+  recommendation_model_timeout_seconds: float = Field(
+    default=10.0,
+    env="RECOMMENDATION_MODEL_TIMEOUT_SECONDS",
+    description=(
+      "Budget per recommender model, counted from when it starts running (model loading and pool "
+      "queueing excluded); a model that exceeds it is left out of the ensemble average."
+    ),
+  )
+  far_dashboard_workers: int = Field(
+    default=4,
+    env="FAR_DASHBOARD_WORKERS",
+    description="Threads used to compute /api/far/dashboard panels in parallel.",
+  )
+  yfinance_fetch_workers: int = Field(
+    default=8,
+    env="YFINANCE_FETCH_WORKERS",
+    description="Threads used to fetch per-symbol yfinance history when a bulk download misses symbols.",
+  )
+  yfinance_symbol_timeout_seconds: float = Field(
+    default=10.0,
+    env="YFINANCE_SYMBOL_TIMEOUT_SECONDS",
+    description="Seconds a single symbol's yfinance fetch may take before it is reported as missing.",
+  )
+  yfinance_bulk_download: bool = Field(
+    default=True,
+    env="YFINANCE_BULK_DOWNLOAD",
+    description="Fetch multi-symbol requests with one yf.download call before falling back to per-symbol fetches.",
+  )
+  quote_cache_backend: str = Field(
+    default="memory",
+    env="QUOTE_CACHE_BACKEND",
+    description="Where cached quotes live: 'memory' (per process) or 'redis' (shared by all workers).",
+  )
+  quote_cache_redis_url: str = Field(
+    default="redis://localhost:6379/0",
+    env="QUOTE_CACHE_REDIS_URL",
+    description="Redis URL used when QUOTE_CACHE_BACKEND is 'redis'.",
+  )
+  quote_cache_size: int = Field(
+    default=2048,
+    env="QUOTE_CACHE_SIZE",
+    description="Maximum number of entries in the in-process quote cache.",
+  )
+  quote_price_ttl_seconds: float = Field(
+    default=15.0,
+    env="QUOTE_PRICE_TTL_SECONDS",
+    description="Seconds a cached real-time price is served before refetching.",
+  )
+  quote_name_ttl_seconds: float = Field(
+    default=60 * 60 * 24,
+    env="QUOTE_NAME_TTL_SECONDS",
+    description="Seconds a cached company name is served before refetching.",
+  )
+  quote_close_ttl_seconds: float = Field(
+    default=60 * 60 * 24,
+    env="QUOTE_CLOSE_TTL_SECONDS",
+    description="Seconds a cached historical close (for a date before today) is served before refetching.",
+  )
+  bar_store_enabled: bool = Field(
+    default=True,
+    env="BAR_STORE_ENABLED",
+    description="Persist fetched daily bars in SQLite and only download missing date ranges.",
+  )
+  bar_store_path: str = Field(
+    default="",
+    env="BAR_STORE_PATH",
+    description="SQLite file for the bar store; defaults to backend/cache/bars.sqlite.",
+  )
+  use_materialized_recommendations: bool = Field(
+    default=True,
+    env="USE_MATERIALIZED_RECOMMENDATIONS",
+    description="Serve recommendations precomputed by services.recommendation_store when they match the request.",
+  )
+  recommendation_store_path: str = Field(
+    default="",
+    env="RECOMMENDATION_STORE_PATH",
+    description="Parquet file of materialized recommendations; defaults to backend/cache/recommendations.parquet.",
+  )
+  news_fetch_concurrency: int = Field(
+    default=8,
+    env="NEWS_FETCH_CONCURRENCY",
+    description="Maximum number of symbols whose news is fetched at the same time.",
+  )
+  news_symbol_timeout_seconds: float = Field(
+    default=8.0,
+    env="NEWS_SYMBOL_TIMEOUT_SECONDS",
+    description="Seconds to wait for one symbol's news before returning the others without it.",
+  )
+  news_cache_backend: str = Field(
+    default="memory",
+    env="NEWS_CACHE_BACKEND",
+    description="Where cached headlines live: 'memory' (per process) or 'redis' (shared by all workers).",
+  )
+  news_cache_redis_url: str = Field(
+    default="redis://localhost:6379/0",
+    env="NEWS_CACHE_REDIS_URL",
+    description="Redis URL used when NEWS_CACHE_BACKEND is 'redis'.",
+  )
+  news_cache_size: int = Field(
+    default=512,
+    env="NEWS_CACHE_SIZE",
+    description="Maximum number of symbols kept in the in-process news cache.",
+  )
+  news_cache_ttl_seconds: float = Field(
+    default=300.0,
+    env="NEWS_CACHE_TTL_SECONDS",
+    description="Seconds cached headlines are served as fresh.",
+  )
+  news_cache_stale_seconds: float = Field(
+    default=3600.0,
+    env="NEWS_CACHE_STALE_SECONDS",
+    description="Seconds stale headlines may still be served while a background refresh runs.",
+  )
+  sentiment_cache_size: int = Field(
+    default=20000,
+    env="SENTIMENT_CACHE_SIZE",
+    description="Maximum number of headline sentiment scores memoised in memory.",
+  )
+  sentiment_snapshots_enabled: bool = Field(
+    default=False,
+    env="SENTIMENT_SNAPSHOTS_ENABLED",
+    description="Refresh news sentiment for a watchlist in the background and serve it without upstream calls.",
+  )
+  sentiment_watchlist: str = Field(
+    default="",
+    env="SENTIMENT_WATCHLIST",
+    description="Comma-separated symbols to precompute; defaults to Firestore portfolio symbols, then common_stocks.",
+  )
+  sentiment_watchlist_limit: int = Field(
+    default=50,
+    env="SENTIMENT_WATCHLIST_LIMIT",
+    description="Maximum number of watchlist symbols refreshed in the background.",
+  )
+  sentiment_refresh_seconds: float = Field(
+    default=300.0,
+    env="SENTIMENT_REFRESH_SECONDS",
+    description="Average seconds between background sentiment refreshes.",
+  )
+  sentiment_refresh_jitter: float = Field(
+    default=0.2,
+    env="SENTIMENT_REFRESH_JITTER",
+    description="Random +/- fraction applied to each refresh interval.",
+  )
+  sentiment_refresh_concurrency: int = Field(
+    default=4,
+    env="SENTIMENT_REFRESH_CONCURRENCY",
+    description="Maximum number of symbols fetched at once by the background refresh.",
+  )
+  sentiment_snapshot_depth: int = Field(
+    default=10,
+    env="SENTIMENT_SNAPSHOT_DEPTH",
+    description="Headlines kept per snapshot; requests for more headlines are served live.",
+  )
+  sentiment_snapshot_max_age_seconds: float = Field(
+    default=900.0,
+    env="SENTIMENT_SNAPSHOT_MAX_AGE_SECONDS",
+    description="Snapshots older than this are ignored and the symbol is fetched live.",
+  )
 
   model_config = SettingsConfigDict(
     env_file=".env",
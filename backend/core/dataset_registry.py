@@ -0,0 +1,166 @@
+"""
+Process-wide owner of the FAR dataset tables.
+
+Each table is parsed once (through ``core.dataset_store``) and kept in a single
+DataFrame; callers receive shallow views instead of their own copies. Copy-on-write
+is enabled so a caller that adds or overwrites columns on its view gets private
+copies of just those columns and never mutates the shared table.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from core.dataset_store import DATASET_DIRS, read_path, resolve_table_path
+
+logger = logging.getLogger(__name__)
+
+if int(pd.__version__.split(".")[0]) < 3:
+  # pandas 3 always behaves this way; older versions need the opt-in.
+  pd.set_option("mode.copy_on_write", True)
+
+Normalizer = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def _normalize_close_prices(df: pd.DataFrame) -> pd.DataFrame:
+  df = df.dropna(subset=[column for column in ("ISIN", "timestamp", "closePrice") if column in df.columns])
+  sort_columns = [column for column in ("ISIN", "timestamp") if column in df.columns]
+  if sort_columns:
+    df = df.sort_values(sort_columns, kind="mergesort")
+  return df.reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+  # Candidate dataset names, tried in order (first existing file wins).
+  candidates: Tuple[str, ...]
+  normalize: Optional[Normalizer] = None
+
+
+DEFAULT_TABLES: Dict[str, TableSpec] = {
+  "customers": TableSpec(
+    ("customer_information_with_engineered_df", "customer_information_engineered_kMeans"),
+  ),
+  "customer_clusters": TableSpec(("customer_information_engineered_kMeans",)),
+  "transactions": TableSpec(("transactions_df", "transactions")),
+  "customer_transactions": TableSpec(("customer_transactions",)),
+  "assets": TableSpec(
+    ("asset_information_with_engineered", "asset_infomration_with_engineered"),  # typo kept on purpose
+  ),
+  "asset_catalog": TableSpec(("asset_information",)),
+  "markets": TableSpec(("markets", "market_info")),
+  "close_prices": TableSpec(("close_prices", "asset_prices"), _normalize_close_prices),
+  "predictions": TableSpec(("processed_data/predictions",)),
+}
+
+
+@dataclass
+class _LoadedTable:
+  frame: pd.DataFrame
+  memory_bytes: int
+  load_seconds: float
+
+
+class DatasetRegistry:
+  """
+  Loads each dataset file at most once per process and hands out read-only views.
+
+  Tables are keyed by the file they resolve to, so two logical names backed by the
+  same file (e.g. ``customers`` falling back to the k-means export) share one frame.
+  """
+
+  def __init__(
+    self,
+    tables: Optional[Dict[str, TableSpec]] = None,
+    directories: Optional[Iterable[str]] = None,
+  ) -> None:
+    self._tables = dict(tables or DEFAULT_TABLES)
+    self._directories = list(directories or DATASET_DIRS)
+    self._loaded: Dict[str, _LoadedTable] = {}
+    self._lock = threading.Lock()
+
+  def names(self) -> List[str]:
+    return list(self._tables)
+
+  def path(self, name: str) -> Optional[str]:
+    """Return the file backing ``name``, or None when no candidate exists."""
+    spec = self._tables.get(name)
+    if spec is None:
+      raise KeyError(f"Unknown dataset: {name}")
+    for candidate in spec.candidates:
+      path = resolve_table_path(candidate, self._directories)
+      if path is not None:
+        return path
+    return None
+
+  def has(self, name: str) -> bool:
+    return self.path(name) is not None
+
+  def get(self, name: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Return a view of table ``name`` (optionally only ``columns``).
+
+    Raises ``FileNotFoundError`` when the dataset is missing.
+    """
+    frame = self._frame(name)
+    if columns is not None:
+      return frame[[column for column in columns if column in frame.columns]]
+    return frame.copy(deep=False)
+
+  def get_optional(self, name: str, columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+    if not self.has(name):
+      return None
+    return self.get(name, columns)
+
+  def memory_footprint(self) -> Dict[str, object]:
+    """Bytes held per loaded dataset file (deep, including string payloads)."""
+    with self._lock:
+      tables = {path: loaded.memory_bytes for path, loaded in self._loaded.items()}
+    return {"tables": tables, "total_bytes": sum(tables.values())}
+
+  def invalidate(self) -> None:
+    with self._lock:
+      self._loaded.clear()
+
+  def _frame(self, name: str) -> pd.DataFrame:
+    path = self.path(name)
+    if path is None:
+      candidates = ", ".join(self._tables[name].candidates)
+      raise FileNotFoundError(f"Dataset {name} not found (looked for {candidates})")
+
+    loaded = self._loaded.get(path)
+    if loaded is not None:
+      return loaded.frame
+
+    with self._lock:
+      loaded = self._loaded.get(path)
+      if loaded is None:
+        loaded = self._load(path, self._tables[name].normalize)
+        self._loaded[path] = loaded
+      return loaded.frame
+
+  @staticmethod
+  def _load(path: str, normalize: Optional[Normalizer]) -> _LoadedTable:
+    started = time.perf_counter()
+    frame = read_path(path)
+    if normalize is not None:
+      frame = normalize(frame)
+    load_seconds = time.perf_counter() - started
+    memory_bytes = int(frame.memory_usage(deep=True).sum())
+    logger.info(
+      "Loaded dataset %s (%d rows, %.1f MB) in %.2fs",
+      path,
+      len(frame),
+      memory_bytes / 1e6,
+      load_seconds,
+    )
+    return _LoadedTable(frame=frame, memory_bytes=memory_bytes, load_seconds=load_seconds)
+
+
+dataset_registry = DatasetRegistry()
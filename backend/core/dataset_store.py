@@ -0,0 +1,243 @@
+"""
+Typed, columnar access to the FAR datasets.
+
+Every loader goes through ``read_table``/``read_path`` so the same table is parsed the
+same way everywhere: ISIN/customer identifiers as categoricals, timestamps as
+datetime64 and prices as float32. When a ``<name>.parquet`` file sits next to the
+CSV it is read instead (with column projection); run the conversion once with::
+
+    python -m core.dataset_store            # converts backend/datasets in place
+    python -m core.dataset_store --force    # re-convert even if Parquet is newer
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DIRS = [
+  os.path.join(BACKEND_ROOT, "datasets"),
+  os.path.join(os.getcwd(), "datasets"),
+]
+
+# Sorted Parquet row groups keep each ISIN's rows contiguous, so min/max statistics
+# let readers skip whole groups when filtering by ISIN.
+DEFAULT_ROW_GROUP_SIZE = 250_000
+
+
+@dataclass(frozen=True)
+class TableSchema:
+  dtypes: Dict[str, str] = field(default_factory=dict)
+  sort_by: Tuple[str, ...] = ()
+
+
+_PRICE_SCHEMA = TableSchema(
+  dtypes={"ISIN": "category", "timestamp": "datetime", "closePrice": "float32"},
+  sort_by=("ISIN", "timestamp"),
+)
+_TRANSACTION_SCHEMA = TableSchema(
+  dtypes={
+    "customerID": "category",
+    "ISIN": "category",
+    "transactionType": "category",
+    "timestamp": "datetime",
+    "units": "float64",
+    "totalValue": "float64",
+  },
+  sort_by=("ISIN", "timestamp"),
+)
+_CUSTOMER_SCHEMA = TableSchema(
+  dtypes={"customerID": "category", "timestamp": "datetime", "lastQuestionnaireDate": "datetime"},
+  sort_by=("customerID",),
+)
+_ASSET_SCHEMA = TableSchema(
+  dtypes={
+    "ISIN": "str",
+    "assetName": "str",
+    "assetShortName": "str",
+    "marketID": "str",
+    "assetCategory": "str",
+    "assetSubCategory": "str",
+  },
+  sort_by=("ISIN",),
+)
+
+TABLE_SCHEMAS: Dict[str, TableSchema] = {
+  "close_prices": _PRICE_SCHEMA,
+  "predictions": _PRICE_SCHEMA,
+  "customer_transactions": _TRANSACTION_SCHEMA,
+  "transactions": _TRANSACTION_SCHEMA,
+  "transactions_df": _TRANSACTION_SCHEMA,
+  "customer_information_engineered_kMeans": _CUSTOMER_SCHEMA,
+  "customer_information_with_engineered_df": _CUSTOMER_SCHEMA,
+  "asset_information": _ASSET_SCHEMA,
+  "asset_information_with_engineered": _ASSET_SCHEMA,
+}
+
+
+def _table_name(path: str) -> str:
+  return os.path.splitext(os.path.basename(path))[0]
+
+
+def resolve_source(path: str) -> str:
+  """Return the file that ``read_path`` will actually read for ``path`` (Parquet sibling first)."""
+  stem, ext = os.path.splitext(path)
+  if ext.lower() == ".csv":
+    parquet_path = f"{stem}.parquet"
+    if os.path.exists(parquet_path):
+      return parquet_path
+  return path
+
+
+def resolve_table_path(name: str, directories: Optional[Iterable[str]] = None) -> Optional[str]:
+  """
+  Locate ``name`` (e.g. ``"close_prices"`` or ``"processed_data/predictions"``) in the
+  dataset directories, preferring Parquet over CSV.
+  """
+  for base in directories or DATASET_DIRS:
+    for ext in (".parquet", ".csv"):
+      candidate = os.path.join(base, f"{name}{ext}")
+      if os.path.exists(candidate):
+        return candidate
+  return None
+
+
+def _coerce(df: pd.DataFrame, schema: TableSchema) -> pd.DataFrame:
+  for column, dtype in schema.dtypes.items():
+    if column not in df.columns:
+      continue
+    series = df[column]
+    if dtype == "datetime":
+      if not pd.api.types.is_datetime64_any_dtype(series):
+        df[column] = pd.to_datetime(series, errors="coerce")
+    elif dtype == "category":
+      if not isinstance(series.dtype, pd.CategoricalDtype):
+        stripped = series.astype(str).str.strip()
+        df[column] = stripped.where(series.notna()).astype("category")
+    elif dtype == "str":
+      df[column] = series.astype(str).str.strip().where(series.notna())
+    elif series.dtype != dtype:
+      df[column] = pd.to_numeric(series, errors="coerce").astype(dtype)
+  return df
+
+
+def _read_csv(path: str, schema: TableSchema, columns: Optional[List[str]] = None) -> pd.DataFrame:
+  # Identifier columns are read as strings so codes like "0012..." keep their zeros.
+  string_columns = {
+    column: str
+    for column, dtype in schema.dtypes.items()
+    if dtype in ("str", "category") and (columns is None or column in columns)
+  }
+  df = pd.read_csv(path, usecols=columns, dtype=string_columns or None)
+  return _coerce(df, schema)
+
+
+def read_path(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+  """Read a dataset file (CSV or Parquet) with the table's typed schema applied."""
+  source = resolve_source(path)
+  schema = TABLE_SCHEMAS.get(_table_name(source), TableSchema())
+  wanted = list(columns) if columns else None
+
+  if source.endswith(".parquet"):
+    return _coerce(pd.read_parquet(source, columns=wanted), schema)
+  return _read_csv(source, schema, wanted)
+
+
+def read_table(
+  name: str,
+  columns: Optional[Sequence[str]] = None,
+  directories: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+  path = resolve_table_path(name, directories)
+  if path is None:
+    raise FileNotFoundError(f"Dataset {name} not found (looked for .parquet/.csv)")
+  return read_path(path, columns)
+
+
+# ---------- CSV -> Parquet conversion ----------
+def convert_csv_to_parquet(
+  csv_path: str,
+  parquet_path: Optional[str] = None,
+  row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> str:
+  """Convert one CSV into typed, sorted Parquet; writes atomically next to the CSV by default."""
+  parquet_path = parquet_path or f"{os.path.splitext(csv_path)[0]}.parquet"
+  schema = TABLE_SCHEMAS.get(_table_name(csv_path), TableSchema())
+
+  df = _read_csv(csv_path, schema)
+  sort_columns = [column for column in schema.sort_by if column in df.columns]
+  if sort_columns:
+    df = df.sort_values(sort_columns, kind="mergesort").reset_index(drop=True)
+
+  tmp_path = f"{parquet_path}.tmp"
+  df.to_parquet(tmp_path, index=False, row_group_size=row_group_size)
+  os.replace(tmp_path, parquet_path)
+  return parquet_path
+
+
+def _conversion_candidates(datasets_dir: str) -> List[str]:
+  candidates = []
+  for base in (datasets_dir, os.path.join(datasets_dir, "processed_data")):
+    for name in TABLE_SCHEMAS:
+      csv_path = os.path.join(base, f"{name}.csv")
+      if os.path.exists(csv_path):
+        candidates.append(csv_path)
+  return candidates
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(
+    description="Convert the FAR CSV datasets into typed Parquet files next to them.",
+  )
+  parser.add_argument(
+    "--datasets-dir",
+    default=DATASET_DIRS[0],
+    help="Directory holding the CSV datasets (defaults to backend/datasets).",
+  )
+  parser.add_argument(
+    "--force",
+    action="store_true",
+    help="Re-convert even when the Parquet file is newer than its CSV.",
+  )
+  parser.add_argument(
+    "--row-group-size",
+    type=int,
+    default=DEFAULT_ROW_GROUP_SIZE,
+    help="Rows per Parquet row group.",
+  )
+  return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+  args = _parse_args(argv)
+  candidates = _conversion_candidates(args.datasets_dir)
+  if not candidates:
+    raise SystemExit(f"No known CSV datasets found under {args.datasets_dir}")
+
+  for csv_path in candidates:
+    parquet_path = f"{os.path.splitext(csv_path)[0]}.parquet"
+    if (
+      not args.force
+      and os.path.exists(parquet_path)
+      and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    ):
+      print(f"skip     {csv_path} (Parquet is up to date)")
+      continue
+
+    try:
+      convert_csv_to_parquet(csv_path, parquet_path, row_group_size=args.row_group_size)
+    except Exception as exc:
+      raise SystemExit(f"Conversion failed for {csv_path}: {exc}") from exc
+
+    csv_mb = os.path.getsize(csv_path) / 1e6
+    parquet_mb = os.path.getsize(parquet_path) / 1e6
+    print(f"convert  {csv_path} ({csv_mb:.1f} MB) -> {parquet_path} ({parquet_mb:.1f} MB)")
+
+
+if __name__ == "__main__":  # pragma: no cover
+  main()
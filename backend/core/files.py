@@ -0,0 +1,16 @@
+import os
+from typing import Iterable, Optional, Tuple
+
+FileSignature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+def file_signature(paths: Iterable[str]) -> FileSignature:
+  """Return (path, mtime_ns, size) for every file; missing files map to None so they still compare."""
+  signature = []
+  for path in paths:
+    try:
+      stat = os.stat(path)
+      signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    except OSError:
+      signature.append((str(path), None, None))
+  return tuple(signature)
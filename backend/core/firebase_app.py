@@ -1,16 +1,22 @@
+from __future__ import annotations
+
 import os
 from functools import lru_cache
-from typing import Any, Dict, Optional
-
-import firebase_admin
-from firebase_admin import auth as firebase_auth
-from firebase_admin import credentials, firestore
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from core.config import settings
 
+# firebase_admin (and the Firestore client it pulls in) is imported on first use
+# so routers can be registered without paying for it at startup.
+if TYPE_CHECKING:  # pragma: no cover
+  import firebase_admin
+  from firebase_admin import credentials, firestore
+
 
 def _build_credentials() -> Optional[credentials.Base]:
   """Create Firebase credentials from configured sources."""
+  from firebase_admin import credentials
+
   cred_path = settings.firebase_credentials_file
   if cred_path:
     resolved_path = os.path.abspath(cred_path)
@@ -28,6 +34,8 @@ def _build_credentials() -> Optional[credentials.Base]:
 @lru_cache(maxsize=1)
 def get_firebase_app() -> firebase_admin.App:
   """Initialise (once) and return the Firebase Admin app."""
+  import firebase_admin
+
   if firebase_admin._apps:  # type: ignore[attr-defined]
     return firebase_admin.get_app()
 
@@ -45,23 +53,31 @@ def get_firebase_app() -> firebase_admin.App:
 @lru_cache(maxsize=1)
 def get_firestore_client() -> firestore.Client:
   """Return the Firestore client bound to our Firebase app."""
+  from firebase_admin import firestore
+
   app = get_firebase_app()
   return firestore.client(app=app)
 
 
 def verify_firebase_token(token: str) -> Dict[str, Any]:
   """Verify an incoming Firebase ID token and return its claims."""
+  from firebase_admin import auth as firebase_auth
+
   app = get_firebase_app()
   return firebase_auth.verify_id_token(token, app=app)
 
 
 def get_firebase_user(uid: str):
   """Fetch Firebase auth user record."""
+  from firebase_admin import auth as firebase_auth
+
   app = get_firebase_app()
   return firebase_auth.get_user(uid, app=app)
 
 
 def set_firebase_user_display_name(uid: str, display_name: str) -> None:
   """Update a Firebase user's display name."""
+  from firebase_admin import auth as firebase_auth
+
   app = get_firebase_app()
   firebase_auth.update_user(uid, display_name=display_name, app=app)
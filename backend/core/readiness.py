@@ -0,0 +1,49 @@
+"""
+Which subsystems of this worker are warm.
+
+Heavy libraries (torch, cvxpy, nltk, ...) and the datasets load on first use or in
+the startup warm-up, so a worker starts serving before everything is in memory.
+Subsystems register a cheap ``check`` callable; ``report`` evaluates them all.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ("torch", "onnxruntime", "cvxpy", "sklearn", "yfinance", "nltk", "firebase_admin")
+
+
+class Readiness:
+  def __init__(self) -> None:
+    self._lock = threading.Lock()
+    self._checks: Dict[str, Callable[[], bool]] = {}
+
+  def register(self, name: str, check: Callable[[], bool]) -> None:
+    with self._lock:
+      self._checks[name] = check
+
+  def _check(self, name: str, check: Callable[[], bool]) -> bool:
+    try:
+      return bool(check())
+    except Exception as error:
+      logger.warning("Readiness check %s failed: %s", name, error)
+      return False
+
+  def report(self) -> Dict[str, object]:
+    """``{"ready": bool, "subsystems": {name: warm}, "modules": {module: imported}}``."""
+    with self._lock:
+      checks = dict(self._checks)
+    subsystems = {name: self._check(name, check) for name, check in checks.items()}
+    return {
+      "ready": all(subsystems.values()),
+      "subsystems": subsystems,
+      "modules": {module: module in sys.modules for module in HEAVY_MODULES},
+    }
+
+
+readiness = Readiness()
@@ -0,0 +1,148 @@
+"""
+Startup warm-up: loads the expensive parts of the app before traffic needs them.
+
+Components are independent loaders (a dataset, a model pipeline, a heavy import)
+run in parallel on a small thread pool. Each records its state, wall time and the
+change in process RSS while it ran; with several components loading at once the
+RSS figure is only indicative. The warm-up counts as done once every selected
+component has finished, failed ones included; a failure is reported and retried by
+the first request that needs it. Whether the failed subsystem keeps the worker out
+of rotation meanwhile is up to its own readiness check.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def current_rss_bytes() -> Optional[int]:
+  """Resident set size of this process (Linux ``/proc``), or ``None`` where unavailable."""
+  try:
+    with open("/proc/self/statm") as statm:
+      return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+  except (OSError, ValueError, IndexError):
+    return None
+
+
+@dataclass
+class ComponentStatus:
+  state: str = PENDING
+  started_at: Optional[float] = None
+  seconds: Optional[float] = None
+  rss_delta_bytes: Optional[int] = None
+  error: Optional[str] = None
+
+
+class WarmUp:
+  def __init__(self, workers: int = 4) -> None:
+    self.workers = max(1, int(workers))
+    self._lock = threading.Lock()
+    self._loaders: Dict[str, Callable[[], Any]] = {}
+    self._selected: List[str] = []
+    self._status: Dict[str, ComponentStatus] = {}
+    self._thread: Optional[threading.Thread] = None
+    self._started_at: Optional[float] = None
+    self._finished_at: Optional[float] = None
+
+  def register(self, name: str, load: Callable[[], Any]) -> None:
+    self._loaders[name] = load
+
+  def names(self) -> List[str]:
+    return list(self._loaders)
+
+  def _select(self, names: Optional[Iterable[str]]) -> List[str]:
+    selected = list(self._loaders) if names is None else list(dict.fromkeys(names))
+    unknown = [name for name in selected if name not in self._loaders]
+    if unknown:
+      logger.warning("Ignoring unknown warm-up components: %s", ", ".join(unknown))
+    return [name for name in selected if name in self._loaders]
+
+  def _load(self, name: str) -> None:
+    status = self._status[name]
+    status.state = LOADING
+    status.started_at = time.time()
+    rss_before = current_rss_bytes()
+    started = time.perf_counter()
+    try:
+      self._loaders[name]()
+      status.state = READY
+    except Exception as error:
+      logger.exception("Warm-up component %s failed: %s", name, error)
+      status.state = FAILED
+      status.error = str(error)
+    status.seconds = time.perf_counter() - started
+    rss_after = current_rss_bytes()
+    if rss_before is not None and rss_after is not None:
+      status.rss_delta_bytes = rss_after - rss_before
+    logger.info("Warm-up: %s %s in %.2fs", name, status.state, status.seconds)
+
+  def run(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Load the ``names`` components (all registered ones by default) and wait for them."""
+    with self._lock:
+      self._selected = self._select(names)
+      self._status = {name: ComponentStatus() for name in self._selected}
+      self._started_at = time.time()
+      self._finished_at = None
+    if self._selected:
+      with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="warm-up") as executor:
+        list(executor.map(self._load, self._selected))
+    self._finished_at = time.time()
+    report = self.status()
+    logger.info(
+      "Warm-up finished in %.2fs (%d failed)",
+      self._finished_at - self._started_at,
+      len(report["failed"]),
+    )
+    return report
+
+  def start(self, names: Optional[Iterable[str]] = None) -> None:
+    """``run`` on a daemon thread so the worker can answer health checks meanwhile."""
+    if self._thread is not None and self._thread.is_alive():
+      return
+    with self._lock:
+      # Select up front so readiness reflects the components before the thread runs.
+      self._selected = self._select(names)
+      self._status = {name: ComponentStatus() for name in self._selected}
+    self._thread = threading.Thread(target=self.run, args=(self._selected,), name="warm-up", daemon=True)
+    self._thread.start()
+
+  def ready(self) -> bool:
+    with self._lock:
+      status = dict(self._status)
+    return self._started_at is not None and all(
+      component.state in (READY, FAILED) for component in status.values()
+    )
+
+  def status(self) -> Dict[str, Any]:
+    with self._lock:
+      status = dict(self._status)
+    return {
+      "ready": self.ready(),
+      "started_at": self._started_at,
+      "finished_at": self._finished_at,
+      "seconds": (self._finished_at - self._started_at) if self._finished_at and self._started_at else None,
+      "rss_bytes": current_rss_bytes(),
+      "failed": [name for name, component in status.items() if component.state == FAILED],
+      "components": {
+        name: {
+          "state": component.state,
+          "seconds": component.seconds,
+          "rss_delta_bytes": component.rss_delta_bytes,
+          "error": component.error,
+        }
+        for name, component in status.items()
+      },
+    }
@@ -1,8 +1,7 @@
 import logging
-import os
-import nltk
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from controllers import (
@@ -15,13 +14,86 @@ from controllers import (
     cluster_controller,
     recommendation_controller
 )
-from services.cluster_service import ClusterService 
+from core.config import settings
+from core.dataset_registry import dataset_registry
+from core.readiness import readiness
+from core.warmup import WarmUp
+from models.forecast_sharpe_ratio import get_sharpe_engine
+from services import far_service
+from services.dataset_time_series_service import get_dataset_service
+from services.position_engine import position_book
+from services.sentiment_service import SentimentService
+from services.sentiment_snapshots import sentiment_snapshots
+import models_integration
 
-def ensure_vader():
-    try:
-        nltk.data.find('sentiment/vader_lexicon.zip')
-    except LookupError:
-        nltk.download('vader_lexicon', quiet=True)
+# Routers only import light modules; torch/onnxruntime, cvxpy, sklearn, yfinance,
+# nltk and firebase_admin are imported where they are used, and the datasets load on
+# first access. The warm-up below pulls the expensive parts in after the worker is up.
+
+def _import_module(name):
+    return lambda: __import__(name)
+
+
+def _preload_recommendation_models():
+    failures = {
+        name: error
+        for name, error in models_integration.model_registry.preload().items()
+        if error
+    }
+    if failures:
+        raise RuntimeError(f"Some recommendation models failed to preload: {failures}")
+
+
+def _load_sharpe_ratios():
+    get_sharpe_engine(
+        predictions_path=models_integration.ARIMA_PREDICTIONS_PATH,
+        covariance_path=models_integration.ARIMA_COVARIANCE_PATH,
+        close_prices_path=models_integration.CLOSE_PRICES_PATH,
+    ).load()
+
+
+warm_up = WarmUp(workers=settings.warm_up_workers)
+warm_up.register("sentiment", SentimentService.analyzer)
+warm_up.register("cluster_service", cluster_controller.load_service)
+warm_up.register("far_datasets", far_service.load_dataframes)
+warm_up.register("dataset_time_series", lambda: get_dataset_service().warm_up())
+warm_up.register(
+    "recommendation_datasets",
+    lambda: (models_integration.get_customer_clusters(), models_integration.get_isin_to_name()),
+)
+warm_up.register("sharpe_ratios", _load_sharpe_ratios)
+warm_up.register("recommendation_models", _preload_recommendation_models)
+warm_up.register("far_positions", position_book.load)
+warm_up.register("optimizer", _import_module("cvxpy"))
+warm_up.register("market_data", _import_module("yfinance"))
+warm_up.register("firebase", _import_module("firebase_admin"))
+
+
+def warm_up_components():
+    """``WARM_UP_COMPONENTS`` if set, else every component the preload flags allow."""
+    configured = [name.strip() for name in settings.warm_up_components.split(",") if name.strip()]
+    if configured:
+        return configured
+    skipped = set()
+    if not settings.preload_recommendation_models:
+        skipped.add("recommendation_models")
+    if not settings.preload_far_portfolios:
+        skipped.add("far_positions")
+    return [name for name in warm_up.names() if name not in skipped]
+
+
+# Live state of the subsystems a selected component warms: a component that failed
+# keeps the worker unready until the first request that needs it loads it after all.
+_subsystem_checks = {
+    "sentiment": SentimentService.is_loaded,
+    "cluster_service": lambda: cluster_controller._service is not None,
+    "recommendation_models": lambda: all(
+        status["loaded"] for status in models_integration.model_registry.status().values()
+    ),
+    "far_positions": lambda: position_book.loaded,
+}
+
+readiness.register("warm_up", warm_up.ready)
 
 # configure logging
 logging.basicConfig(
@@ -49,15 +121,24 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     logging.info("Running startup tasks...")
-    ensure_vader()
-    logging.info("VADER lexicon ensured.")
+    components = warm_up_components()
+    for name in components:
+        if name in _subsystem_checks:
+            readiness.register(name, _subsystem_checks[name])
+    if settings.warm_up_in_background:
+        warm_up.start(components)
+        logging.info("Warm-up started in the background: %s", ", ".join(components))
+    else:
+        warm_up.run(components)
 
-    artifcasts_dir = os.path.join(os.path.dirname(__file__), "artifacts")
-    try:
-        cluster_controller._service = ClusterService(artifcasts_dir)
-        logging.info("ClusterService loaded successfully")
-    except Exception as e:
-        logging.exception(f"Failed to load ClusterService: {e}")
+    if settings.sentiment_snapshots_enabled:
+        sentiment_snapshots.start()
+        logging.info("Background sentiment snapshots started")
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    sentiment_snapshots.stop()
 
 
 # ROUTERS HERE
@@ -88,9 +169,30 @@ async def health_check():
         "status": "healthy",
         "service": "Stock Portfolio API",
         "data_source": "Yahoo Finance (yfinance)",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "datasets": dataset_registry.memory_footprint(),
     }
 
+
+@app.get("/ready")
+async def ready():
+    """Which subsystems are warm (libraries imported, models and datasets loaded)"""
+    return {**readiness.report(), "warm_up": warm_up.status()}
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving, warm or not"""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness for the load balancer: 503 until the startup warm-up has finished"""
+    report = readiness.report()
+    body = {"ready": report["ready"], "subsystems": report["subsystems"], "warm_up": warm_up.status()}
+    return JSONResponse(body, status_code=200 if report["ready"] else 503)
+
 # uvicorn main:app --reload --port 8000
 if __name__ == "__main__":
     uvicorn.run(
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, NonNegativeInt
 from pydantic.types import NonNegativeInt
@@ -132,6 +132,38 @@ class AffinityMatrixRequest(BaseModel):
     asset_column: str = "preferred_asset_category"
 
 
+DashboardPanelType = Literal[
+    "metrics",
+    "top_assets",
+    "sector_prefs",
+    "activity_series",
+    "histogram",
+    "category_breakdown",
+    "risk_return_matrix",
+    "affinity_matrix",
+    "efficient_frontier",
+]
+
+
+class DashboardPanel(BaseModel):
+    """One dashboard panel; takes the same parameters as the matching single endpoint."""
+    type: DashboardPanelType
+    id: Optional[str] = Field(default=None, description="Key of this panel in the response (defaults to type)")
+    top_n: Optional[NonNegativeInt] = None
+    interval: Optional[str] = Field(default=None, pattern=r"^(day|week|month|quarter|year)$")
+    column: Optional[str] = None
+    bins: Optional[NonNegativeInt] = None
+    include_clusters: Optional[bool] = None
+    group_by: Optional[str] = None
+    attributes: Optional[List[str]] = None
+    asset_column: Optional[str] = None
+
+
+class DashboardRequest(BaseModel):
+    filters: FARFilters
+    panels: List[DashboardPanel]
+
+
 # responses
 class MetricsResponse(BaseModel):
     customers: int = 0
@@ -2,11 +2,204 @@ from __future__ import annotations
 
 import argparse
 import os
-from typing import Optional, Sequence
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
+from core.dataset_store import read_path, resolve_source
+from core.files import FileSignature, file_signature
+
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASETS_DIR = os.path.join(CURRENT_DIR, "..", "datasets")
+PROCESSED_DIR = os.path.join(DATASETS_DIR, "processed_data")
+
+
+def _default_path(filename: str, override: Optional[str]) -> str:
+    """
+    Resolve dataset files with backward-compatible fallbacks.
+    Prefer ``datasets/processed_data`` when the file exists there so the
+    service keeps working after data reshuffles.
+    """
+    if override:
+        return override
+
+    processed_candidate = os.path.join(PROCESSED_DIR, filename)
+    if os.path.exists(processed_candidate):
+        return processed_candidate
+    return os.path.join(DATASETS_DIR, filename)
+
+
+class _SharpeTable(NamedTuple):
+    index: Dict[str, int]
+    values: np.ndarray
+    predicted_isins: frozenset
+    history_isins: frozenset
+
+
+_EMPTY_TABLE = _SharpeTable({}, np.empty(0, dtype=float), frozenset(), frozenset())
+
+
+class SharpeRatioEngine:
+    """
+    Precomputed Sharpe ratio table for every ISIN in ``predictions.csv``.
+
+    The three source files are parsed once and the ratio for all ISINs is computed in a
+    single vectorised pass, then served from an ISIN -> position index. The table is
+    rebuilt whenever one of the source files changes on disk and published as one
+    immutable ``_SharpeTable``, so lookups never see half of a reload.
+    """
+
+    def __init__(self, predictions_path: str, covariance_path: str, close_prices_path: str) -> None:
+        self.predictions_path = predictions_path
+        self.covariance_path = covariance_path
+        self.close_prices_path = close_prices_path
+
+        self._lock = Lock()
+        self._signature: Optional[FileSignature] = None
+        self._table: _SharpeTable = _EMPTY_TABLE
+
+    # ---------- loading ----------
+    def _paths(self) -> Tuple[str, str, str]:
+        # Watch the files actually read, i.e. the Parquet copies once they exist.
+        return (
+            resolve_source(self.predictions_path),
+            resolve_source(self.close_prices_path),
+            self.covariance_path,
+        )
+
+    def _ensure_loaded(self) -> _SharpeTable:
+        signature = file_signature(self._paths())
+        if signature == self._signature:
+            return self._table
+
+        with self._lock:
+            if signature != self._signature:
+                self._table = self._build()
+                self._signature = signature
+            return self._table
+
+    @staticmethod
+    def _read_prices(path: str) -> pd.DataFrame:
+        prices = read_path(path, columns=["ISIN", "timestamp", "closePrice"])
+        prices["ISIN"] = prices["ISIN"].astype(object)
+        prices["closePrice"] = prices["closePrice"].astype(float)
+        return prices
+
+    def _build(self) -> _SharpeTable:
+        if not os.path.exists(resolve_source(self.predictions_path)):
+            raise FileNotFoundError(f"Predictions file not found at {self.predictions_path}.")
+        if not os.path.exists(resolve_source(self.close_prices_path)):
+            raise FileNotFoundError(f"Close price dataset not found at {self.close_prices_path}.")
+
+        predictions = self._read_prices(self.predictions_path)
+        predicted_isins = frozenset(predictions["ISIN"].dropna().unique())
+        predictions = predictions.dropna(subset=["closePrice"])
+        predictions = predictions.sort_values(["ISIN", "timestamp"], kind="mergesort")
+
+        history = self._read_prices(self.close_prices_path)
+        history = history.dropna(subset=["closePrice"])
+        history = history.sort_values(["ISIN", "timestamp"], kind="mergesort")
+        base_prices = history.groupby("ISIN")["closePrice"].last()
+
+        # Returns of the forecast path, anchored on the last observed close.
+        predictions = predictions[predictions["ISIN"].isin(base_prices.index)]
+        previous = predictions.groupby("ISIN")["closePrice"].shift(1)
+        previous = previous.fillna(predictions["ISIN"].map(base_prices))
+        returns = predictions["closePrice"] / previous - 1.0
+        mean_returns = returns.groupby(predictions["ISIN"]).mean().fillna(0.0)
+
+        covariance = pd.read_csv(self.covariance_path, index_col=0)
+        covariance.index = covariance.index.astype(str)
+        covariance.columns = covariance.columns.astype(str)
+        isins = mean_returns.index[
+            mean_returns.index.isin(covariance.index) & mean_returns.index.isin(covariance.columns)
+        ]
+        rows = covariance.index.get_indexer(isins)
+        cols = covariance.columns.get_indexer(isins)
+        cov_values = covariance.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        variance = np.maximum(cov_values[rows, cols], 0.0)
+        std_dev = np.sqrt(variance)
+
+        means = mean_returns.reindex(isins).to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(np.isclose(std_dev, 0.0), np.sign(means), means / std_dev)
+
+        return _SharpeTable(
+            index={isin: position for position, isin in enumerate(isins)},
+            values=sharpe.astype(float),
+            predicted_isins=predicted_isins,
+            history_isins=frozenset(base_prices.index),
+        )
+
+    # ---------- public API ----------
+    def load(self) -> None:
+        """Build the Sharpe table now instead of on the first lookup."""
+        self._ensure_loaded()
+
+    def get(self, isin: str) -> float:
+        """Return the Sharpe ratio for ``isin``; raises ``ValueError`` when it cannot be computed."""
+        if not isin:
+            raise ValueError("isin must be provided.")
+
+        table = self._ensure_loaded()
+        isin_str = str(isin)
+        position = table.index.get(isin_str)
+        if position is not None:
+            return float(table.values[position])
+
+        if isin_str not in table.predicted_isins:
+            raise ValueError(f"No predictions available for ISIN {isin_str}.")
+        if isin_str not in table.history_isins:
+            raise ValueError(f"No historical prices found for ISIN {isin_str}.")
+        raise ValueError(f"ISIN {isin_str} not found in covariance matrix.")
+
+    def get_many(self, isins: Sequence[str]) -> Dict[str, Optional[float]]:
+        """Return ``{isin: sharpe}`` for the requested ISINs, with ``None`` where unavailable."""
+        table = self._ensure_loaded()
+        results: Dict[str, Optional[float]] = {}
+        for isin in isins:
+            position = table.index.get(str(isin))
+            results[isin] = float(table.values[position]) if position is not None else None
+        return results
+
+    def as_dict(self) -> Dict[str, float]:
+        table = self._ensure_loaded()
+        return {isin: float(table.values[position]) for isin, position in table.index.items()}
+
+
+_engines: Dict[Tuple[str, str, str], SharpeRatioEngine] = {}
+_engines_lock = Lock()
+
+
+def get_sharpe_engine(
+    predictions_path: Optional[str] = None,
+    covariance_path: Optional[str] = None,
+    close_prices_path: Optional[str] = None,
+) -> SharpeRatioEngine:
+    """Return the shared engine for the resolved set of source files."""
+    key = (
+        os.path.abspath(_default_path("predictions.csv", predictions_path)),
+        os.path.abspath(_default_path("covariance.csv", covariance_path)),
+        os.path.abspath(_default_path("close_prices.csv", close_prices_path)),
+    )
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
+
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = SharpeRatioEngine(
+                predictions_path=key[0],
+                covariance_path=key[1],
+                close_prices_path=key[2],
+            )
+            _engines[key] = engine
+        return engine
+
 
 def forecast_sharpe_ratio(
     isin: str,
@@ -29,87 +222,11 @@ def forecast_sharpe_ratio(
     if not isin:
         raise ValueError("isin must be provided.")
 
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    datasets_dir = os.path.join(current_dir, "..", "datasets")
-    processed_dir = os.path.join(datasets_dir, "processed_data")
-
-    def _default_path(filename: str, override: Optional[str]) -> str:
-        """
-        Resolve dataset files with backward-compatible fallbacks.
-        Prefer ``datasets/processed_data`` when the file exists there so the
-        service keeps working after data reshuffles.
-        """
-        if override:
-            return override
-
-        processed_candidate = os.path.join(processed_dir, filename)
-        if os.path.exists(processed_candidate):
-            return processed_candidate
-        return os.path.join(datasets_dir, filename)
-
-    predictions_path = _default_path("predictions.csv", predictions_path)
-    covariance_path = _default_path("covariance.csv", covariance_path)
-    close_prices_path = _default_path("close_prices.csv", close_prices_path)
-
-    if not os.path.exists(predictions_path):
-        raise FileNotFoundError(f"Predictions file not found at {predictions_path}.")
-
-    predictions_df = pd.read_csv(predictions_path)
-    predictions_df["ISIN"] = predictions_df["ISIN"].astype(str)
-
-    isin_str = str(isin)
-    asset_predictions = predictions_df[predictions_df["ISIN"] == isin_str].copy()
-    if asset_predictions.empty:
-        raise ValueError(f"No predictions available for ISIN {isin_str}.")
-
-    asset_predictions["timestamp"] = pd.to_datetime(asset_predictions["timestamp"])
-    asset_predictions = asset_predictions.sort_values("timestamp")
-    predicted_prices = pd.to_numeric(asset_predictions["closePrice"], errors="coerce").dropna()
-    if predicted_prices.empty:
-        raise ValueError(f"Predictions for ISIN {isin_str} contain no valid price values.")
-
-    if not os.path.exists(close_prices_path):
-        raise FileNotFoundError(f"Close price dataset not found at {close_prices_path}.")
-
-    close_prices_df = pd.read_csv(close_prices_path)
-    close_prices_df["ISIN"] = close_prices_df["ISIN"].astype(str)
-    asset_history = close_prices_df.loc[close_prices_df["ISIN"] == isin_str, ["timestamp", "closePrice"]]
-    if asset_history.empty:
-        raise ValueError(f"No historical prices found for ISIN {isin_str}.")
-
-    asset_history["timestamp"] = pd.to_datetime(asset_history["timestamp"])
-    asset_history = asset_history.sort_values("timestamp")
-    historical_prices = pd.to_numeric(asset_history["closePrice"], errors="coerce").dropna()
-    if historical_prices.empty:
-        raise ValueError(f"No numeric historical prices found for ISIN {isin_str}.")
-
-    base_price = float(historical_prices.iloc[-1])
-    augmented_prices = pd.concat(
-        [pd.Series([base_price], dtype=float), predicted_prices.reset_index(drop=True)],
-        ignore_index=True,
-    )
-    predicted_returns = augmented_prices.pct_change().dropna()
-    mean_return = float(predicted_returns.mean()) if not predicted_returns.empty else 0.0
-
-    covariance_df = pd.read_csv(covariance_path, index_col=0)
-    if isin_str not in covariance_df.index or isin_str not in covariance_df.columns:
-        raise ValueError(f"ISIN {isin_str} not found in covariance matrix.")
-
-    variance = float(covariance_df.loc[isin_str, isin_str])
-    variance = max(variance, 0.0)
-    std_dev = float(np.sqrt(variance))
-
-    if np.isclose(std_dev, 0.0):
-        if mean_return > 0:
-            return 1.0
-        if mean_return < 0:
-            return -1.0
-        return 0.0
-
-    return float(mean_return / std_dev)
+    engine = get_sharpe_engine(predictions_path, covariance_path, close_prices_path)
+    return engine.get(isin)
 
 
-__all__ = ["forecast_sharpe_ratio"]
+__all__ = ["SharpeRatioEngine", "forecast_sharpe_ratio", "get_sharpe_engine"]
 
 
 def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
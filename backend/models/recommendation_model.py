@@ -10,6 +10,20 @@ class RecommendationResponse(BaseModel):
     recommendations: list  # list of [stock, score, sharpe]
 
 
+class BatchRecommendationRequest(BaseModel):
+    customers: List[RecommendationRequest]
+
+
+class BatchRecommendationResult(BaseModel):
+    customer_id: str
+    recommendations: Optional[list] = None  # list of [stock, assetName, score, sharpe]
+    error: Optional[str] = None
+
+
+class BatchRecommendationResponse(BaseModel):
+    results: List[BatchRecommendationResult]
+
+
 class PortfolioAllocationRequest(BaseModel):
     isins: List[str]
     investment_amount: float
@@ -26,6 +26,9 @@ class SymbolSentiment(BaseModel):
     direction: str  # 'up' | 'down' | 'flat' for icon mapping
     picked_headline: Optional[HeadlineSentiment] = None
     headlines: List[HeadlineSentiment] = []
+    timed_out: bool = False  # news could not be fetched in time; summary is neutral
+    from_snapshot: bool = False  # served from the background-refreshed snapshot
+    as_of: Optional[datetime] = None  # when the snapshot's headlines were fetched
 
 class NewsSentimentResponse(BaseModel):
     sentiments: Dict[str, SymbolSentiment]
\ No newline at end of file
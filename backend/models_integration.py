@@ -9,17 +9,25 @@ Original file is located at
 ## Import libraries
 """
 
+import copy
 import numpy as np
 import joblib
 import os
 import pandas as pd
-
-import torch
-import torch.nn as nn
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
 
 
 import os
 
+from core.config import settings
+from core.dataset_registry import dataset_registry
+from services.model_registry import ModelRegistry
+from services.top_k import CandidateIndex
+
 # PATH SETUP
 # Get directory of the current script
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -30,18 +38,35 @@ MODEL_PATH = os.path.join(CURRENT_DIR, 'exported_models')
 # LSTM hyperparameters JSON path
 HYPERPARAM_JSON_PATH = os.path.join(MODEL_PATH, 'lstm_hyperparams.json')
 
-# Path to customer dataset (to get customer clusters)
-CUSTOMER_DATASET_PATH = os.path.join(CURRENT_DIR, 'datasets', 'customer_information_engineered_kMeans.csv')
-ASSET_DATASET_PATH = os.path.join(CURRENT_DIR, 'datasets', 'asset_information_with_engineered.csv')
+# Customer clusters and asset names come from the shared dataset registry
+# (customer_information_engineered_kMeans / asset_information_with_engineered).
 
 ARIMA_COVARIANCE_PATH = os.path.join(CURRENT_DIR, 'datasets', 'processed_data', 'covariance.csv')
 ARIMA_PREDICTIONS_PATH = os.path.join(CURRENT_DIR, 'datasets', 'processed_data', 'predictions.csv')
 CLOSE_PRICES_PATH = os.path.join(CURRENT_DIR, 'datasets', 'close_prices.csv')
 
 
-# load asset dataset once to build mapping
-asset_df = pd.read_csv(ASSET_DATASET_PATH)
-isin_to_name = dict(zip(asset_df['ISIN'], asset_df['assetName']))
+# Datasets are read on first use rather than at import, so importing this module
+# (and registering the recommendation routes) stays cheap.
+@lru_cache(maxsize=1)
+def get_isin_to_name():
+    # load asset dataset once to build mapping
+    asset_df = dataset_registry.get('assets', columns=['ISIN', 'assetName'])
+    return dict(zip(asset_df['ISIN'], asset_df['assetName']))
+
+
+@lru_cache(maxsize=1)
+def get_customer_clusters():
+    return dataset_registry.get('customer_clusters', columns=['customerID', 'cluster'])
+
+
+def __getattr__(name):
+    # module attributes kept for callers that read them directly
+    if name == 'isin_to_name':
+        return get_isin_to_name()
+    if name in ('customers_df', 'customer_clusters_df'):
+        return get_customer_clusters()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 """## Loading exported
@@ -52,8 +77,9 @@ isin_to_name = dict(zip(asset_df['ISIN'], asset_df['assetName']))
 import os
 import numpy as np
 import joblib
-import torch
-import torch.nn as nn
+
+# torch is imported where it is used, so a process serving the ONNX backend
+# (RECOMMENDATION_BACKEND=onnx) never loads it.
 
 def setup_ncf_pipeline(model_path):
     """
@@ -69,6 +95,8 @@ def setup_ncf_pipeline(model_path):
         - bce_model
         - bpr_model
     """
+    import torch
+    import torch.nn as nn
 
     # ---------------------
     # 1. Feature arrays & mappings
@@ -150,44 +178,105 @@ def setup_ncf_pipeline(model_path):
         'HybridNCF_class': HybridNCF
     }
 
-import torch
-import torch.nn.functional as F
 import numpy as np
 
+def ncf_candidates(asset_id_to_index, asset_id_to_isin):
+    # scores are produced in asset_id_to_index key order
+    return CandidateIndex([asset_id_to_isin.get(asset_id) for asset_id in asset_id_to_index])
+
+
+class NCFScorer:
+    """
+    HybridNCF scoring with the asset side computed once per loaded model.
+
+    The first MLP layer sees ``[u_emb, a_emb, u_feat, a_feat]``, so its output splits
+    into a user term and an asset term. The asset term (embedding and projected
+    features through their slices of the first layer, plus its bias) is cached for
+    every asset; a request only projects the user, adds it to the cached block and
+    runs the remaining MLP layers. Equivalent to ``model(...)`` in eval mode.
+
+    ``mode`` selects how those remaining layers run (see ``services.torch_inference``).
+    """
+
+    def __init__(self, model, asset_id_to_index, asset_feat_array, mode="eager"):
+        import torch
+        from services.torch_inference import optimize
+
+        model.eval()
+        self.model = model
+        self.asset_ids = np.array(list(asset_id_to_index.keys()))
+        first = model.mlp[0]
+        emb_dim = model.user_emb.embedding_dim
+        with torch.no_grad():
+            a_emb = model.asset_emb(torch.LongTensor(self.asset_ids))
+            a_feat = model.asset_fc(torch.FloatTensor(asset_feat_array[[asset_id_to_index[i] for i in self.asset_ids]]))
+            weight = first.weight
+            self._w_user_emb = weight[:, :emb_dim].T.contiguous()
+            self._w_user_feat = weight[:, 2 * emb_dim:3 * emb_dim].T.contiguous()
+            self._asset_block = (
+                a_emb @ weight[:, emb_dim:2 * emb_dim].T
+                + a_feat @ weight[:, 3 * emb_dim:].T
+                + first.bias
+            )
+        self._head = optimize(model.mlp[1:], mode, (self._asset_block.unsqueeze(0),))
+        self._module = self.module()
+
+    def module(self):
+        """``score_batch`` as an ``nn.Module`` of ``(user_ids, user_feats)``, e.g. for ONNX export."""
+        import torch
+        import torch.nn as nn
+
+        scorer = self
+
+        class NCFScoring(nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.user_emb = scorer.model.user_emb
+                self.user_fc = scorer.model.user_fc
+                self.head = scorer._head
+                self.register_buffer('w_user_emb', scorer._w_user_emb)
+                self.register_buffer('w_user_feat', scorer._w_user_feat)
+                self.register_buffer('asset_block', scorer._asset_block)
+
+            def forward(self, user_ids, user_feats):
+                user_term = self.user_emb(user_ids) @ self.w_user_emb + self.user_fc(user_feats) @ self.w_user_feat
+                logits = self.head(self.asset_block.unsqueeze(0) + user_term.unsqueeze(1)).squeeze(-1)
+                return torch.sigmoid(logits)
+
+        return NCFScoring().eval()
+
+    def score_batch(self, user_ids, user_feats):
+        """Probabilities of shape (len(user_ids), num_assets) in ``asset_ids`` order."""
+        import torch
+
+        with torch.no_grad():
+            return self._module(
+                torch.LongTensor(np.asarray(user_ids)),
+                torch.FloatTensor(np.asarray(user_feats)),
+            ).numpy()
+
+    def score(self, user_id, user_feat):
+        return self.score_batch([user_id], np.asarray(user_feat)[np.newaxis, :])[0]
+
+
 def recommend_assets_ncf(customer_id, model, customer_to_userid,
                          user_id_to_index, asset_id_to_index,
                          user_feat_array, asset_feat_array,
-                         asset_id_to_isin, topk=10, existing_portfolio=None):
+                         asset_id_to_isin, topk=10, existing_portfolio=None,
+                         candidates=None, scorer=None):
     if customer_id not in customer_to_userid:
         return f"Customer {customer_id} not found."
 
     user_id = customer_to_userid[customer_id]
     u_idx = user_id_to_index[user_id]
-    u_feat = torch.FloatTensor(user_feat_array[u_idx]).unsqueeze(0)
-
-    all_asset_ids = np.array(list(asset_id_to_index.keys()))
-    a_feat = torch.FloatTensor(asset_feat_array[[asset_id_to_index[i] for i in all_asset_ids]])
-
-    u_ids = torch.LongTensor([user_id]*len(all_asset_ids))
-    u_feats_batch = u_feat.repeat(len(all_asset_ids), 1)
-
-    model.eval()
-    with torch.no_grad():
-        logits = model(u_ids, torch.LongTensor(all_asset_ids), u_feats_batch, a_feat)
-        scores = torch.sigmoid(logits).numpy()  # convert to probability [0,1]
-
-    topk_idx = np.argsort(-scores)
 
-    recommended = []
-    existing_set = set(existing_portfolio) if existing_portfolio else set()
+    if scorer is None:
+        scorer = NCFScorer(model, asset_id_to_index, asset_feat_array)
+    scores = scorer.score(user_id, user_feat_array[u_idx])  # probabilities [0,1]
 
-    for i in topk_idx:
-        isin = asset_id_to_isin[all_asset_ids[i]]
-        if isin in existing_set:
-            continue
-        recommended.append((isin, float(scores[i])))  # float for JSON-friendly format
-        if len(recommended) >= topk:
-            break
+    if candidates is None:
+        candidates = ncf_candidates(asset_id_to_index, asset_id_to_isin)
+    recommended = candidates.select(scores, topk, existing_portfolio)
 
     # Return dictionary {ISIN: score}
     return {isin: score for isin, score in recommended}
@@ -200,6 +289,8 @@ def recommend_assets_ncf(customer_id, model, customer_to_userid,
 import json
 
 def setup_lstm_pipeline(model_path, hyperparam_json_path):
+    import torch
+    import torch.nn as nn
 
     # ---------------------
     # 1. Load mappings
@@ -268,61 +359,79 @@ def setup_lstm_pipeline(model_path, hyperparam_json_path):
         'lstm_recommender_class': LSTMRecommender
     }
 
-import torch
-import torch.nn.functional as F
 import numpy as np
 
 
 #existing portfolio gonna be all the buy transactions?
 
 
+def lstm_candidates(idx_to_isin, output_size):
+  # idx_to_isin starts from 1, but output positions start from 0
+  return CandidateIndex([idx_to_isin.get(i + 1) for i in range(output_size)])
+
+
+def optimize_lstm(model, mode, window_size):
+  # optimized copy of the LSTM for inference; the float model is left untouched
+  import torch
+  from services.torch_inference import optimize
+
+  if mode == "eager":
+    return model
+  example = (torch.zeros((1, window_size), dtype=torch.long), torch.zeros(1, dtype=torch.long))
+  return optimize(copy.deepcopy(model), mode, example)
+
+
+class LSTMScorer:
+  """Next-asset probabilities from an LSTMRecommender (or an optimized copy of it)."""
+
+  def __init__(self, model):
+    self.model = model
+
+  def score_batch(self, sequences, customer_indices):
+    """Probabilities of shape (len(customer_indices), output_size) for (batch, window) sequences."""
+    import torch
+
+    with torch.no_grad():
+      self.model.eval()
+      logit_scores = self.model(
+        torch.tensor(np.asarray(sequences), dtype=torch.long),
+        torch.tensor(np.asarray(customer_indices), dtype=torch.long),
+      )
+      return torch.sigmoid(logit_scores).numpy() # change to prob btw 0-1
+
+
+def lstm_sequence(existing_portfolio, isin_to_idx, window_size, padding_idx=0):
+  # last `window_size` portfolio ISINs as model indices, left-padded
+  if not existing_portfolio or len(existing_portfolio) == 0: #safest if its recent buys from transactions
+    return [padding_idx] * window_size
+  seq_indices = [isin_to_idx[isin] for isin in existing_portfolio[-window_size:]]
+  if len(seq_indices) < window_size:
+    seq_indices = [padding_idx] * (window_size - len(seq_indices)) + seq_indices
+  return seq_indices[-window_size:]
+
+
 def recommend_assets_lstm (customer_id, customer_to_idx,
                            model,
                            isin_to_idx, idx_to_isin,
                            topk=10,
                            window_size=3,
                            padding_idx=0,
-                           existing_portfolio=None):
+                           existing_portfolio=None,
+                           candidates=None,
+                           scorer=None):
   if customer_id not in customer_to_idx:
     return f"Customer {customer_id} not found."
 
-  customer_idx = torch.tensor([customer_to_idx[customer_id]], dtype=torch.long)
-
-  if not existing_portfolio or len(existing_portfolio) == 0: #safest if its recent buys from transactions
-    seq_indices = [padding_idx] * window_size
-  else:
-    seq_indices = [isin_to_idx[isin] for isin in existing_portfolio[-window_size:]]
-    if len(seq_indices) < window_size:
-      seq_indices = [padding_idx] * (window_size - len(seq_indices)) + seq_indices
-    else:
-      seq_indices = seq_indices[-window_size:]
-
-  seq_tensor = torch.tensor(seq_indices, dtype=torch.long).unsqueeze(0)
-
-  with torch.no_grad():
-    model.eval()
-    logit_scores = model(seq_tensor, customer_idx) # shape: (1, num_assets)
-    probs = torch.sigmoid(logit_scores).squeeze(0) # shape: (num_assets), change to prob btw 0-1
-
-  # Sort by descending probability
-  top_idx = np.argsort(-probs) #list of tensors
-  top_idx = top_idx.tolist() #convert to list of intergers else fails for loop
-  recommended = []
-  existing_set = set(existing_portfolio) if existing_portfolio else set()
-
-  for i in top_idx:
-    #print(i)
-    isin = idx_to_isin.get(i + 1) #idx_to_isin starts from 1, but system indices start from 0
-    if not isin or isin in existing_set:
-      continue
-    recommended.append((isin, float(probs[i])))  # (ISIN, probability)
-    if len(recommended) >= topk:
-        break
+  seq_indices = lstm_sequence(existing_portfolio, isin_to_idx, window_size, padding_idx)
 
+  if scorer is None:
+    scorer = LSTMScorer(model)
+  probs = scorer.score_batch([seq_indices], [customer_to_idx[customer_id]])[0] # shape: (num_assets)
 
-  #print(f"Top idx: {top_idx[:10]}")
-  #print(idx_to_isin.get(256))
-  #print(idx_to_isin.get(1))
+  # Top-k by descending probability, skipping unmapped outputs and owned ISINs
+  if candidates is None:
+    candidates = lstm_candidates(idx_to_isin, len(probs))
+  recommended = candidates.select(probs, topk, existing_portfolio)
 
   return {isin: score for isin, score in recommended}
 
@@ -350,9 +459,10 @@ def setup_content_based_pipeline(model_path):
         'user_profiles_df': user_profiles_df,
     }
 
-from sklearn.metrics.pairwise import cosine_similarity
+def recommend_assets_cb(customer_id, item_matrix_df, user_profiles_df, topk=10, existing_portfolio=None,
+                        candidates=None):
+    from sklearn.metrics.pairwise import cosine_similarity
 
-def recommend_assets_cb(customer_id, item_matrix_df, user_profiles_df, topk=10, existing_portfolio=None):
     customer_id = customer_id.strip()
     if customer_id not in user_profiles_df['customerID'].values:
         return f"Customer {customer_id} not found"
@@ -365,117 +475,15 @@ def recommend_assets_cb(customer_id, item_matrix_df, user_profiles_df, topk=10,
 
     similarity_scores = cosine_similarity(user_features, item_features).flatten()  # shape (num_items,)
 
-    sorted_indices = np.argsort(similarity_scores)[::-1]
-
-    recommended = {}
-    for idx in sorted_indices:
-        isin = item_matrix_df['ISIN'].iloc[idx]
-        score = float(similarity_scores[idx])
-
-        # Skip if in existing portfolio
-        if existing_portfolio and isin in existing_portfolio:
-            continue
-
-        recommended[isin] = score
-        if len(recommended) >= topk:
-            break
-
-    return recommended
+    if candidates is None:
+        candidates = CandidateIndex(item_matrix_df['ISIN'].tolist())
+    return dict(candidates.select(similarity_scores, topk, existing_portfolio))
 
 
 """Getting CustomerID and cluster   """
 
-customers_df = pd.read_csv(CUSTOMER_DATASET_PATH)
-customer_clusters_df = customers_df[['customerID', 'cluster']].copy()
-
-
-from typing import Optional
 
-def forecast_sharpe_ratio(
-    isin: str,
-    predictions_path: Optional[str],
-    covariance_path: Optional[str],
-    close_prices_path: Optional[str],
-) -> float:
-    """
-    Compute the Sharpe ratio for a given ISIN using stored price forecasts and the covariance matrix.
-
-    Args:
-        isin: Asset identifier to evaluate.
-        predictions_path: Optional path override for ``predictions.csv``.
-        covariance_path: Optional path override for ``covariance.csv``.
-        close_prices_path: Optional path override for ``close_prices.csv``.
-
-    Returns:
-        The Sharpe ratio derived from the mean of predicted returns and the asset's standard deviation.
-    """
-    if not isin:
-        raise ValueError("isin must be provided.")
-
-
-    # current_dir = os.path.dirname(os.path.abspath(__file__))
-    # datasets_dir = os.path.join(current_dir, "..", "datasets")
-    predictions_path = predictions_path # or os.path.join(datasets_dir, "predictions.csv")
-    covariance_path = covariance_path # or os.path.join(datasets_dir, "covariance.csv")
-    close_prices_path = close_prices_path # or os.path.join(datasets_dir, "close_prices.csv")
-
-    if not os.path.exists(predictions_path):
-        raise FileNotFoundError(f"Predictions file not found at {predictions_path}.")
-
-    predictions_df = pd.read_csv(predictions_path)
-    predictions_df["ISIN"] = predictions_df["ISIN"].astype(str)
-    print(f"Predictions CSV columns: {predictions_df.columns.tolist()}")
-
-    isin_str = str(isin)
-    asset_predictions = predictions_df[predictions_df["ISIN"] == isin_str].copy()
-    if asset_predictions.empty:
-        raise ValueError(f"No predictions available for ISIN {isin_str}.")
-
-    asset_predictions["timestamp"] = pd.to_datetime(asset_predictions["timestamp"])
-    asset_predictions = asset_predictions.sort_values("timestamp")
-    predicted_prices = pd.to_numeric(asset_predictions["closePrice"], errors="coerce").dropna()
-    if predicted_prices.empty:
-        raise ValueError(f"Predictions for ISIN {isin_str} contain no valid price values.")
-
-    if not os.path.exists(close_prices_path):
-        raise FileNotFoundError(f"Close price dataset not found at {close_prices_path}.")
-
-    close_prices_df = pd.read_csv(close_prices_path)
-    close_prices_df["ISIN"] = close_prices_df["ISIN"].astype(str)
-    asset_history = close_prices_df.loc[close_prices_df["ISIN"] == isin_str, ["timestamp", "closePrice"]]
-    if asset_history.empty:
-        raise ValueError(f"No historical prices found for ISIN {isin_str}.")
-
-    asset_history["timestamp"] = pd.to_datetime(asset_history["timestamp"])
-    asset_history = asset_history.sort_values("timestamp")
-    historical_prices = pd.to_numeric(asset_history["closePrice"], errors="coerce").dropna()
-    if historical_prices.empty:
-        raise ValueError(f"No numeric historical prices found for ISIN {isin_str}.")
-
-    base_price = float(historical_prices.iloc[-1])
-    augmented_prices = pd.concat(
-        [pd.Series([base_price], dtype=float), predicted_prices.reset_index(drop=True)],
-        ignore_index=True,
-    )
-    predicted_returns = augmented_prices.pct_change().dropna()
-    mean_return = float(predicted_returns.mean()) if not predicted_returns.empty else 0.0
-
-    covariance_df = pd.read_csv(covariance_path, index_col=0)
-    if isin_str not in covariance_df.index or isin_str not in covariance_df.columns:
-        raise ValueError(f"ISIN {isin_str} not found in covariance matrix.")
-
-    variance = float(covariance_df.loc[isin_str, isin_str])
-    variance = max(variance, 0.0)
-    std_dev = float(np.sqrt(variance))
-
-    if np.isclose(std_dev, 0.0):
-        if mean_return > 0:
-            return 1.0
-        if mean_return < 0:
-            return -1.0
-        return 0.0
-
-    return float(mean_return / std_dev)
+from models.forecast_sharpe_ratio import forecast_sharpe_ratio
 
 """### Getting recommendations from all models"""
 
@@ -485,6 +493,7 @@ def forecast_sharpe_ratio(
 def get_cluster(customerID):
     # returns a string, "whales" OR "cores" OR "browsers"
     cluster_map = {0: "whales", 1: "browsers", 2: "cores"}
+    customer_clusters_df = get_customer_clusters()
     row = customer_clusters_df.loc[
         customer_clusters_df['customerID'] == customerID, 'cluster'
     ]
@@ -492,9 +501,99 @@ def get_cluster(customerID):
         return None
     return cluster_map[int(row.iloc[0])]
 
+def _use_onnx():
+    return settings.recommendation_backend == "onnx"
+
+
+def _load_ncf_pipeline():
+    if _use_onnx():
+        from services.onnx_backend import load_ncf_pipeline
+
+        pipeline = load_ncf_pipeline(MODEL_PATH)
+    else:
+        from services.torch_inference import set_num_threads
+
+        set_num_threads(settings.torch_num_threads)
+        pipeline = setup_ncf_pipeline(MODEL_PATH)
+        pipeline['scorer'] = NCFScorer(
+            pipeline['bpr_model'],
+            pipeline['asset_id_to_index'],
+            pipeline['asset_feat_array'],
+            mode=settings.recommendation_inference_mode,
+        )
+    pipeline['customer_to_userid'] = joblib.load(os.path.join(MODEL_PATH, 'customer_to_userid.joblib'))
+    pipeline['candidates'] = ncf_candidates(pipeline['asset_id_to_index'], pipeline['asset_id_to_isin'])
+    return pipeline
+
+
+def _load_lstm_pipeline():
+    if _use_onnx():
+        from services.onnx_backend import load_lstm_pipeline
+
+        pipeline = load_lstm_pipeline(MODEL_PATH, HYPERPARAM_JSON_PATH)
+    else:
+        from services.torch_inference import set_num_threads
+
+        set_num_threads(settings.torch_num_threads)
+        pipeline = setup_lstm_pipeline(MODEL_PATH, HYPERPARAM_JSON_PATH)
+        pipeline['lstm_scorer'] = LSTMScorer(
+            optimize_lstm(pipeline['lstm_model'], settings.recommendation_inference_mode, pipeline['window_size'])
+        )
+    pipeline['candidates'] = lstm_candidates(pipeline['lstm_idx_to_isin'], pipeline['output_size'])
+    return pipeline
+
+
+def _load_content_based_pipeline():
+    pipeline = setup_content_based_pipeline(MODEL_PATH)
+    pipeline['candidates'] = CandidateIndex(pipeline['item_matrix_df']['ISIN'].tolist())
+    return pipeline
+
+
+# Pipelines are loaded once per process and shared across requests; the registry
+# reloads a pipeline when any of the files it was built from changes on disk.
+model_registry = ModelRegistry(check_interval=settings.model_reload_check_seconds)
+model_registry.register(
+    "ncf",
+    _load_ncf_pipeline,
+    paths=[
+        os.path.join(MODEL_PATH, name)
+        for name in (
+            'ncf_scorer.onnx' if _use_onnx() else 'ncf_bpr.pth',
+            'user_feat_array.npy',
+            'asset_feat_array.npy',
+            'user_id_to_index.joblib',
+            'asset_id_to_index.joblib',
+            'asset_id_to_isin.joblib',
+            'customer_to_userid.joblib',
+        )
+    ],
+)
+model_registry.register(
+    "lstm",
+    _load_lstm_pipeline,
+    paths=[
+        HYPERPARAM_JSON_PATH,
+        *(
+            os.path.join(MODEL_PATH, name)
+            for name in (
+                'lstm.onnx' if _use_onnx() else 'lstm.pth',
+                'lstm_isin_to_idx.pkl',
+                'lstm_idx_to_isin.pkl',
+                'lstm_customer_to_idx.pkl',
+            )
+        ),
+    ],
+)
+model_registry.register(
+    "cb",
+    _load_content_based_pipeline,
+    paths=[os.path.join(MODEL_PATH, name) for name in ('item_matrix_cb.csv', 'user_profiles_cb.csv')],
+)
+
+
 def run_content_based(customerID, existing_portfolio):
     # returns a dictionary of {stock1: score, stock2: score,..., stock20: score}
-    pipeline_cb = setup_content_based_pipeline(MODEL_PATH)
+    pipeline_cb = model_registry.get("cb")
 
     item_matrix_df = pipeline_cb['item_matrix_df']
     user_profiles_df = pipeline_cb['user_profiles_df']
@@ -505,26 +604,28 @@ def run_content_based(customerID, existing_portfolio):
         item_matrix_df=item_matrix_df,
         user_profiles_df=user_profiles_df,
         topk=10,
-        existing_portfolio=existing_portfolio   # optional
+        existing_portfolio=existing_portfolio,   # optional
+        candidates=pipeline_cb['candidates'],
     )
 
     return recommended_assets_cb
 
 def run_ncf(customerID, existing_portfolio):
     # returns a dictionary of {stock1: score, stock2: score,..., stock20: score}
-    ncf_customer_to_userid = joblib.load(os.path.join(MODEL_PATH, 'customer_to_userid.joblib'))
-    pipeline = setup_ncf_pipeline(MODEL_PATH)
+    pipeline = model_registry.get("ncf")
     ncf_recs = recommend_assets_ncf(
                 customer_id=customerID,
                 model=pipeline['bpr_model'],  # can also use pipeline['bpr_model']
-                customer_to_userid=ncf_customer_to_userid,
+                customer_to_userid=pipeline['customer_to_userid'],
                 user_id_to_index=pipeline['user_id_to_index'],
                 asset_id_to_index=pipeline['asset_id_to_index'],
                 user_feat_array=pipeline['user_feat_array'],
                 asset_feat_array=pipeline['asset_feat_array'],
                 asset_id_to_isin=pipeline['asset_id_to_isin'],
                 topk=10,
-                existing_portfolio=existing_portfolio
+                existing_portfolio=existing_portfolio,
+                candidates=pipeline['candidates'],
+                scorer=pipeline['scorer'],
             )
     return ncf_recs
 
@@ -532,7 +633,7 @@ def run_lstm(customerID, existing_portfolio):
     # returns a dictionary of {stock1: score, stock2: score,..., stock20: score}
     # MUST CHANGE
 
-    pipeline_lstm = setup_lstm_pipeline(MODEL_PATH, HYPERPARAM_JSON_PATH)
+    pipeline_lstm = model_registry.get("lstm")
 
     # map customer ID to index
     lstm_customer_to_idx = pipeline_lstm['lstm_customer_to_idx']
@@ -547,7 +648,9 @@ def run_lstm(customerID, existing_portfolio):
           topk=10,
           window_size=pipeline_lstm['window_size'],
           padding_idx=0,
-          existing_portfolio=existing_portfolio
+          existing_portfolio=existing_portfolio,
+          candidates=pipeline_lstm['candidates'],
+          scorer=pipeline_lstm['lstm_scorer'],
       )
     return top_10
 
@@ -621,6 +724,75 @@ def get_top_10(dicts):
 
 #     return top_10
 
+_ensemble_executor = None
+_ensemble_executor_lock = threading.Lock()
+
+
+def _get_ensemble_executor():
+    global _ensemble_executor
+    if _ensemble_executor is None:
+        with _ensemble_executor_lock:
+            if _ensemble_executor is None:
+                _ensemble_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.recommendation_ensemble_workers),
+                    thread_name_prefix="recommender",
+                )
+    return _ensemble_executor
+
+
+def _started(started, func, args):
+    # runs on the pool thread: marks when the model actually began running
+    started.set()
+    return func(*args)
+
+
+def run_models(calls, timeout=None):
+    # calls: [(model_name, func, args), ...]
+    # Runs the models concurrently (torch and numpy release the GIL) and returns
+    # [(model_name, output, error), ...] in call order. Each model gets `timeout`
+    # seconds from the moment a pool thread starts it, so time spent queued behind
+    # other requests does not count; a model still running after that is reported
+    # with a TimeoutError. `timeout=None` waits for every model (offline jobs).
+    #
+    # A timed-out model cannot be interrupted: it keeps its pool thread until it
+    # finishes. Each request occupies up to two threads (one per ensemble member),
+    # so RECOMMENDATION_ENSEMBLE_WORKERS should be about twice the number of
+    # recommendation requests a worker serves at once, or later requests queue.
+    executor = _get_ensemble_executor()
+    submitted = []
+    for model_name, func, args in calls:
+        started = threading.Event()
+        submitted.append((model_name, started, executor.submit(_started, started, func, args)))
+    results = []
+    for model_name, started, future in submitted:
+        try:
+            if timeout is None:
+                output = future.result()
+            else:
+                started.wait()
+                output = future.result(timeout=timeout)
+            results.append((model_name, output, None))
+        except FutureTimeoutError:
+            results.append((model_name, None, TimeoutError(f"{model_name} exceeded {timeout:g}s")))
+        except Exception as e:
+            results.append((model_name, None, e))
+    return results
+
+
+def load_pipelines(model_names):
+    # Resolves the pipelines (loading them on first use) before any model budget
+    # starts, so a cold worker is slow instead of timing out every model. Returns
+    # ({model_name: pipeline}, {model_name: error}); loads run concurrently.
+    loads = [(model_name, model_registry.get, (model_name,)) for model_name in model_names]
+    pipelines, errors = {}, {}
+    for model_name, pipeline, error in run_models(loads):
+        if error is not None:
+            errors[model_name] = error
+        else:
+            pipelines[model_name] = pipeline
+    return pipelines, errors
+
+
 def top_10_past(customerID, existing_portfolio):
     dicts = []
     not_found_msgs = []
@@ -631,17 +803,24 @@ def top_10_past(customerID, existing_portfolio):
     else:
         model_funcs = [("cb", run_content_based), ("lstm", run_lstm)]
 
-    for model_name, func in model_funcs:
-        try:
-            output = func(customerID, existing_portfolio)
-            if isinstance(output, dict) and output:  # valid dict
-                dicts.append((model_name, output))
-            elif isinstance(output, str) and "not found" in output.lower():
-                not_found_msgs.append(f"{model_name}: {output}")
-            else:
-                print(f"Skipping {model_name}: invalid output for customer {customerID}")
-        except Exception as e:
-            print(f"Error running {model_name} for customer {customerID}: {e}")
+    pipelines, load_errors = load_pipelines([model_name for model_name, _ in model_funcs])
+    for model_name, error in load_errors.items():
+        print(f"Error loading {model_name} for customer {customerID}: {error}")
+
+    calls = [
+        (model_name, func, (customerID, existing_portfolio))
+        for model_name, func in model_funcs
+        if model_name in pipelines
+    ]
+    for model_name, output, error in run_models(calls, settings.recommendation_model_timeout_seconds):
+        if error is not None:
+            print(f"Error running {model_name} for customer {customerID}: {error}")
+        elif isinstance(output, dict) and output:  # valid dict
+            dicts.append((model_name, output))
+        elif isinstance(output, str) and "not found" in output.lower():
+            not_found_msgs.append(f"{model_name}: {output}")
+        else:
+            print(f"Skipping {model_name}: invalid output for customer {customerID}")
 
     if not dicts:
         msg = "; ".join(not_found_msgs) if not_found_msgs else "No valid recommendations."
@@ -658,7 +837,7 @@ def top_10_future_ranked(customerID, existing_portfolio):
     new_list = []
     for isin, score in past10:
         sharpe = run_arima(isin) # calls arima on the stock name
-        assetName = isin_to_name.get(isin, None)
+        assetName = get_isin_to_name().get(isin, None)
         new_list.append([isin, assetName, score, sharpe]) # new_list = [[stock, score, sharpe], [stock, score, sharpe]...]
 
     new_list.sort(key=lambda x: x[3], reverse=True) # sort by sharpe descending
@@ -668,3 +847,179 @@ def top_10_future_ranked(customerID, existing_portfolio):
 def recommend(customerID, existing_portfolio):
     return top_10_future_ranked(customerID, existing_portfolio)
     # then see what we wna do with the entries (if we wna display the weighted avg similarity score / sharpe from arima)
+
+
+"""### Batch recommendations
+
+Same models and ensemble as `recommend`, but every model scores all of its customers
+in one forward pass. Used by /api/recommendation/recommend-batch and the offline
+materialization job (services/recommendation_store.py).
+"""
+
+def _not_found(customer_id):
+    return f"Customer {customer_id} not found."
+
+
+def recommend_assets_ncf_batch(customer_ids, pipeline, topk=10, existing_portfolios=None):
+    # returns {customerID: {ISIN: score}} or a "not found" message; customers the single
+    # version would fail on are left out, like a model skipped in `top_10_past`
+    existing_portfolios = existing_portfolios or {}
+    customer_to_userid = pipeline['customer_to_userid']
+    user_id_to_index = pipeline['user_id_to_index']
+
+    results = {}
+    known = []
+    for customer_id in customer_ids:
+        if customer_id not in customer_to_userid:
+            results[customer_id] = _not_found(customer_id)
+        elif customer_to_userid[customer_id] not in user_id_to_index:
+            print(f"Skipping ncf: no user features for customer {customer_id}")
+        else:
+            known.append((customer_id, customer_to_userid[customer_id]))
+    if not known:
+        return results
+
+    user_ids = [user_id for _, user_id in known]
+    user_feats = pipeline['user_feat_array'][[user_id_to_index[user_id] for user_id in user_ids]]
+    scores = pipeline['scorer'].score_batch(user_ids, user_feats)
+    selected = pipeline['candidates'].select_batch(
+        scores, topk, [existing_portfolios.get(customer_id) for customer_id, _ in known]
+    )
+    for (customer_id, _), recommended in zip(known, selected):
+        results[customer_id] = dict(recommended)
+    return results
+
+
+def recommend_assets_lstm_batch(customer_ids, pipeline, topk=10, existing_portfolios=None):
+    existing_portfolios = existing_portfolios or {}
+    customer_to_idx = pipeline['lstm_customer_to_idx']
+    isin_to_idx = pipeline['lstm_isin_to_idx']
+    window_size = pipeline['window_size']
+
+    results = {}
+    rows = []
+    for customer_id in customer_ids:
+        if customer_id not in customer_to_idx:
+            results[customer_id] = _not_found(customer_id)
+            continue
+        try:
+            sequence = lstm_sequence(existing_portfolios.get(customer_id), isin_to_idx, window_size, 0)
+        except KeyError as e:
+            print(f"Skipping lstm: unknown portfolio ISIN {e} for customer {customer_id}")
+            continue
+        rows.append((customer_id, customer_to_idx[customer_id], sequence))
+    if not rows:
+        return results
+
+    probs = pipeline['lstm_scorer'].score_batch(
+        [sequence for _, _, sequence in rows],
+        [idx for _, idx, _ in rows],
+    )  # shape: (customers, num_assets)
+
+    selected = pipeline['candidates'].select_batch(
+        probs, topk, [existing_portfolios.get(customer_id) for customer_id, _, _ in rows]
+    )
+    for (customer_id, _, _), recommended in zip(rows, selected):
+        results[customer_id] = dict(recommended)
+    return results
+
+
+def recommend_assets_cb_batch(customer_ids, pipeline, topk=10, existing_portfolios=None):
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    existing_portfolios = existing_portfolios or {}
+    item_matrix_df = pipeline['item_matrix_df']
+    user_profiles_df = pipeline['user_profiles_df']
+    feature_cols = [col for col in item_matrix_df.columns if col != 'ISIN']
+
+    profile_rows = (
+        user_profiles_df.reset_index(drop=True)
+        .drop_duplicates('customerID')
+        .set_index('customerID')
+    )
+    results = {}
+    known = []
+    for customer_id in customer_ids:
+        if customer_id.strip() in profile_rows.index:
+            known.append(customer_id)
+        else:
+            results[customer_id] = f"Customer {customer_id.strip()} not found"
+    if not known:
+        return results
+
+    user_features = profile_rows.loc[[customer_id.strip() for customer_id in known], feature_cols].values
+    similarity_scores = cosine_similarity(user_features, item_matrix_df[feature_cols].values)  # (customers, items)
+    selected = pipeline['candidates'].select_batch(
+        similarity_scores, topk, [existing_portfolios.get(customer_id) for customer_id in known]
+    )
+    for customer_id, recommended in zip(known, selected):
+        results[customer_id] = dict(recommended)
+    return results
+
+
+def top_10_past_batch(customer_ids, existing_portfolios=None, timeout=None):
+    # returns {customerID: [[stock, score], ...]} or, when no model produced output,
+    # {customerID: ValueError} with the same message `top_10_past` raises.
+    # `timeout` is the per-model budget (None: no limit, as the offline job needs).
+    existing_portfolios = existing_portfolios or {}
+    customer_ids = list(dict.fromkeys(customer_ids))
+    customer_clusters_df = get_customer_clusters()
+    cluster_ids = dict(zip(customer_clusters_df['customerID'], customer_clusters_df['cluster']))
+    cores = {customer_id for customer_id in customer_ids if cluster_ids.get(customer_id) == 2}
+
+    outputs = {customer_id: [] for customer_id in customer_ids}
+    model_batches = [
+        ("ncf", recommend_assets_ncf_batch, [c for c in customer_ids if c in cores]),
+        ("cb", recommend_assets_cb_batch, [c for c in customer_ids if c not in cores]),
+        ("lstm", recommend_assets_lstm_batch, customer_ids),
+    ]
+    model_batches = [(model_name, func, batch) for model_name, func, batch in model_batches if batch]
+    # a model that fails to load is skipped rather than failing the whole batch
+    pipelines, load_errors = load_pipelines([model_name for model_name, _, _ in model_batches])
+    for model_name, error in load_errors.items():
+        print(f"Error loading {model_name} for a batch of customers: {error}")
+
+    calls = [
+        (model_name, func, (batch, pipelines[model_name], 10, existing_portfolios))
+        for model_name, func, batch in model_batches
+        if model_name in pipelines
+    ]
+    for model_name, model_outputs, error in run_models(calls, timeout):
+        if error is not None:
+            print(f"Error running {model_name} for a batch of customers: {error}")
+            continue
+        for customer_id, output in model_outputs.items():
+            outputs[customer_id].append((model_name, output))
+
+    results = {}
+    for customer_id, model_outputs in outputs.items():
+        dicts = [output for _, output in model_outputs if isinstance(output, dict) and output]
+        if dicts:
+            results[customer_id] = get_top_10(dicts)
+            continue
+        not_found_msgs = [
+            f"{model_name}: {output}"
+            for model_name, output in model_outputs
+            if isinstance(output, str) and "not found" in output.lower()
+        ]
+        results[customer_id] = ValueError("; ".join(not_found_msgs) if not_found_msgs else "No valid recommendations.")
+    return results
+
+
+def recommend_batch(customer_ids, existing_portfolios=None, timeout=None):
+    # returns {customerID: [[stock, assetName, score, sharpe], ...]}, or the exception
+    # `recommend` would have raised for that customer
+    results = {}
+    for customer_id, past10 in top_10_past_batch(customer_ids, existing_portfolios, timeout).items():
+        if isinstance(past10, Exception):
+            results[customer_id] = past10
+            continue
+        try:
+            ranked = [[isin, get_isin_to_name().get(isin, None), score, run_arima(isin)] for isin, score in past10]
+        except Exception as e:
+            # one customer's failed forecast must not fail the whole batch
+            results[customer_id] = e
+            continue
+        ranked.sort(key=lambda x: x[3], reverse=True) # sort by sharpe descending
+        results[customer_id] = ranked
+    return results
@@ -0,0 +1,178 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from core.config import settings
+from core.dataset_store import BACKEND_ROOT
+from services.market_data import get_fetch_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(BACKEND_ROOT, "cache", "bars.sqlite")
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT PRIMARY KEY,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL
+);
+"""
+
+
+class BarStore:
+    """
+    Daily OHLCV bars persisted in SQLite, fetched from upstream only once.
+
+    ``coverage`` records the contiguous date range already fetched per symbol, so a
+    query only downloads the days before or after it (and today's still-moving bar,
+    which is never marked as covered). Bars are keyed by ``(symbol, date)``, so the
+    table stays sorted by date per symbol and re-fetched days simply overwrite.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _coverage(self, symbols: List[str]) -> Dict[str, Tuple[date, date]]:
+        placeholders = ",".join("?" for _ in symbols)
+        rows = self._connect().execute(
+            f"SELECT symbol, start, end FROM coverage WHERE symbol IN ({placeholders})", symbols
+        ).fetchall()
+        return {symbol: (date.fromisoformat(start), date.fromisoformat(end)) for symbol, start, end in rows}
+
+    @staticmethod
+    def _gaps(start: date, end: date, covered: Optional[Tuple[date, date]]) -> List[Tuple[date, date]]:
+        if covered is None:
+            return [(start, end)]
+        # Gaps always reach the covered edges, so the fetched range and the covered
+        # range stay contiguous when ``_write`` merges them.
+        gaps = []
+        if start < covered[0]:
+            gaps.append((start, covered[0] - timedelta(days=1)))
+        if end > covered[1]:
+            gaps.append((covered[1] + timedelta(days=1), end))
+        return gaps
+
+    def _write(
+        self,
+        symbol: str,
+        history: pd.DataFrame,
+        fetched: Tuple[date, date],
+        covered: Optional[Tuple[date, date]],
+    ) -> None:
+        rows = []
+        if not history.empty:
+            days = pd.DatetimeIndex(history.index).date
+            columns = [
+                history[column].to_numpy(dtype=float) if column in history.columns else [None] * len(history)
+                for column in BAR_COLUMNS
+            ]
+            rows = [
+                (symbol, day.isoformat(), *(None if pd.isna(value) else float(value) for value in values))
+                for day, *values in zip(days, *columns)
+            ]
+
+        # Today's bar is still moving: store it, but keep it outside the covered range.
+        last_final_day = datetime.utcnow().date() - timedelta(days=1)
+        span = (fetched[0], min(fetched[1], last_final_day))
+        if covered is not None:
+            span = (min(span[0], covered[0]), max(span[1], covered[1]))
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                # Only record coverage once the symbol is known to exist upstream, so an
+                # empty answer for a bad or throttled symbol is retried next time.
+                if span[0] <= span[1] and (rows or covered is not None):
+                    connection.execute(
+                        "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?)",
+                        (symbol, span[0].isoformat(), span[1].isoformat()),
+                    )
+
+    def ensure(self, symbols: Iterable[str], start: date, end: date) -> None:
+        """Fetch whatever part of ``[start, end]`` is not stored yet for each symbol."""
+        wanted = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not wanted:
+            return
+        coverage = self._coverage(wanted)
+
+        # Symbols missing the same range are fetched together in one pool call.
+        batches: Dict[Tuple[date, date], List[str]] = {}
+        for symbol in wanted:
+            for gap in self._gaps(start, end, coverage.get(symbol)):
+                batches.setdefault(gap, []).append(symbol)
+
+        pool = get_fetch_pool()
+        for (gap_start, gap_end), batch in batches.items():
+            histories = pool.histories(
+                batch,
+                start=gap_start.isoformat(),
+                end=(gap_end + timedelta(days=1)).isoformat(),
+            )
+            for symbol, history in histories.items():
+                if history is None:
+                    continue
+                self._write(symbol, history, (gap_start, gap_end), coverage.get(symbol))
+                coverage = {**coverage, **self._coverage([symbol])}
+
+    def bars(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        """Stored bars for ``symbol`` within ``[start, end]``, indexed by date."""
+        rows = self._connect().execute(
+            "SELECT date, open, high, low, close, volume FROM bars "
+            "WHERE symbol = ? AND date BETWEEN ? AND ? ORDER BY date",
+            (symbol.upper(), start.isoformat(), end.isoformat()),
+        ).fetchall()
+        frame = pd.DataFrame(rows, columns=["Date"] + BAR_COLUMNS)
+        frame.index = pd.to_datetime(frame.pop("Date"))
+        return frame
+
+    def get_bars(self, symbols: Iterable[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        """Bars per upper-cased symbol for ``[start, end]``, fetching only what is missing."""
+        wanted = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        self.ensure(wanted, start, end)
+        return {symbol: self.bars(symbol, start, end) for symbol in wanted}
+
+
+_store: Optional[BarStore] = None
+_store_lock = threading.Lock()
+
+
+def get_bar_store() -> Optional[BarStore]:
+    """The shared store, or ``None`` when ``BAR_STORE_ENABLED`` is off."""
+    global _store
+    if not settings.bar_store_enabled:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BarStore(settings.bar_store_path or DEFAULT_PATH)
+    return _store
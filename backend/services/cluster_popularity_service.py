@@ -5,10 +5,9 @@ import os
 from functools import lru_cache
 from typing import Optional
 
-import pandas as pd
-
-from models.forecast_sharpe_ratio import forecast_sharpe_ratio
-from services.dataset_time_series_service import DatasetTimeSeriesService
+from core.dataset_registry import dataset_registry
+from models.forecast_sharpe_ratio import get_sharpe_engine
+from services.dataset_time_series_service import get_dataset_service
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATASETS_DIR = os.path.join(BASE_DIR, "datasets")
@@ -17,17 +16,7 @@ SHARPE_PREDICTIONS_PATH = os.path.join(PROCESSED_DATA_DIR, "predictions.csv")
 SHARPE_COVARIANCE_PATH = os.path.join(PROCESSED_DATA_DIR, "covariance.csv")
 SHARPE_CLOSE_PRICES_PATH = os.path.join(DATASETS_DIR, "close_prices.csv")
 
-CUSTOMER_INFO_PATH = os.path.join(
-    DATASETS_DIR,
-    "customer_information_engineered_kMeans.csv",
-)
-
-TX_PATH = os.path.join(
-    DATASETS_DIR,
-    "customer_transactions.csv",
-)
-
-_dataset_service = DatasetTimeSeriesService()
+_dataset_service = get_dataset_service()
 
 
 @lru_cache(maxsize=4096)
@@ -47,19 +36,18 @@ def _get_asset_display_info(isin: str) -> dict:
     return info or {}
 
 
-@lru_cache(maxsize=4096)
 def _get_predicted_sharpe(isin: str) -> Optional[float]:
+    # No memoisation here: the engine lookup is O(1) and tracks source file changes.
     normalized = (isin or "").strip()
     if not normalized:
         return None
 
     try:
-        value = forecast_sharpe_ratio(
-            normalized,
+        value = get_sharpe_engine(
             predictions_path=SHARPE_PREDICTIONS_PATH,
             covariance_path=SHARPE_COVARIANCE_PATH,
             close_prices_path=SHARPE_CLOSE_PRICES_PATH,
-        )
+        ).get(normalized)
     except Exception:
         return None
 
@@ -83,14 +71,14 @@ def load_top_assets_by_cluster():
         }
     """
     # customerID -> cluster
-    info = pd.read_csv(CUSTOMER_INFO_PATH, usecols=["customerID", "cluster"])
+    info = dataset_registry.get("customer_clusters", columns=["customerID", "cluster"])
 
     # Only keep buys for popularity
-    tx = pd.read_csv(
-        TX_PATH,
-        usecols=["customerID", "ISIN", "transactionType", "totalValue"],
+    tx = dataset_registry.get(
+        "customer_transactions",
+        columns=["customerID", "ISIN", "transactionType", "totalValue"],
     )
-    tx["transactionType"] = tx["transactionType"].str.upper()
+    tx["transactionType"] = tx["transactionType"].astype(str).str.upper()
     tx = tx[tx["transactionType"] == "BUY"].copy()
 
     # Merge to attach cluster
@@ -101,7 +89,7 @@ def load_top_assets_by_cluster():
 
     # Popularity signals: unique customers, trades, total value
     grouped = (
-        merged.groupby(["cluster", "ISIN"])
+        merged.groupby(["cluster", "ISIN"], observed=True)
         .agg(
             unique_customers=("customerID", "nunique"),
             trade_count=("ISIN", "size"),
@@ -0,0 +1,86 @@
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """
+    Per-value row bitmaps over the low-cardinality columns of one DataFrame.
+
+    Each indexed column is factorised once; every distinct value gets a boolean
+    row bitmap. A filter on a column evaluates its predicate against the distinct
+    values only and ORs their bitmaps, so any combination of filters is a handful
+    of vectorised AND/OR operations on bool arrays instead of string conversions
+    over the whole frame. Date columns are kept as a parsed ``datetime64`` array.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Iterable[str], date_columns: Iterable[str] = ()) -> None:
+        self.size = len(df)
+        self._uniques: Dict[str, np.ndarray] = {}
+        self._bitmaps: Dict[str, np.ndarray] = {}
+        self._dates: Dict[str, np.ndarray] = {}
+
+        for column in columns:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column])
+            # bitmaps[k] is the row mask of uniques[k]; missing values match nothing.
+            self._uniques[column] = np.asarray(uniques, dtype=object)
+            self._bitmaps[column] = codes[np.newaxis, :] == np.arange(len(uniques))[:, np.newaxis]
+
+        for column in date_columns:
+            if column in df.columns:
+                self._dates[column] = pd.to_datetime(df[column], errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+    def has(self, column: str) -> bool:
+        return column in self._bitmaps
+
+    def all(self) -> np.ndarray:
+        return np.ones(self.size, dtype=bool)
+
+    def match(self, column: str, predicate: Callable[[Any], bool]) -> np.ndarray:
+        """Rows whose ``column`` value satisfies ``predicate`` (evaluated once per distinct value)."""
+        uniques = self._uniques[column]
+        selected = [position for position, value in enumerate(uniques) if predicate(value)]
+        if not selected:
+            return np.zeros(self.size, dtype=bool)
+        return np.logical_or.reduce(self._bitmaps[column][selected], axis=0)
+
+    def between(self, column: str, start=None, end=None) -> np.ndarray:
+        """Rows whose date in ``column`` lies in ``[start, end]``; unparseable dates never match."""
+        values = self._dates[column]
+        mask = ~np.isnat(values)
+        if start is not None:
+            mask &= values >= np.datetime64(pd.Timestamp(start).to_datetime64(), "ns")
+        if end is not None:
+            mask &= values <= np.datetime64(pd.Timestamp(end).to_datetime64(), "ns")
+        return mask
+
+
+_indexes: Dict[Tuple[int, Tuple[str, ...], Tuple[str, ...]], Tuple[weakref.ref, BitmapIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_bitmap_index(
+    df: pd.DataFrame,
+    columns: Iterable[str],
+    date_columns: Iterable[str] = (),
+) -> BitmapIndex:
+    """Return the (cached) index for ``df``; rebuilt if the frame was replaced or resized."""
+    columns, date_columns = tuple(columns), tuple(date_columns)
+    key = (id(df), columns, date_columns)
+    cached = _indexes.get(key)
+    if cached is not None and cached[0]() is df and cached[1].size == len(df):
+        return cached[1]
+
+    index = BitmapIndex(df, columns, date_columns)
+    with _indexes_lock:
+        # Drop entries whose frames have been garbage collected.
+        for stale in [k for k, (ref, _) in _indexes.items() if ref() is None]:
+            del _indexes[stale]
+        _indexes[key] = (weakref.ref(df), index)
+    return index
+
@@ -0,0 +1,69 @@
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class CustomerIndex:
+    """
+    Row index of the FAR tables partitioned by customer.
+
+    ``members`` answers "is this a known customer" with a set lookup, and the
+    transaction rows of each customer are addressed through a permutation of row
+    positions that groups them by customer (customers in order of first appearance)
+    plus ``[start, end)`` offsets, so slicing one customer costs O(rows of that
+    customer) instead of a scan of the whole table. IDs are compared stripped, in
+    both tables and in lookups.
+    """
+
+    def __init__(
+        self,
+        members: FrozenSet[str],
+        order: np.ndarray,
+        offsets: Dict[str, Tuple[int, int]],
+    ) -> None:
+        self.members = members
+        self._order = order
+        self._offsets = offsets
+
+    @classmethod
+    def build(
+        cls,
+        transactions: Optional[pd.DataFrame],
+        customers: Optional[pd.DataFrame] = None,
+    ) -> "CustomerIndex":
+        members: FrozenSet[str] = frozenset()
+        if customers is not None and "customerID" in customers.columns:
+            ids = customers["customerID"].dropna().astype(str).str.strip()
+            members = frozenset(ids.tolist())
+
+        order = np.empty(0, dtype=np.int64)
+        offsets: Dict[str, Tuple[int, int]] = {}
+        if transactions is not None and "customerID" in transactions.columns and len(transactions):
+            ids = transactions["customerID"]
+            codes, uniques = pd.factorize(ids.astype(str).str.strip().where(ids.notna()))
+            # Stable sort keeps each customer's rows in their original order; missing
+            # IDs (code -1) sort first and are dropped.
+            order = np.argsort(codes, kind="stable")
+            order = order[codes[order] >= 0]
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            ends = np.cumsum(counts)
+            starts = ends - counts
+            offsets = {
+                str(customer_id): (int(start), int(end))
+                for customer_id, start, end in zip(uniques, starts, ends)
+            }
+        return cls(members, order, offsets)
+
+    def __contains__(self, customer_id: str) -> bool:
+        return str(customer_id).strip() in self.members
+
+    def transaction_positions(self, customer_id: str) -> np.ndarray:
+        """Row positions (for ``iloc``) of ``customer_id``'s transactions, in table order."""
+        bounds = self._offsets.get(str(customer_id).strip())
+        if bounds is None:
+            return self._order[:0]
+        return self._order[bounds[0]:bounds[1]]
+
+    def transactions_for(self, transactions: pd.DataFrame, customer_id: str) -> pd.DataFrame:
+        return transactions.iloc[self.transaction_positions(customer_id)]
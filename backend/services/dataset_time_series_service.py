@@ -6,22 +6,31 @@ from threading import Lock
 from typing import Any, Dict, List, Optional
 from models.forecast_sharpe_ratio import forecast_sharpe_ratio
 
+import numpy as np
 import pandas as pd
 
+from core.dataset_registry import DatasetRegistry, dataset_registry
+from services.price_index import PriceIndex
+
 logger = logging.getLogger(__name__)
 
 
 class DatasetTimeSeriesService:
-    """Service layer to serve asset search and historical prices from local CSV datasets."""
+    """Service layer to serve asset search and historical prices from the local datasets."""
 
     def __init__(self, dataset_dir: Optional[Path] = None) -> None:
         base_dir = Path(__file__).resolve().parents[1]
         self._dataset_dir = Path(dataset_dir or base_dir / "datasets")
+        # Share the process-wide tables unless pointed at a different dataset directory.
+        self._datasets = (
+            DatasetRegistry(directories=[str(self._dataset_dir)]) if dataset_dir else dataset_registry
+        )
 
         self._asset_df: Optional[pd.DataFrame] = None
         self._asset_lookup: Dict[str, Dict[str, str]] = {}
         self._symbol_lookup: Dict[str, Dict[str, str]] = {}
         self._close_prices_df: Optional[pd.DataFrame] = None
+        self._price_index: Optional[PriceIndex] = None
         self._isin_last_date: Dict[str, date] = {}
 
         # Dataset stops on 29 Nov 2022; treat that as the "current" market date.
@@ -39,12 +48,11 @@ class DatasetTimeSeriesService:
             if self._asset_df is not None:
                 return
 
-            asset_path = self._dataset_dir / "asset_information.csv"
-            if not asset_path.exists():
-                logger.error("Asset information dataset not found at %s", asset_path)
-                raise FileNotFoundError(f"asset_information.csv not found at {asset_path}")
+            if not self._datasets.has("asset_catalog"):
+                logger.error("Asset information dataset not found in %s", self._dataset_dir)
+                raise FileNotFoundError(f"asset_information.csv not found in {self._dataset_dir}")
 
-            df = pd.read_csv(asset_path, dtype=str).fillna("")
+            df = self._datasets.get("asset_catalog").fillna("")
             df["assetShortName"] = df["assetShortName"].str.strip()
             df["assetName"] = df["assetName"].str.strip()
             df["ISIN"] = df["ISIN"].astype(str).str.strip()
@@ -101,27 +109,24 @@ class DatasetTimeSeriesService:
             if self._close_prices_df is not None:
                 return
 
-            price_path = self._dataset_dir / "close_prices.csv"
-            if not price_path.exists():
-                logger.error("Close prices dataset not found at %s", price_path)
-                raise FileNotFoundError(f"close_prices.csv not found at {price_path}")
-
-            df = pd.read_csv(price_path, dtype={"ISIN": str}).fillna("")
-            df["ISIN"] = df["ISIN"].astype(str).str.strip()
-            df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-            df["closePrice"] = pd.to_numeric(df["closePrice"], errors="coerce")
+            if not self._datasets.has("close_prices"):
+                logger.error("Close prices dataset not found in %s", self._dataset_dir)
+                raise FileNotFoundError(f"close_prices.csv not found in {self._dataset_dir}")
 
-            df = df.dropna(subset=["timestamp", "closePrice"])
-            df.sort_values(["ISIN", "timestamp"], inplace=True)
+            # The registry already drops incomplete rows and sorts by ISIN/timestamp.
+            df = self._datasets.get("close_prices", columns=["ISIN", "timestamp", "closePrice"])
 
-            max_dates = df.groupby("ISIN")["timestamp"].max().dropna()
-            self._isin_last_date = {
-                isin: ts.normalize().date()
-                for isin, ts in max_dates.items()
-            }
+            self._price_index = PriceIndex.from_frame(df)
+            self._isin_last_date = self._price_index.last_dates()
 
             self._close_prices_df = df
 
+    def warm_up(self) -> None:
+        """Build the asset catalog, close-price index and symbol lookup ahead of the first request."""
+        self._ensure_asset_catalog()
+        self._ensure_close_prices()
+        self._ensure_symbol_lookup()
+
     # ---------- helpers ----------
     def _get_asset_info(self, isin: str) -> Dict[str, str]:
         self._ensure_asset_catalog()
@@ -249,31 +254,22 @@ class DatasetTimeSeriesService:
         if start_ts > end_ts:
             return []
 
-        df = self._close_prices_df
-
-        mask = (
-            df["ISIN"].isin(normalized_isins)
-            & (df["timestamp"] >= start_ts)
-            & (df["timestamp"] <= end_ts)
-        )
-
-        filtered = df.loc[mask]
-        if filtered.empty:
-            return []
-
+        index = self._price_index
         series: List[Dict[str, Any]] = []
         for isin in normalized_isins:
-            asset_rows = filtered.loc[filtered["ISIN"] == isin]
-            if asset_rows.empty:
+            timestamps, closes = index.range(isin, start_ts, end_ts)
+            if not len(timestamps):
                 continue
 
             prices = [
                 {
-                    "date": ts.date().isoformat(),
-                    "price": float(price),
+                    "date": day,
+                    "price": price,
                 }
-                for ts, price in zip(asset_rows["timestamp"], asset_rows["closePrice"])
-                if pd.notna(price)
+                for day, price in zip(
+                    np.datetime_as_string(timestamps, unit="D").tolist(),
+                    closes.tolist(),
+                )
             ]
 
             if not prices:
@@ -365,13 +361,10 @@ class DatasetTimeSeriesService:
         if not last_date:
             return None
 
-        df = self._close_prices_df
-        rows = df.loc[(df["ISIN"] == normalized) & (df["timestamp"].dt.date == last_date)]
-        if rows.empty:
+        latest = self._price_index.latest(normalized)
+        if latest is None:
             return None
-
-        price = rows.iloc[-1]["closePrice"]
-        return float(price) if pd.notna(price) else None
+        return latest[1]
 
     def get_latest_price_for_symbol(self, symbol: str) -> Optional[float]:
         info = self.get_symbol_info(symbol)
@@ -435,25 +428,11 @@ class DatasetTimeSeriesService:
         if not isin or self._close_prices_df is None:
             return None
 
-        df = self._close_prices_df
-        rows = df.loc[
-            (df["ISIN"] == isin)
-            & (df["timestamp"].dt.date == pd.Timestamp(target_date).date())
-        ]
-
-        if rows.empty:
-            # Fall back to the latest price before the target date.
-            history = df.loc[(df["ISIN"] == isin) & (df["timestamp"].dt.date <= target_date)]
-            if history.empty:
-                return None
-            row = history.iloc[-1]
-        else:
-            row = rows.iloc[-1]
-
-        price = row.get("closePrice")
-        ts = row.get("timestamp")
-        if pd.isna(price) or pd.isna(ts):
+        # Price on the target date, falling back to the latest price before it.
+        match = self._price_index.on_or_before(isin.strip(), target_date)
+        if match is None:
             return None
+        ts, price = match
 
         return {
             "symbol": info.get("symbol", symbol),
@@ -462,3 +441,17 @@ class DatasetTimeSeriesService:
             "price": float(price),
             "price_date": ts.date(),
         }
+
+
+_shared_service: Optional[DatasetTimeSeriesService] = None
+_shared_service_lock = Lock()
+
+
+def get_dataset_service() -> DatasetTimeSeriesService:
+    """Return the process-wide service so lookups and indexes are built only once."""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_service_lock:
+            if _shared_service is None:
+                _shared_service = DatasetTimeSeriesService()
+    return _shared_service
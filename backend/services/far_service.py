@@ -1,14 +1,23 @@
 ﻿from __future__ import annotations
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import pandas as pd
 import numpy as np
 
+from core.cache import TTLCache, canonical_key
+from core.config import settings
+from core.dataset_registry import dataset_registry
+from services.cohort_filter import get_bitmap_index
+from services.customer_index import CustomerIndex
+from services.position_engine import position_book
+
 # Resolve datasets directory robustly (supports both backend/datasets and repo_root/datasets)
 BACKEND_ROOT = os.path.dirname(os.path.dirname(__file__))
 DATASET_DIRS = [
@@ -18,6 +27,14 @@ DATASET_DIRS = [
 
 
 
+# Filtered cohorts shared by the dashboard endpoints, which all post the same filters.
+_cohort_cache = TTLCache(
+    maxsize=settings.far_cohort_cache_size,
+    ttl_seconds=settings.far_cohort_cache_ttl_seconds,
+    name="far_cohort",
+)
+
+
 @dataclass
 class DatasetPaths:
     customers: Optional[str]
@@ -74,59 +91,56 @@ def detect_datasets() -> DatasetPaths:
         close_prices=close_prices,
     )
 
-def _read_df(path: str) -> pd.DataFrame:
-    if path.endswith(".parquet"):
-        return pd.read_parquet(path)
-    return pd.read_csv(path)
-
-
 @lru_cache(maxsize=1)
 def load_dataframes() -> Dict[str, pd.DataFrame]:
-    paths = detect_datasets()
+    # Views over the process-wide dataset registry; the tables themselves are shared
+    # with every other service, so only columns touched here get copied.
     dfs: Dict[str, pd.DataFrame] = {}
     
-    if paths.customers:
-        cust_df = _read_df(paths.customers)
+    cust_df = dataset_registry.get_optional("customers")
+    if cust_df is not None:
         for col in ["timestamp", "lastQuestionnaireDate"]:
-            if col in cust_df.columns:
+            if col in cust_df.columns and not pd.api.types.is_datetime64_any_dtype(cust_df[col]):
                 cust_df[col] = pd.to_datetime(cust_df[col], errors="coerce")
         dfs["customers"] = cust_df
         
-    if paths.transactions:
-        tx_df = _read_df(paths.transactions)
+    tx_df = dataset_registry.get_optional("transactions")
+    if tx_df is not None:
         for col in ["date", "txn_date", "transaction_date"]:
             if col in tx_df.columns:
                 tx_df[col] = pd.to_datetime(tx_df[col], errors="coerce")
                 break
         dfs["transactions"] = tx_df
         
-    if paths.assets:
-        asset_df = _read_df(paths.assets)
+    asset_df = dataset_registry.get_optional("assets")
+    if asset_df is not None:
         dfs["assets"] = asset_df
         
-    if paths.markets:
-        market_df = _read_df(paths.markets)
+    market_df = dataset_registry.get_optional("markets")
+    if market_df is not None:
         dfs["markets"] = market_df
         
-    if paths.close_prices:
-        price_df = _read_df(paths.close_prices)
-        price_df["timestamp"] = pd.to_datetime(price_df["timestamp"], errors="coerce")
+    price_df = dataset_registry.get_optional("close_prices")
+    if price_df is not None:
         dfs["close_prices"] = price_df
 
     return dfs
 
 
+@lru_cache(maxsize=1)
+def get_customer_index() -> CustomerIndex:
+    """Per-customer index over the loaded customers/transactions, built once."""
+    dfs = load_dataframes()
+    return CustomerIndex.build(dfs.get("transactions"), dfs.get("customers"))
+
+
 def customer_exists(customer_id: str) -> bool:
     """Return True if the FAR dataset contains the given customer."""
     if not customer_id:
         return False
-    dfs = load_dataframes()
-    cust_df = dfs.get("customers")
-    if cust_df is None or cust_df.empty or "customerID" not in cust_df.columns:
-        return False
     normalized = str(customer_id).strip()
     try:
-        return normalized in set(cust_df["customerID"].astype(str))
+        return normalized in get_customer_index()
     except Exception:
         return False
 
@@ -142,6 +156,18 @@ def get_filtered_transactions(filters: dict) -> pd.DataFrame:
     if cust is None or cust.empty or tx is None or tx.empty:
         return pd.DataFrame()  # nothing to return
 
+    key = ("transactions", canonical_key(filters))
+    cached = _cohort_cache.get(key)
+    if cached is not None and cached[0] is cust and cached[1] is tx:
+        # Shallow copy: with copy-on-write, callers adding columns never touch the cache.
+        return cached[2].copy(deep=False)
+
+    tx_f = _filter_transactions(cust, tx, filters)
+    _cohort_cache.set(key, (cust, tx, tx_f))
+    return tx_f.copy(deep=False)
+
+
+def _filter_transactions(cust: pd.DataFrame, tx: pd.DataFrame, filters: dict) -> pd.DataFrame:
     # 1. Filter customers first
     cust_f = _apply_filters(cust, filters)
     if cust_f.empty:
@@ -166,6 +192,10 @@ def get_filtered_transactions(filters: dict) -> pd.DataFrame:
     return tx_f
 
 
+def cohort_cache_stats() -> dict:
+    return _cohort_cache.stats()
+
+
 def reset_cache() -> None:
     """Clear cached dataset detection and loaded dataframes."""
     try:
@@ -176,6 +206,13 @@ def reset_cache() -> None:
         load_dataframes.cache_clear()  # type: ignore[attr-defined]
     except Exception:
         pass
+    try:
+        get_customer_index.cache_clear()  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    _cohort_cache.clear()
+    dataset_registry.invalidate()
+    position_book.invalidate()
 
 
 # Helper: Derive name of stock
@@ -224,7 +261,7 @@ def get_customer_transactions(customer_id: str):
     if "customerID" not in transactions_df.columns:
         return []
     
-    tx_f = transactions_df[transactions_df["customerID"] == customer_id].copy()
+    tx_f = get_customer_index().transactions_for(transactions_df, customer_id)
     if tx_f.empty:
         return []
     
@@ -453,103 +490,116 @@ def _capacity_matches_filter(capacity_str: str, filter_values: list) -> bool:
     return False
 
 
-def _apply_filters(df: pd.DataFrame, filters: dict, dataset_type: str = "customer", exclude_cols: list = None) -> pd.DataFrame:
+_FILTER_COLUMNS = {
+    "customer": {
+        "customer_type": ["customerType"],
+        "investor_type": ["investor_type"],
+        "risk_level": ["riskLevel"],
+        "cluster": ["cluster"],
+    },
+    "asset": {
+        "investor_type": ["investor_type"],
+    },
+}
+_SECTOR_COLUMNS = {"customer": "preferred_sector", "asset": "sector"}
+_FILTER_DATE_COLUMNS = ["date", "txn_date", "transaction_date", "timestamp", "lastQuestionnaireDate"]
+
+
+def _lower_in(values: set):
+    return lambda value: pd.notna(value) and str(value).lower() in values
+
+
+def filter_mask(df: pd.DataFrame, filters: dict, dataset_type: str = "customer", exclude_cols: list = None) -> np.ndarray:
     """
-    Apply filters to dataframe.
-    
-    Args:
-        df: DataFrame to filter
-        filters: Dictionary of filter values
-        dataset_type: Type of dataset ("customer" or "asset")
-        exclude_cols: List of column filter keys to exclude from filtering
+    Boolean row mask of ``df`` matching ``filters`` (see ``_apply_filters``).
+
+    Built from a per-frame bitmap index, so repeated calls against the shared dataset
+    frames only AND/OR precomputed bitmaps and never copy or re-parse the frame.
     """
-    if df is None or df.empty:
-        return df.copy()
-    
-    out = df.copy()
+    filters = filters or {}
     exclude_cols = exclude_cols or []
-       
-    # Map incoming filter keys to dataset columns
-    mapping = {}
-    if dataset_type == "customer":
-        mapping = {
-            "customer_type": ["customerType"],
-            "investor_type": ["investor_type"],
-            "risk_level": ["riskLevel"],
-            "cluster": ["cluster"],
-        }
-        sector_col = "preferred_sector"
-    elif dataset_type == "asset":
-        mapping = {
-            "investor_type": ["investor_type"],
-        }
-        sector_col = "sector"
-    else:
-        sector_col = None
-    
+    mapping = _FILTER_COLUMNS.get(dataset_type, {})
+    sector_col = _SECTOR_COLUMNS.get(dataset_type)
+    date_col = next((c for c in _FILTER_DATE_COLUMNS if c in df.columns), None)
+
+    columns = [candidates[0] for candidates in mapping.values()]
+    if sector_col:
+        columns.append(sector_col)
+    columns.append("investmentCapacity")
+    index = get_bitmap_index(df, columns, [date_col] if date_col else [])
+
+    cache_key = ("mask", id(index), dataset_type, canonical_key({"filters": filters, "exclude": exclude_cols}))
+    cached = _cohort_cache.get(cache_key)
+    if cached is not None and cached[0] is index:
+        return cached[1]
+
+    mask = index.all()
+
     # Categorical filters (skip excluded columns)
     for key, candidates in mapping.items():
         if key in exclude_cols:
             continue
-            
-        values = (filters or {}).get(key)
-        if values:
-            present_col = next((c for c in candidates if c in out.columns), None)
-            if present_col:
-                # Special handling for cluster - it's int64 in dataset
-                if key == "cluster":
-                    # Convert filter values to integers
-                    values_int = []
-                    for v in values:
-                        try:
-                            values_int.append(int(float(v)))  # handle both "1" and 1
-                        except (ValueError, TypeError):
-                            print(f"Warning: Could not convert cluster value {v} to int")
-                    
-                    if values_int:
-                        # Direct integer comparison with int64 column
-                        out = out[out[present_col].isin(values_int)]
-                        print(f"_apply_filters - Applied {key} filter with values {values_int}, remaining rows: {len(out)}")
-                else:
-                    # Regular string comparison for other categorical filters
-                    values_l = set(str(v).lower() for v in values)
-                    col_l = out[present_col].astype(str).str.lower()
-                    out = out[col_l.isin(values_l)]
-                    print(f"_apply_filters - Applied {key} filter, remaining rows: {len(out)}")
-   
+        values = filters.get(key)
+        present_col = next((c for c in candidates if index.has(c)), None)
+        if not values or not present_col:
+            continue
+        if key == "cluster":
+            # Cluster is numeric in the dataset; accept both "1" and 1.
+            values_int = set()
+            for v in values:
+                try:
+                    values_int.add(int(float(v)))
+                except (ValueError, TypeError):
+                    print(f"Warning: Could not convert cluster value {v} to int")
+            if values_int:
+                mask &= index.match(present_col, lambda value: pd.notna(value) and value in values_int)
+        else:
+            mask &= index.match(present_col, _lower_in({str(v).lower() for v in values}))
+
     # Sector filter
     if "sectors" not in exclude_cols:
-        sectors = (filters or {}).get("sectors")
-        if sectors and sector_col and sector_col in out.columns:
-            sectors_l = set(str(v).lower() for v in sectors)
-            out = out[out[sector_col].astype(str).str.lower().isin(sectors_l)]
-            print(f"_apply_filters - Applied sectors filter, remaining rows: {len(out)}")
-    
-    # Investment Capacity filter (categorical)
+        sectors = filters.get("sectors")
+        if sectors and sector_col and index.has(sector_col):
+            mask &= index.match(sector_col, _lower_in({str(v).lower() for v in sectors}))
+
+    # Investment Capacity filter (categorical; Predicted_ bands match their actual band)
     if "investment_capacity" not in exclude_cols:
-        capacity_filters = (filters or {}).get("investment_capacity")
-        if capacity_filters and "investmentCapacity" in out.columns:
-            mask = out["investmentCapacity"].apply(
-                lambda x: _capacity_matches_filter(x, capacity_filters)
+        capacity_filters = filters.get("investment_capacity")
+        if capacity_filters and index.has("investmentCapacity"):
+            mask &= index.match(
+                "investmentCapacity",
+                lambda value: _capacity_matches_filter(value, capacity_filters),
             )
-            out = out[mask]
-            print(f"_apply_filters - Applied investment_capacity filter, remaining rows: {len(out)}")
-    
+
     # Date filter
     if "date_range" not in exclude_cols:
-        date_range = (filters or {}).get("date_range")
-        date_col = next((c for c in ["date", "txn_date", "transaction_date", "timestamp", "lastQuestionnaireDate"] if c in out.columns), None)
+        date_range = filters.get("date_range")
         if date_range and date_col:
             start = date_range.get("start")
             end = date_range.get("end")
-            if start:
-                out = out[pd.to_datetime(out[date_col], errors="coerce") >= pd.to_datetime(start)]
-            if end:
-                out = out[pd.to_datetime(out[date_col], errors="coerce") <= pd.to_datetime(end)]
-            print(f"_apply_filters - Applied date_range filter, remaining rows: {len(out)}")
+            if start or end:
+                mask &= index.between(date_col, start or None, end or None)
+
+    # Cached masks are shared between requests, so freeze them.
+    mask.setflags(write=False)
+    _cohort_cache.set(cache_key, (index, mask))
+    return mask
+
+
+def _apply_filters(df: pd.DataFrame, filters: dict, dataset_type: str = "customer", exclude_cols: list = None) -> pd.DataFrame:
+    """
+    Apply filters to dataframe.
     
-    print(f"_apply_filters - Final rows: {len(out)}")
-    return out
+    Args:
+        df: DataFrame to filter
+        filters: Dictionary of filter values
+        dataset_type: Type of dataset ("customer" or "asset")
+        exclude_cols: List of column filter keys to exclude from filtering
+    """
+    if df is None or df.empty:
+        return df.copy()
+
+    return df[filter_mask(df, filters, dataset_type, exclude_cols)]
 
 
 def get_category_breakdown(filters: dict, column: str, top_n: int = 20, include_clusters: bool = False) -> dict:
@@ -1238,3 +1288,89 @@ def get_affinity_matrix(filters: dict, attributes: list, asset_column: str) -> d
         matrix[attr] = ct_norm.to_dict('index')
     
     return {"matrix": matrix}
+
+
+# ---------- batch dashboard ----------
+def _param(panel: dict, name: str, default):
+    # Only an absent/None parameter takes the endpoint default; 0 and "" are passed on as given.
+    value = panel.get(name)
+    return default if value is None else value
+
+
+_DASHBOARD_PANELS = {
+    "metrics": lambda filters, p: get_metrics(filters),
+    "top_assets": lambda filters, p: get_top_assets(filters, _param(p, "top_n", 20)),
+    "sector_prefs": lambda filters, p: get_sector_prefs(filters),
+    "activity_series": lambda filters, p: get_activity_series(filters, _param(p, "interval", "month")),
+    "histogram": lambda filters, p: get_histogram(filters, p["column"], _param(p, "bins", 20)),
+    "category_breakdown": lambda filters, p: get_category_breakdown(
+        filters, p["column"], _param(p, "top_n", 20), bool(p.get("include_clusters"))
+    ),
+    "risk_return_matrix": lambda filters, p: get_risk_return_matrix(
+        filters, _param(p, "group_by", "preferred_asset_category")
+    ),
+    "affinity_matrix": lambda filters, p: get_affinity_matrix(
+        filters, p.get("attributes"), _param(p, "asset_column", "preferred_asset_category")
+    ),
+    "efficient_frontier": lambda filters, p: get_efficient_frontier(filters),
+}
+
+# Parameters a panel cannot run without (its single endpoint requires them too).
+_DASHBOARD_REQUIRED = {
+    "histogram": ("column",),
+    "category_breakdown": ("column",),
+}
+
+_dashboard_executor: Optional[ThreadPoolExecutor] = None
+_dashboard_executor_lock = threading.Lock()
+
+
+def _get_dashboard_executor() -> ThreadPoolExecutor:
+    global _dashboard_executor
+    if _dashboard_executor is None:
+        with _dashboard_executor_lock:
+            if _dashboard_executor is None:
+                _dashboard_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.far_dashboard_workers),
+                    thread_name_prefix="far-dashboard",
+                )
+    return _dashboard_executor
+
+
+def _run_panel(filters: dict, panel: dict) -> dict:
+    missing = [name for name in _DASHBOARD_REQUIRED.get(panel["type"], ()) if panel.get(name) is None]
+    if missing:
+        return {"data": None, "error": f"Missing panel parameter: {', '.join(missing)}"}
+    try:
+        return {"data": _DASHBOARD_PANELS[panel["type"]](filters, panel), "error": None}
+    except Exception as error:
+        return {"data": None, "error": str(error)}
+
+
+def get_dashboard(filters: dict, panels: List[dict]) -> dict:
+    """
+    Compute several dashboard panels for one cohort in a single call.
+
+    The customer mask and the merged transaction frame are computed once up front
+    (and land in the cohort cache); the independent panels then run in parallel on
+    a shared thread pool. A failing panel reports its error without failing the rest.
+    """
+    dfs = load_dataframes()
+    cust = dfs.get("customers")
+    if cust is not None and not cust.empty:
+        filter_mask(cust, filters)
+    get_filtered_transactions(filters)
+
+    keys: List[str] = []
+    for position, panel in enumerate(panels):
+        key = panel.get("id") or panel["type"]
+        keys.append(key if key not in keys else f"{key}_{position}")
+
+    executor = _get_dashboard_executor()
+    futures = [executor.submit(_run_panel, filters, panel) for panel in panels]
+    return {
+        "panels": {
+            key: {"type": panel["type"], **future.result()}
+            for key, panel, future in zip(keys, panels, futures)
+        }
+    }
@@ -0,0 +1,278 @@
+import logging
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MarketDataProvider(ABC):
+    """
+    Upstream source of OHLC history and ticker metadata.
+
+    ``history`` fetches one symbol; ``download`` fetches several in one upstream call
+    and returns a frame per symbol (symbols it could not resolve are simply absent).
+    Windows are either ``period`` (e.g. ``"1d"``) or ``start``/``end`` ISO dates with
+    ``end`` exclusive, as in yfinance.
+    """
+
+    @abstractmethod
+    def history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        ...
+
+    @abstractmethod
+    def download(
+        self,
+        symbols: List[str],
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        ...
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict[str, Any]:
+        ...
+
+
+def _window(period: Optional[str], start: Optional[str], end: Optional[str]) -> Dict[str, str]:
+    window = {"period": period, "start": start, "end": end}
+    return {key: value for key, value in window.items() if value is not None}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance through the ``yfinance`` package (imported on the first upstream call)."""
+
+    def __init__(self) -> None:
+        # yf.download collects results in module-level dicts, so concurrent bulk
+        # downloads from different requests would mix their tickers.
+        self._download_lock = threading.Lock()
+
+    def history(self, symbol, period=None, start=None, end=None):
+        import yfinance as yf
+
+        return yf.Ticker(symbol).history(auto_adjust=True, **_window(period, start, end))
+
+    def download(self, symbols, period=None, start=None, end=None):
+        import yfinance as yf
+
+        with self._download_lock:
+            frame = yf.download(
+                symbols,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+                **_window(period, start, end),
+            )
+
+        results: Dict[str, pd.DataFrame] = {}
+        if frame is None or frame.empty:
+            return results
+        if not isinstance(frame.columns, pd.MultiIndex):
+            frame = pd.concat({symbols[0]: frame}, axis=1)
+
+        available = set(frame.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in available:
+                continue
+            # Every ticker shares the union of trading days; drop the days it has no bar for.
+            history = frame[symbol].dropna(how="all")
+            if "Close" in history.columns:
+                history = history.dropna(subset=["Close"])
+            if not history.empty:
+                results[symbol] = history
+        return results
+
+    def info(self, symbol):
+        import yfinance as yf
+
+        return yf.Ticker(symbol).info or {}
+
+
+_PERIOD_DAYS = re.compile(r"^(\d+)d$")
+
+
+class StubProvider(MarketDataProvider):
+    """
+    In-memory provider for local runs and tests.
+
+    ``histories`` maps symbols to frames with a ``DatetimeIndex`` and a ``Close``
+    column. ``latency`` (seconds, global or per symbol) simulates slow upstream
+    calls and ``bulk=False`` makes ``download`` fail so the per-symbol path is used.
+    Every upstream call is recorded in ``calls``.
+    """
+
+    def __init__(
+        self,
+        histories: Optional[Dict[str, pd.DataFrame]] = None,
+        infos: Optional[Dict[str, Dict[str, Any]]] = None,
+        latency: Union[float, Dict[str, float]] = 0.0,
+        bulk: bool = True,
+    ) -> None:
+        self.histories = {symbol.upper(): frame.sort_index() for symbol, frame in (histories or {}).items()}
+        self.infos = {symbol.upper(): info for symbol, info in (infos or {}).items()}
+        self.latency = latency
+        self.bulk = bulk
+        self.calls: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def _delay(self, symbol: str) -> None:
+        delay = self.latency.get(symbol, 0.0) if isinstance(self.latency, dict) else self.latency
+        if delay:
+            time.sleep(delay)
+
+    def _slice(self, symbol, period, start, end) -> pd.DataFrame:
+        frame = self.histories.get(symbol)
+        if frame is None:
+            return pd.DataFrame(columns=["Close"])
+        if period is not None:
+            match = _PERIOD_DAYS.match(period)
+            return frame.tail(int(match.group(1))) if match else frame
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        if end is not None:
+            frame = frame[frame.index < pd.Timestamp(end)]
+        return frame
+
+    def history(self, symbol, period=None, start=None, end=None):
+        with self._lock:
+            self.calls.append(("history", symbol))
+        self._delay(symbol)
+        return self._slice(symbol, period, start, end)
+
+    def download(self, symbols, period=None, start=None, end=None):
+        with self._lock:
+            self.calls.append(("download", tuple(symbols)))
+        if not self.bulk:
+            raise RuntimeError("bulk download disabled")
+        self._delay(symbols[0])
+        results = {symbol: self._slice(symbol, period, start, end) for symbol in symbols}
+        return {symbol: frame for symbol, frame in results.items() if not frame.empty}
+
+    def info(self, symbol):
+        with self._lock:
+            self.calls.append(("info", symbol))
+        return self.infos.get(symbol, {})
+
+
+class FetchPool:
+    """
+    Fetches OHLC history for many symbols at once.
+
+    Symbols are first requested in one bulk ``download``; whatever that misses (or
+    everything, if it fails) is fetched per symbol on a bounded thread pool. Each
+    symbol gets ``symbol_timeout`` seconds of worker time; symbols that do not answer
+    in time come back as ``None`` instead of holding up the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        workers: int = 8,
+        symbol_timeout: float = 10.0,
+        bulk: bool = True,
+    ) -> None:
+        self.provider = provider
+        self.workers = max(1, int(workers))
+        self.symbol_timeout = float(symbol_timeout)
+        self.bulk = bulk
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="market-data",
+                    )
+        return self._executor
+
+    def _fetch_each(self, symbols: List[str], **window) -> Dict[str, Optional[pd.DataFrame]]:
+        executor = self._get_executor()
+        futures = {symbol: executor.submit(self.provider.history, symbol, **window) for symbol in symbols}
+        # Queued symbols wait for a free worker, so the batch deadline scales with the
+        # number of rounds the pool needs.
+        deadline = time.monotonic() + self.symbol_timeout * math.ceil(len(symbols) / self.workers)
+        results: Dict[str, Optional[pd.DataFrame]] = {}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning("Timed out fetching history for %s", symbol)
+                results[symbol] = None
+            except Exception as error:
+                logger.error("Error fetching history for %s: %s", symbol, error)
+                results[symbol] = None
+        return results
+
+    def histories(
+        self,
+        symbols: Iterable[str],
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Dict[str, Optional[pd.DataFrame]]:
+        """History per upper-cased symbol; ``None`` when the symbol failed or timed out."""
+        wanted = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        results: Dict[str, Optional[pd.DataFrame]] = {}
+
+        if self.bulk and len(wanted) > 1:
+            try:
+                results.update(self.provider.download(wanted, period=period, start=start, end=end))
+            except Exception as error:
+                logger.warning("Bulk download of %d symbols failed, fetching individually: %s", len(wanted), error)
+
+        missing = [symbol for symbol in wanted if symbol not in results]
+        if missing:
+            results.update(self._fetch_each(missing, period=period, start=start, end=end))
+        return {symbol: results[symbol] for symbol in wanted}
+
+
+_provider: MarketDataProvider = YFinanceProvider()
+_pool: Optional[FetchPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    return _provider
+
+
+def get_fetch_pool() -> FetchPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = FetchPool(
+                    _provider,
+                    workers=settings.yfinance_fetch_workers,
+                    symbol_timeout=settings.yfinance_symbol_timeout_seconds,
+                    bulk=settings.yfinance_bulk_download,
+                )
+    return _pool
+
+
+def set_provider(provider: MarketDataProvider) -> None:
+    """Swap the upstream provider (e.g. a ``StubProvider`` for local runs)."""
+    global _provider, _pool
+    with _pool_lock:
+        _provider = provider
+        _pool = None
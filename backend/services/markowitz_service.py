@@ -7,10 +7,10 @@ from models.markowitz import (
     MarkowitzOptimisationError,
     optimize_portfolio_weights,
 )
-from services.dataset_time_series_service import DatasetTimeSeriesService
+from services.dataset_time_series_service import get_dataset_service
 
 
-dataset_service = DatasetTimeSeriesService()
+dataset_service = get_dataset_service()
 
 
 def _normalize_isins(isins: List[str]) -> List[str]:
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.files import FileSignature, file_signature
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _RegistryEntry:
+    loader: Callable[[], Any]
+    paths: Tuple[str, ...]
+    value: Any = None
+    signature: Optional[FileSignature] = None
+    loaded_at: Optional[float] = None
+    load_seconds: Optional[float] = None
+    last_checked: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    """
+    Process-wide holder for expensive model pipelines.
+
+    Each pipeline is loaded lazily on first use (or eagerly via ``preload``) behind a
+    per-entry lock and then shared by every request. The files a pipeline was built
+    from are re-stat'ed at most every ``check_interval`` seconds; when one of them
+    changes the pipeline is rebuilt and swapped in atomically. Requests already
+    holding the previous pipeline keep using it until they finish.
+    """
+
+    def __init__(self, check_interval: float = 30.0) -> None:
+        self._check_interval = max(0.0, float(check_interval))
+        self._entries: Dict[str, _RegistryEntry] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], paths: Iterable[str] = ()) -> None:
+        self._entries[name] = _RegistryEntry(loader=loader, paths=tuple(paths))
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, name: str) -> Any:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown model pipeline: {name}")
+
+        value = entry.value
+        if value is not None and time.monotonic() - entry.last_checked < self._check_interval:
+            return value
+
+        with entry.lock:
+            now = time.monotonic()
+            if entry.value is not None:
+                if now - entry.last_checked < self._check_interval:
+                    return entry.value
+                entry.last_checked = now
+                if file_signature(entry.paths) == entry.signature:
+                    return entry.value
+                logger.info("Model files for %s changed on disk; reloading", name)
+                try:
+                    self._load(name, entry)
+                except Exception as error:
+                    # Keep serving the previous pipeline rather than failing requests.
+                    logger.exception("Reloading %s failed, keeping previous version: %s", name, error)
+                return entry.value
+
+            self._load(name, entry)
+            return entry.value
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """Eagerly load the given pipelines (all by default); returns name -> error message."""
+        results: Dict[str, Optional[str]] = {}
+        for name in names or self.names():
+            try:
+                self.get(name)
+                results[name] = None
+            except Exception as error:
+                logger.exception("Failed to preload model pipeline %s: %s", name, error)
+                results[name] = str(error)
+        return results
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop loaded pipelines so the next ``get`` rebuilds them."""
+        targets = [name] if name else self.names()
+        for target in targets:
+            entry = self._entries.get(target)
+            if entry is None:
+                continue
+            with entry.lock:
+                entry.value = None
+                entry.signature = None
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "loaded": entry.value is not None,
+                "loaded_at": entry.loaded_at,
+                "load_seconds": entry.load_seconds,
+            }
+            for name, entry in self._entries.items()
+        }
+
+    @staticmethod
+    def _load(name: str, entry: _RegistryEntry) -> None:
+        # Take the signature before loading so a file replaced mid-load triggers another reload.
+        signature = file_signature(entry.paths)
+        started = time.perf_counter()
+        value = entry.loader()
+        entry.load_seconds = time.perf_counter() - started
+        entry.value = value
+        entry.signature = signature
+        entry.loaded_at = time.time()
+        entry.last_checked = time.monotonic()
+        logger.info("Loaded model pipeline %s in %.2fs", name, entry.load_seconds)
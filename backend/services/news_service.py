@@ -1,7 +1,13 @@
+import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional
-import yfinance as yf
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.cache import SingleFlight, build_backend
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +24,134 @@ def _parse_pubdate_iso8601_z(s: Optional[str]) -> Optional[datetime]:
     except Exception:
         return None
 
+def _encode_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {**item, "published_at": item["published_at"].isoformat() if item.get("published_at") else None}
+        for item in items
+    ]
+
+
+def _decode_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {**item, "published_at": datetime.fromisoformat(item["published_at"]) if item.get("published_at") else None}
+        for item in items
+    ]
+
+
+class NewsCache:
+    """
+    Bounded, thread-safe headline cache with stale-while-revalidate.
+
+    Each symbol's entry remembers how many headlines were requested upstream
+    (``depth``); it only answers requests for at most that many, so a small
+    ``limit`` never truncates later, larger ones. Entries younger than
+    ``fresh_seconds`` are served as is; older ones (up to ``stale_seconds``) are
+    served immediately while one background refresh replaces them. Concurrent
+    misses for the same symbol share one upstream fetch. Entries are stored
+    JSON-encoded so a Redis backend can share them between workers.
+    """
+
+    def __init__(self, backend, fresh_seconds: float, stale_seconds: float) -> None:
+        self.backend = backend
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = max(stale_seconds, fresh_seconds)
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _load(self, symbol: str, depth: int, fetch: Callable[[str, int], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        items = fetch(symbol, depth)
+        entry = {"fetched_at": time.time(), "depth": depth, "items": _encode_items(items)}
+        try:
+            self.backend.set(symbol, entry, self.stale_seconds)
+        except Exception as e:  # pragma: no cover - backend outage only costs a refetch
+            logger.warning("NewsCache: write failed for %s: %s", symbol, e)
+        return items
+
+    def _refresh_in_background(self, symbol: str, depth: int, fetch) -> None:
+        with self._lock:
+            if symbol in self._refreshing:
+                return
+            self._refreshing.add(symbol)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="news-refresh")
+        self._count("refreshes")
+
+        def refresh() -> None:
+            try:
+                self._load(symbol, depth, fetch)
+            except Exception as e:
+                logger.warning("NewsCache: background refresh failed for %s: %s", symbol, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(symbol)
+
+        self._refresher.submit(refresh)
+
+    def get(self, symbol: str, limit: int, fetch: Callable[[str, int], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        try:
+            entry = self.backend.get(symbol)
+        except Exception as e:  # pragma: no cover - backend outage falls through to upstream
+            logger.warning("NewsCache: read failed for %s: %s", symbol, e)
+            entry = None
+
+        if entry is not None and entry["depth"] >= limit:
+            if time.time() - entry["fetched_at"] > self.fresh_seconds:
+                self._count("stale_hits")
+                self._refresh_in_background(symbol, entry["depth"], fetch)
+            else:
+                self._count("hits")
+            return _decode_items(entry["items"])[:limit]
+
+        self._count("misses")
+        depth = max(limit, entry["depth"] if entry is not None else 0)
+        items = self._flight.do((symbol, depth), lambda: self._load(symbol, depth, fetch))
+        return items[:limit]
+
+    def refresh(self, symbol: str, depth: int, fetch: Callable[[str, int], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Fetch ``depth`` headlines upstream now and replace the cached entry."""
+        return self._flight.do((symbol, depth), lambda: self._load(symbol, depth, fetch))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+        served = counters["hits"] + counters["stale_hits"]
+        return {
+            **counters,
+            "hit_rate": (served / lookups) if lookups else None,
+            "coalesced": self._flight.coalesced,
+            "store": self.backend.stats(),
+        }
+
+
 class NewsService:
-    _cache: Dict[str, Dict[str, Any]] = {}
-    _ttl = timedelta(minutes=5)
+    _cache = NewsCache(
+        build_backend(
+            settings.news_cache_backend,
+            settings.news_cache_redis_url,
+            settings.news_cache_size,
+            prefix="news:",
+        ),
+        fresh_seconds=settings.news_cache_ttl_seconds,
+        stale_seconds=settings.news_cache_stale_seconds,
+    )
+    _executor: Optional[ThreadPoolExecutor] = None
 
     @classmethod
     def _from_yfinance(cls, symbol: str, limit: int) -> List[Dict[str, Any]]:
         try:
+            import yfinance as yf
+
             raw = yf.Ticker(symbol).news or []
         except Exception as e:
             logger.warning("NewsService: yfinance error for %s: %s", symbol, e)
@@ -71,15 +198,59 @@ class NewsService:
         return cleaned
 
     @classmethod
-    def get_news(cls, symbol: str, limit: int = 5) -> List[Dict[str, Any]]:
-        sym = symbol.upper()
-        now = datetime.now(timezone.utc)
+    def get_news(cls, symbol: str, limit: int = 5, refresh: bool = False) -> List[Dict[str, Any]]:
+        if refresh:
+            return cls._cache.refresh(symbol.upper(), limit, cls._from_yfinance)
+        return cls._cache.get(symbol.upper(), limit, cls._from_yfinance)
 
-        cached = cls._cache.get(sym)
-        if cached and (now - cached["time"] < cls._ttl):
-            return cached["data"][:limit]
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        return cls._cache.stats()
 
-        items = cls._from_yfinance(sym, limit)
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.news_fetch_concurrency),
+                thread_name_prefix="news",
+            )
+        return cls._executor
 
-        cls._cache[sym] = {"data": items, "time": now}
-        return items
+    @classmethod
+    async def get_news_many(
+        cls,
+        symbols: Iterable[str],
+        limit: int = 5,
+        timeout: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        refresh: bool = False,
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Fetch news for several symbols concurrently without blocking the event loop.
+
+        At most ``concurrency`` (default ``news_fetch_concurrency``) symbols are fetched
+        at once on a dedicated thread pool; ``refresh`` bypasses the news cache. A symbol that takes longer than ``timeout`` seconds maps to ``None``
+        (and one that fails to an empty list) so the others can still be returned.
+        """
+        timeout = settings.news_symbol_timeout_seconds if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        executor = cls._get_executor()
+        concurrency = settings.news_fetch_concurrency if concurrency is None else concurrency
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(sym: str):
+            async with semaphore:
+                try:
+                    items = await asyncio.wait_for(
+                        loop.run_in_executor(executor, cls.get_news, sym, limit, refresh), timeout
+                    )
+                    return sym, items
+                except asyncio.TimeoutError:
+                    logger.warning("NewsService: timed out after %.1fs fetching news for %s", timeout, sym)
+                except Exception as e:
+                    logger.error("NewsService: failed to get news for %s: %s", sym, e)
+                    return sym, []
+                return sym, None
+
+        symbols_upper = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        return dict(await asyncio.gather(*(fetch(sym) for sym in symbols_upper)))
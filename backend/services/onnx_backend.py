@@ -0,0 +1,208 @@
+import argparse
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Sequence
+
+import joblib
+import numpy as np
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NCF_ONNX = "ncf_scorer.onnx"
+LSTM_ONNX = "lstm.onnx"
+DEFAULT_OPSET = 17
+
+
+def _session(path: str):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    if settings.onnx_num_threads > 0:
+        options.intra_op_num_threads = settings.onnx_num_threads
+    return ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+
+class OnnxNCFScorer:
+    """
+    ``NCFScorer`` served by onnxruntime.
+
+    The exported graph already holds the cached asset block, so a request runs the
+    user projection and MLP head only. Scores come back in ``asset_id_to_index`` key
+    order, as with the torch scorer.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._session = _session(path)
+
+    def score_batch(self, user_ids, user_feats) -> np.ndarray:
+        return self._session.run(
+            None,
+            {
+                "user_ids": np.asarray(user_ids, dtype=np.int64),
+                "user_feats": np.asarray(user_feats, dtype=np.float32),
+            },
+        )[0]
+
+    def score(self, user_id, user_feat) -> np.ndarray:
+        return self.score_batch([user_id], np.asarray(user_feat)[np.newaxis, :])[0]
+
+
+class OnnxLSTMScorer:
+    """``LSTMScorer`` served by onnxruntime; the exported graph ends in the sigmoid."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._session = _session(path)
+
+    def score_batch(self, sequences, customer_indices) -> np.ndarray:
+        return self._session.run(
+            None,
+            {
+                "sequences": np.asarray(sequences, dtype=np.int64),
+                "customer_ids": np.asarray(customer_indices, dtype=np.int64),
+            },
+        )[0]
+
+
+def load_ncf_pipeline(model_path: str) -> Dict[str, Any]:
+    """The arrays and mappings ``setup_ncf_pipeline`` loads, with an ONNX scorer instead of the torch model."""
+    return {
+        'user_feat_array': np.load(os.path.join(model_path, 'user_feat_array.npy')),
+        'asset_feat_array': np.load(os.path.join(model_path, 'asset_feat_array.npy')),
+        'user_id_to_index': joblib.load(os.path.join(model_path, 'user_id_to_index.joblib')),
+        'asset_id_to_index': joblib.load(os.path.join(model_path, 'asset_id_to_index.joblib')),
+        'asset_id_to_isin': joblib.load(os.path.join(model_path, 'asset_id_to_isin.joblib')),
+        'bpr_model': None,
+        'scorer': OnnxNCFScorer(os.path.join(model_path, NCF_ONNX)),
+    }
+
+
+def load_lstm_pipeline(model_path: str, hyperparam_json_path: str) -> Dict[str, Any]:
+    """The mappings and hyperparameters ``setup_lstm_pipeline`` loads, with an ONNX scorer instead of the torch model."""
+    with open(hyperparam_json_path, 'r') as f:
+        hyperparams = json.load(f)
+    return {
+        'lstm_isin_to_idx': joblib.load(os.path.join(model_path, 'lstm_isin_to_idx.pkl')),
+        'lstm_idx_to_isin': joblib.load(os.path.join(model_path, 'lstm_idx_to_isin.pkl')),
+        'lstm_customer_to_idx': joblib.load(os.path.join(model_path, 'lstm_customer_to_idx.pkl')),
+        'embedding_dim': hyperparams.get("embedding_dim"),
+        'hidden_dim': hyperparams["hidden_dim"],
+        'num_assets': hyperparams.get("num_assets"),
+        'num_customers': hyperparams.get("num_customers"),
+        'output_size': hyperparams.get("output_size"),
+        'window_size': hyperparams.get("window_size"),
+        'padding_idx': hyperparams.get("padding_idx", 0),
+        'lstm_model': None,
+        'lstm_scorer': OnnxLSTMScorer(os.path.join(model_path, LSTM_ONNX)),
+    }
+
+
+def export(model_path: str, hyperparam_json_path: str, opset: int = DEFAULT_OPSET, check_sample: int = 256) -> Dict[str, float]:
+    """
+    Export the float NCF scorer and LSTM from ``model_path`` to ONNX next to them.
+
+    Each graph takes a dynamic batch dimension. After writing, a random sample of
+    customers is scored by both torch and onnxruntime; returns the largest absolute
+    probability difference per model.
+    """
+    import torch
+
+    import models_integration as mi
+
+    ncf = mi.setup_ncf_pipeline(model_path)
+    lstm = mi.setup_lstm_pipeline(model_path, hyperparam_json_path)
+    ncf_scorer = mi.NCFScorer(ncf['bpr_model'], ncf['asset_id_to_index'], ncf['asset_feat_array'])
+    lstm_scorer = mi.LSTMScorer(lstm['lstm_model'])
+
+    class LSTMProbabilities(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, sequences, customer_ids):
+            return torch.sigmoid(self.model(sequences, customer_ids))
+
+    exports = {
+        "ncf": (
+            ncf_scorer.module(),
+            (torch.zeros(1, dtype=torch.long), torch.zeros((1, ncf['user_feat_array'].shape[1]))),
+            ["user_ids", "user_feats"],
+            NCF_ONNX,
+        ),
+        "lstm": (
+            LSTMProbabilities(lstm['lstm_model']).eval(),
+            (torch.zeros((1, lstm['window_size']), dtype=torch.long), torch.zeros(1, dtype=torch.long)),
+            ["sequences", "customer_ids"],
+            LSTM_ONNX,
+        ),
+    }
+    for name, (module, example, input_names, filename) in exports.items():
+        path = os.path.join(model_path, filename)
+        tmp_path = f"{path}.tmp"
+        torch.onnx.export(
+            module,
+            example,
+            tmp_path,
+            input_names=input_names,
+            output_names=["probabilities"],
+            dynamic_axes={input_name: {0: "batch"} for input_name in [*input_names, "probabilities"]},
+            opset_version=opset,
+            dynamo=False,
+        )
+        os.replace(tmp_path, path)
+        logger.info("Exported %s to %s", name, path)
+
+    rng = np.random.default_rng(0)
+    user_ids = np.array(list(ncf['user_id_to_index']))
+    user_ids = rng.choice(user_ids, size=min(check_sample, len(user_ids)), replace=False)
+    user_feats = ncf['user_feat_array'][[ncf['user_id_to_index'][user_id] for user_id in user_ids]]
+    customer_indices = rng.choice(
+        np.array(list(lstm['lstm_customer_to_idx'].values())),
+        size=min(check_sample, len(lstm['lstm_customer_to_idx'])),
+        replace=False,
+    )
+    sequences = rng.choice(
+        np.array(list(lstm['lstm_isin_to_idx'].values())), size=(len(customer_indices), lstm['window_size'])
+    )
+    onnx_ncf = OnnxNCFScorer(os.path.join(model_path, NCF_ONNX))
+    onnx_lstm = OnnxLSTMScorer(os.path.join(model_path, LSTM_ONNX))
+    return {
+        "ncf": float(np.max(np.abs(
+            onnx_ncf.score_batch(user_ids, user_feats) - ncf_scorer.score_batch(user_ids, user_feats)
+        ))),
+        "lstm": float(np.max(np.abs(
+            onnx_lstm.score_batch(sequences, customer_indices) - lstm_scorer.score_batch(sequences, customer_indices)
+        ))),
+    }
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export the NCF and LSTM recommenders to ONNX for RECOMMENDATION_BACKEND=onnx.",
+    )
+    parser.add_argument("--opset", type=int, default=DEFAULT_OPSET, help="ONNX opset version.")
+    parser.add_argument(
+        "--check-sample",
+        type=int,
+        default=256,
+        help="Customers scored by both torch and onnxruntime to check the export.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import models_integration as mi
+
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args(argv)
+    differences = export(mi.MODEL_PATH, mi.HYPERPARAM_JSON_PATH, opset=args.opset, check_sample=args.check_sample)
+    for name, difference in differences.items():
+        print(f"{name:<5} max |onnx - torch| = {difference:.3g}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
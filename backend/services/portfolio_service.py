@@ -1,6 +1,6 @@
 import hashlib
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List
 
 import pandas as pd
 from fastapi import HTTPException, status
@@ -8,10 +8,10 @@ from fastapi import HTTPException, status
 from core.config import settings
 from core.firebase_app import get_firestore_client
 from schemas import PortfolioItemCreate, PortfolioItemUpdate
-from services import far_service
-from services.dataset_time_series_service import DatasetTimeSeriesService
+from services.dataset_time_series_service import get_dataset_service
+from services.position_engine import position_book
 
-dataset_service = DatasetTimeSeriesService()
+dataset_service = get_dataset_service()
 
 
 def _portfolio_collection(actor):
@@ -73,32 +73,6 @@ def _get_firestore_item(actor, item_id: str):
     return doc_ref, snapshot.to_dict()
 
 
-def _parse_timestamp(value) -> Optional[datetime]:
-  if value is None:
-    return None
-  if isinstance(value, datetime):
-    return value
-  if hasattr(value, "to_pydatetime"):
-    try:
-      return value.to_pydatetime()
-    except Exception:
-      value = str(value)
-  if not isinstance(value, str):
-    return None
-  value = value.strip()
-  if not value:
-    return None
-  try:
-    return datetime.fromisoformat(value)
-  except ValueError:
-    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d", "%d-%m-%Y"):
-      try:
-        return datetime.strptime(value, fmt)
-      except ValueError:
-        continue
-  return None
-
-
 def _make_synthetic_id(key: str) -> str:
   """Return a deterministic synthetic ID that is always a string for schema compatibility."""
   try:
@@ -109,111 +83,14 @@ def _make_synthetic_id(key: str) -> str:
 
 
 def _list_far_customer_portfolio(customer_id: str) -> List[Dict]:
-  dfs = far_service.load_dataframes()
-  tx_df = dfs.get("transactions")
-
-  if tx_df is None or tx_df.empty or "customerID" not in tx_df.columns:
+  positions = position_book.positions_for(customer_id)
+  if positions.empty:
     return []
 
-  tx_df = tx_df[tx_df["customerID"] == customer_id].copy()
-  if tx_df.empty:
-    return []
-
-  date_col = next((col for col in ["timestamp", "date", "txn_date", "transaction_date"] if col in tx_df.columns), None)
-  if date_col:
-    tx_df[date_col] = pd.to_datetime(tx_df[date_col], errors="coerce")
-    cutoff = pd.Timestamp("2022-10-29")
-    tx_df = tx_df[(tx_df[date_col].isna()) | (tx_df[date_col] <= cutoff)]
-    tx_df.sort_values(date_col, inplace=True)
-
-  positions: Dict[str, Dict[str, float]] = {}
-
-  for row in tx_df.itertuples():
-    isin = str(getattr(row, "ISIN", "")).strip()
-    if not isin:
-      continue
-
-    entry = positions.setdefault(
-      isin,
-      {
-        "position": 0.0,
-        "cost_basis": 0.0,
-        "realized_pl": 0.0,
-        "total_buy_qty": 0.0,
-        "total_buy_value": 0.0,
-        "total_sell_qty": 0.0,
-        "total_sell_value": 0.0,
-        "first_buy_at": None,
-        "first_tx_at": None,
-        "last_tx_at": None,
-        "last_price": None,
-      },
-    )
-
-    qty_raw = getattr(row, "units", None)
-    try:
-      qty = float(qty_raw)
-    except (TypeError, ValueError):
-      qty = 0.0
-    if qty <= 0:
-      continue
-
-    total_value_raw = getattr(row, "totalValue", None)
-    try:
-      total_value = float(total_value_raw)
-    except (TypeError, ValueError):
-      total_value = 0.0
-
-    timestamp_value = getattr(row, date_col) if date_col else None
-    timestamp = _parse_timestamp(timestamp_value)
-    price_per_unit = total_value / qty if qty else None
-
-    if timestamp:
-      if entry["first_tx_at"] is None or timestamp < entry["first_tx_at"]:
-        entry["first_tx_at"] = timestamp
-      if entry["last_tx_at"] is None or timestamp > entry["last_tx_at"]:
-        entry["last_tx_at"] = timestamp
-        if price_per_unit is not None:
-          entry["last_price"] = price_per_unit
-      elif price_per_unit is not None and timestamp == entry["last_tx_at"]:
-        entry["last_price"] = price_per_unit
-    elif entry["first_tx_at"] is None:
-      now = datetime.utcnow()
-      entry["first_tx_at"] = now
-      entry["last_tx_at"] = now
-      if price_per_unit is not None:
-        entry["last_price"] = price_per_unit
-    elif price_per_unit is not None:
-      entry["last_price"] = price_per_unit
-
-    tx_type = str(getattr(row, "transactionType", "")).strip().lower()
-    if tx_type == "sell":
-      if entry["position"] <= 0:
-        continue
-
-      avg_cost = entry["cost_basis"] / entry["position"] if entry["position"] else 0.0
-      shares_to_reduce = min(qty, entry["position"])
-
-      entry["position"] -= shares_to_reduce
-      entry["cost_basis"] -= avg_cost * shares_to_reduce
-      if entry["cost_basis"] < 0 and abs(entry["cost_basis"]) < 1e-6:
-        entry["cost_basis"] = 0.0
-      sell_price = price_per_unit if price_per_unit is not None else 0.0
-      entry["realized_pl"] += (sell_price - avg_cost) * shares_to_reduce
-      entry["total_sell_qty"] += qty
-      entry["total_sell_value"] += total_value
-    else:
-      entry["position"] += qty
-      entry["cost_basis"] += total_value
-      if timestamp and (entry["first_buy_at"] is None or timestamp < entry["first_buy_at"]):
-        entry["first_buy_at"] = timestamp
-      entry["total_buy_qty"] += qty
-      entry["total_buy_value"] += total_value
-
   items: List[Dict] = []
 
-  for isin, data in positions.items():
-    position = data["position"]
+  for data in positions.to_dict("records"):
+    isin = data["ISIN"]
     net_shares = data["total_buy_qty"] - data["total_sell_qty"]
     if net_shares < 0:
       net_shares = 0.0
@@ -241,10 +118,16 @@ def _list_far_customer_portfolio(customer_id: str) -> List[Dict]:
     else:
       avg_cost = 0.0
 
-    last_seen_date = data["last_tx_at"].date() if data["last_tx_at"] else None
+    first_tx_at = data["first_tx_at"] if pd.notna(data["first_tx_at"]) else None
+    last_tx_at = data["last_tx_at"] if pd.notna(data["last_tx_at"]) else None
+    if first_tx_at is None:
+      # Undated transactions only: treat them as seen now.
+      first_tx_at = last_tx_at = datetime.utcnow()
+
+    last_seen_date = last_tx_at.date()
     buy_date = last_seen_date
-    created_at = data["first_tx_at"] or datetime.utcnow()
-    updated_at = data["last_tx_at"] or created_at
+    created_at = first_tx_at
+    updated_at = last_tx_at
     if hasattr(created_at, "to_pydatetime"):
       created_at = created_at.to_pydatetime()
     if hasattr(updated_at, "to_pydatetime"):
@@ -266,8 +149,8 @@ def _list_far_customer_portfolio(customer_id: str) -> List[Dict]:
         "realized_pl": float(data["realized_pl"]),
         "remaining_cost": float(data["cost_basis"]),
         "synthetic": True,
-        "last_seen_price": float(data["last_price"]) if data["last_price"] is not None else None,
-        "last_seen_date": last_seen_date.isoformat() if last_seen_date else None,
+        "last_seen_price": float(data["last_price"]),
+        "last_seen_date": last_seen_date.isoformat(),
       }
     )
 
@@ -0,0 +1,244 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# FAR portfolios are reconstructed as of one month before the dataset ends.
+DEFAULT_CUTOFF = pd.Timestamp("2022-10-29")
+DATE_COLUMNS = ("timestamp", "date", "txn_date", "transaction_date")
+# Positions below this many units are treated as fully closed.
+POSITION_EPSILON = 1e-9
+
+POSITION_COLUMNS = [
+    "customerID",
+    "ISIN",
+    "position",
+    "cost_basis",
+    "realized_pl",
+    "total_buy_qty",
+    "total_buy_value",
+    "total_sell_qty",
+    "total_sell_value",
+    "first_tx_at",
+    "last_tx_at",
+    "last_price",
+    "first_seen",
+]
+
+
+def _prepare(
+    tx_df: pd.DataFrame,
+    customer_ids: Optional[Iterable[str]],
+    cutoff: Optional[pd.Timestamp],
+) -> Optional[pd.DataFrame]:
+    if tx_df is None or tx_df.empty or "customerID" not in tx_df.columns or "ISIN" not in tx_df.columns:
+        return None
+
+    date_col = next((col for col in DATE_COLUMNS if col in tx_df.columns), None)
+    columns = ["customerID", "ISIN"] + [
+        col for col in ("transactionType", "units", "totalValue", date_col) if col and col in tx_df.columns
+    ]
+    frame = tx_df[columns]
+    if customer_ids is not None:
+        wanted = {str(customer_id) for customer_id in customer_ids}
+        frame = frame[frame["customerID"].astype(str).isin(wanted)]
+
+    frame = pd.DataFrame(
+        {
+            "customerID": frame["customerID"].astype(str).to_numpy(),
+            "ISIN": frame["ISIN"].astype(str).str.strip().to_numpy(),
+            "is_sell": (
+                frame["transactionType"].astype(str).str.strip().str.lower().eq("sell").to_numpy()
+                if "transactionType" in frame.columns
+                else np.zeros(len(frame), dtype=bool)
+            ),
+            "qty": pd.to_numeric(frame.get("units"), errors="coerce").fillna(0.0).to_numpy(dtype=float)
+            if "units" in frame.columns
+            else np.zeros(len(frame)),
+            "value": pd.to_numeric(frame.get("totalValue"), errors="coerce").fillna(0.0).to_numpy(dtype=float)
+            if "totalValue" in frame.columns
+            else np.zeros(len(frame)),
+            "ts": pd.to_datetime(frame[date_col], errors="coerce").to_numpy(dtype="datetime64[ns]")
+            if date_col
+            else np.full(len(frame), np.datetime64("NaT"), dtype="datetime64[ns]"),
+        }
+    )
+
+    if date_col and cutoff is not None:
+        frame = frame[frame["ts"].isna() | (frame["ts"] <= cutoff)]
+    frame = frame[(frame["qty"] > 0) & (frame["ISIN"] != "") & (frame["ISIN"] != "nan")]
+    if frame.empty:
+        return None
+
+    # Chronological order per customer (undated rows last), then grouped per holding.
+    frame = frame.sort_values(["customerID", "ts"], kind="mergesort", na_position="last")
+    frame["seq"] = np.arange(len(frame))
+    return frame.sort_values(["customerID", "ISIN", "seq"], kind="mergesort").reset_index(drop=True)
+
+
+def compute_positions(
+    tx_df: pd.DataFrame,
+    customer_ids: Optional[Iterable[str]] = None,
+    cutoff: Optional[pd.Timestamp] = DEFAULT_CUTOFF,
+) -> pd.DataFrame:
+    """
+    Average-cost positions for every (customer, ISIN) in ``tx_df`` in one vectorised pass.
+
+    Buys add units and cost; sells reduce the position at the running average cost,
+    booking realized P&L, and are ignored while nothing is held (oversells are capped
+    at the held quantity). Returns one row per holding with the ``POSITION_COLUMNS``.
+    """
+    frame = _prepare(tx_df, customer_ids, cutoff)
+    if frame is None:
+        return pd.DataFrame(columns=POSITION_COLUMNS)
+
+    customers = frame["customerID"].to_numpy()
+    isins = frame["ISIN"].to_numpy()
+    is_sell = frame["is_sell"].to_numpy()
+    qty = frame["qty"].to_numpy()
+    value = frame["value"].to_numpy()
+
+    n = len(frame)
+    group_start = np.ones(n, dtype=bool)
+    group_start[1:] = (customers[1:] != customers[:-1]) | (isins[1:] != isins[:-1])
+    group_id = np.cumsum(group_start) - 1
+
+    # Position is a random walk reflected at zero: pos_t = S_t - min(0, min_{k<=t} S_k).
+    walk = pd.Series(np.where(is_sell, -qty, qty)).groupby(group_id).cumsum()
+    floor = np.minimum(walk.groupby(group_id).cummin().to_numpy(), 0.0)
+    position = walk.to_numpy() - floor
+    position[np.abs(position) < POSITION_EPSILON] = 0.0
+
+    prev_position = np.where(group_start, 0.0, np.roll(position, 1))
+    active_sell = is_sell & (prev_position > 0)
+    is_buy = ~is_sell
+
+    # Cost basis follows c_t = a_t * c_{t-1} + b_t: buys add their value, sells scale the
+    # basis by the fraction of units kept. Every full liquidation (a_t = 0) or new holding
+    # starts an episode, inside which the recurrence is solved with cumprod/cumsum.
+    ratio = np.ones(n)
+    np.divide(position, prev_position, out=ratio, where=active_sell)
+    added = np.where(is_buy, value, 0.0)
+    episode_start = group_start | (active_sell & (position == 0.0))
+    episode_id = np.cumsum(episode_start)
+    ratio = np.where(episode_start, 1.0, ratio)
+    scale = pd.Series(ratio).groupby(episode_id).cumprod().to_numpy()
+    scaled_sum = pd.Series(added / scale).groupby(episode_id).cumsum().to_numpy()
+    cost_basis = np.where(active_sell & (position == 0.0), 0.0, scale * scaled_sum)
+
+    prev_cost = np.where(group_start, 0.0, np.roll(cost_basis, 1))
+    sold = np.where(active_sell, prev_position - position, 0.0)
+    avg_cost = np.divide(prev_cost, prev_position, out=np.zeros(n), where=prev_position > 0)
+    sell_price = np.divide(value, qty, out=np.zeros(n), where=qty > 0)
+    realized = np.where(active_sell, (sell_price - avg_cost) * sold, 0.0)
+
+    rows = pd.DataFrame(
+        {
+            "group": group_id,
+            "realized_pl": realized,
+            "total_buy_qty": np.where(is_buy, qty, 0.0),
+            "total_buy_value": added,
+            "total_sell_qty": np.where(active_sell, qty, 0.0),
+            "total_sell_value": np.where(active_sell, value, 0.0),
+            "ts": frame["ts"].to_numpy(),
+            "seq": frame["seq"].to_numpy(),
+        }
+    )
+    grouped = rows.groupby("group", sort=True)
+    sums = grouped[["realized_pl", "total_buy_qty", "total_buy_value", "total_sell_qty", "total_sell_value"]].sum()
+
+    # The last row of each holding in chronological order carries the closing state; the
+    # last seen price comes from the latest dated row (undated rows sort after them).
+    first_rows = np.flatnonzero(group_start)
+    last_rows = np.flatnonzero(np.append(group_start[1:], True))
+    dated_counts = grouped["ts"].count().to_numpy()
+    price_rows = first_rows + np.maximum(dated_counts - 1, 0)
+    result = pd.DataFrame(
+        {
+            "customerID": customers[group_start],
+            "ISIN": isins[group_start],
+            "position": position[last_rows],
+            "cost_basis": cost_basis[last_rows],
+            "realized_pl": sums["realized_pl"].to_numpy(),
+            "total_buy_qty": sums["total_buy_qty"].to_numpy(),
+            "total_buy_value": sums["total_buy_value"].to_numpy(),
+            "total_sell_qty": sums["total_sell_qty"].to_numpy(),
+            "total_sell_value": sums["total_sell_value"].to_numpy(),
+            "first_tx_at": grouped["ts"].min().to_numpy(),
+            "last_tx_at": grouped["ts"].max().to_numpy(),
+            "last_price": np.divide(value[price_rows], qty[price_rows]),
+            "first_seen": grouped["seq"].min().to_numpy(),
+        }
+    )
+    return result.sort_values(["customerID", "first_seen"], kind="mergesort").reset_index(drop=True)
+
+
+class PositionBook:
+    """
+    Positions of every FAR customer, computed once and served per customer.
+
+    ``load`` runs ``compute_positions`` over the whole transactions table and records
+    each customer's row range, so ``positions_for`` is a dict lookup plus a slice.
+    """
+
+    def __init__(self, loader) -> None:
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._positions: Optional[pd.DataFrame] = None
+        self._offsets: Dict[str, tuple] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._positions is not None
+
+    def load(self) -> None:
+        with self._lock:
+            if self._positions is not None:
+                return
+            positions = compute_positions(self._loader())
+            self._offsets = {}
+            if not positions.empty:
+                customers = positions["customerID"].to_numpy()
+                starts = np.flatnonzero(np.append(True, customers[1:] != customers[:-1]))
+                ends = np.append(starts[1:], len(customers))
+                self._offsets = {
+                    str(customers[start]): (int(start), int(end))
+                    for start, end in zip(starts, ends)
+                }
+            self._positions = positions
+            logger.info(
+                "Position book built: %d holdings across %d customers",
+                len(positions),
+                len(self._offsets),
+            )
+
+    def positions_for(self, customer_id: str) -> pd.DataFrame:
+        if self._positions is None:
+            self.load()
+        bounds = self._offsets.get(str(customer_id).strip())
+        if bounds is None:
+            return self._positions.iloc[0:0]
+        return self._positions.iloc[bounds[0]:bounds[1]]
+
+    def customers(self) -> List[str]:
+        if self._positions is None:
+            self.load()
+        return list(self._offsets)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._positions = None
+            self._offsets = {}
+
+
+def _load_far_transactions() -> pd.DataFrame:
+    from services import far_service
+
+    return far_service.load_dataframes().get("transactions")
+
+
+position_book = PositionBook(_load_far_transactions)
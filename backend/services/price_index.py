@@ -0,0 +1,96 @@
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_DAY = np.timedelta64(1, "D")
+
+
+def _to_datetime64(value) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).to_datetime64(), "ns")
+
+
+class PriceIndex:
+    """
+    Close prices laid out as one contiguous, time-sorted slice per ISIN.
+
+    ``timestamps``/``prices`` hold every row grouped by ISIN; ``offsets`` maps an ISIN
+    to its ``[start, end)`` slice. Point-in-time lookups are a dict hit plus a
+    ``searchsorted`` on that slice instead of a mask over the whole table.
+    """
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        offsets: Dict[str, Tuple[int, int]],
+    ) -> None:
+        self.timestamps = timestamps
+        self.prices = prices
+        self.offsets = offsets
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "PriceIndex":
+        """Build from an ``ISIN``/``timestamp``/``closePrice`` frame (rows with NaNs are dropped)."""
+        frame = df.dropna(subset=["ISIN", "timestamp", "closePrice"])
+        isins = frame["ISIN"].astype(str).str.strip().to_numpy()
+        timestamps = frame["timestamp"].to_numpy(dtype="datetime64[ns]")
+        prices = frame["closePrice"].to_numpy(dtype=np.float64)
+
+        # Stable sort keeps the original row order for duplicate timestamps.
+        order = np.lexsort((timestamps, isins))
+        isins, timestamps, prices = isins[order], timestamps[order], prices[order]
+
+        offsets: Dict[str, Tuple[int, int]] = {}
+        if len(isins):
+            starts = np.concatenate(([0], np.flatnonzero(isins[1:] != isins[:-1]) + 1))
+            ends = np.append(starts[1:], len(isins))
+            offsets = {
+                str(isins[start]): (int(start), int(end))
+                for start, end in zip(starts, ends)
+            }
+        return cls(timestamps, prices, offsets)
+
+    def __contains__(self, isin: str) -> bool:
+        return isin in self.offsets
+
+    def isins(self) -> Iterable[str]:
+        return self.offsets.keys()
+
+    def last_dates(self) -> Dict[str, date]:
+        return {
+            isin: pd.Timestamp(self.timestamps[end - 1]).normalize().date()
+            for isin, (_, end) in self.offsets.items()
+        }
+
+    def latest(self, isin: str) -> Optional[Tuple[pd.Timestamp, float]]:
+        bounds = self.offsets.get(isin)
+        if bounds is None:
+            return None
+        position = bounds[1] - 1
+        return pd.Timestamp(self.timestamps[position]), float(self.prices[position])
+
+    def on_or_before(self, isin: str, target_date) -> Optional[Tuple[pd.Timestamp, float]]:
+        """Last price on ``target_date`` or, failing that, the closest earlier one."""
+        bounds = self.offsets.get(isin)
+        if bounds is None:
+            return None
+        start, end = bounds
+        cutoff = _to_datetime64(pd.Timestamp(target_date).normalize()) + _DAY
+        position = start + int(np.searchsorted(self.timestamps[start:end], cutoff, side="left")) - 1
+        if position < start:
+            return None
+        return pd.Timestamp(self.timestamps[position]), float(self.prices[position])
+
+    def range(self, isin: str, start_ts, end_ts) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and prices for ``isin`` within ``[start_ts, end_ts]`` (inclusive)."""
+        bounds = self.offsets.get(isin)
+        if bounds is None:
+            empty = np.empty(0)
+            return empty.astype("datetime64[ns]"), empty
+        start, end = bounds
+        window = self.timestamps[start:end]
+        lo = start + int(np.searchsorted(window, _to_datetime64(start_ts), side="left"))
+        hi = start + int(np.searchsorted(window, _to_datetime64(end_ts), side="right"))
+        return self.timestamps[lo:hi], self.prices[lo:hi]
@@ -0,0 +1,118 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.cache import SingleFlight, build_backend
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteCache:
+    """
+    Cache of upstream quote data with a TTL per field.
+
+    Fields are cached independently (e.g. a symbol's price for seconds, its company
+    name for a day). Misses go through a single-flight so concurrent requests for the
+    same field and symbol share one upstream call; batch lookups fetch all of their
+    misses with one ``load`` call. ``None`` results (unknown symbols, failed fetches)
+    are not cached.
+    """
+
+    def __init__(self, backend, ttls: Dict[str, float]) -> None:
+        self.backend = backend
+        self.ttls = ttls
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, field: str, hits: int, misses: int) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(field, {"hits": 0, "misses": 0})
+            counters["hits"] += hits
+            counters["misses"] += misses
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        try:
+            return self.backend.get(key)
+        except Exception as error:  # pragma: no cover - backend outage falls through to upstream
+            logger.warning("Quote cache read failed for %s: %s", key, error)
+            return None
+
+    def _store(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception as error:  # pragma: no cover - backend outage falls through to upstream
+            logger.warning("Quote cache write failed for %s: %s", key, error)
+
+    def get_many(
+        self,
+        field: str,
+        keys: Iterable[str],
+        load: Callable[[List[str]], Dict[str, Any]],
+        ttl_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Cached ``field`` values for ``keys``; misses are loaded together with ``load(missing)``."""
+        ttl = self.ttls[field] if ttl_seconds is None else ttl_seconds
+        results: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self._lookup(f"{field}:{key}")
+            if value is None:
+                missing.append(key)
+            else:
+                results[key] = value
+        self._count(field, len(results), len(missing))
+
+        if missing:
+            def load_and_store(flight_keys: List[tuple]) -> Dict[tuple, Any]:
+                values = load([key for _, key in flight_keys])
+                for flight_key in flight_keys:
+                    value = values.get(flight_key[1])
+                    if value is not None:
+                        self._store(f"{field}:{flight_key[1]}", value, ttl)
+                return {flight_key: values.get(flight_key[1]) for flight_key in flight_keys}
+
+            loaded = self._flight.do_many([(field, key) for key in missing], load_and_store)
+            results.update({key: value for (_, key), value in loaded.items()})
+        return results
+
+    def get(
+        self,
+        field: str,
+        key: str,
+        load: Callable[[], Any],
+        ttl_seconds: Optional[float] = None,
+    ) -> Any:
+        return self.get_many(field, [key], lambda keys: {key: load()}, ttl_seconds)[key]
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            fields = {}
+            for field, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                fields[field] = {**counters, "hit_rate": (counters["hits"] / lookups) if lookups else None}
+        return {
+            "fields": fields,
+            "upstream_loads": self._flight.leaders,
+            "coalesced": self._flight.coalesced,
+            "store": self.backend.stats(),
+        }
+
+
+quote_cache = QuoteCache(
+    build_backend(
+        settings.quote_cache_backend,
+        settings.quote_cache_redis_url,
+        settings.quote_cache_size,
+        prefix="quotes:",
+    ),
+    ttls={
+        "price": settings.quote_price_ttl_seconds,
+        "name": settings.quote_name_ttl_seconds,
+        "close": settings.quote_close_ttl_seconds,
+    },
+)
@@ -1,27 +1,14 @@
-from typing import List, Optional
-from models_integration import recommend
+from typing import List, Optional, Sequence, Tuple
+from models_integration import recommend, recommend_batch
 from services.cluster_popularity_service import get_top_assets_for_cluster
-import pandas as pd
-import os
+from core.dataset_registry import dataset_registry
+from core.config import settings
+from services.recommendation_store import get_recommendation_store
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-CUSTOMER_INFO_PATH = os.path.join(
-    BASE_DIR,
-    "datasets",
-    "customer_information_engineered_kMeans.csv",
-)
 
 # Optional: map FAR customers->cluster for safety
-_customer_cluster_df = None
 def _load_customer_clusters():
-    global _customer_cluster_df
-    if _customer_cluster_df is None:
-        _customer_cluster_df = pd.read_csv(
-            CUSTOMER_INFO_PATH,
-            usecols=["customerID", "cluster"],
-            dtype={"customerID": str},
-        )
-    return _customer_cluster_df
+    return dataset_registry.get("customer_clusters", columns=["customerID", "cluster"])
 
 
 def _infer_cluster_from_dataset(customer_id: str) -> Optional[int]:
@@ -32,12 +19,46 @@ def _infer_cluster_from_dataset(customer_id: str) -> Optional[int]:
     return int(row["cluster"].iloc[0])
 
 
+def _materialized(customer_id: str, existing_portfolio: List[str]):
+    store = get_recommendation_store()
+    if store is None:
+        return None
+    return store.get(customer_id, existing_portfolio)
+
+
+def _fallback(customer_id: str, existing_portfolio: List[str], cluster_id: Optional[int]):
+    # 1) use cluster passed from frontend (for synthetic/Firebase users)
+    if cluster_id is not None:
+        fallback = get_top_assets_for_cluster(cluster_id, existing_portfolio)
+        if fallback:
+            return fallback
+
+    # 2) Try infer from engineered dataset (for true FAR customers)
+    inferred_cluster = _infer_cluster_from_dataset(customer_id)
+    if inferred_cluster is not None:
+        fallback = get_top_assets_for_cluster(inferred_cluster, existing_portfolio)
+        if fallback:
+            return fallback
+
+    # 3) Last-resort: use cluster 1 (you can pick any default)
+    fallback = get_top_assets_for_cluster(1, existing_portfolio)
+    if fallback:
+        return fallback
+
+    # If we reach here, nothing worked
+    raise ValueError(
+        f"No recommendations available for customer '{customer_id}'."
+    )
+
+
 def get_recommendations(
     customer_id: str,
     existing_portfolio: List[str],
     cluster_id: Optional[int] = None,
 ):
     """
+    0) Serve precomputed recommendations if the nightly job materialized this
+       customer with the same existing portfolio.
     1) Try model-based recommendation via models_integration.recommend.
     2) If customer not found / error / empty, fallback:
         - If cluster_id given: top popular assets in that cluster.
@@ -47,6 +68,10 @@ def get_recommendations(
     # Normalize portfolio symbols
     existing_portfolio = [s for s in (existing_portfolio or []) if s]
 
+    recs = _materialized(customer_id, existing_portfolio)
+    if recs:
+        return recs
+
     # --- Primary: model-based recommendations ---
     try:
         recs = recommend(customer_id, existing_portfolio)
@@ -57,26 +82,56 @@ def get_recommendations(
         pass
 
     # --- Fallback: cluster-based popularity ---
+    return _fallback(customer_id, existing_portfolio, cluster_id)
 
-    # 1) use cluster passed from frontend (for synthetic/Firebase users)
-    if cluster_id is not None:
-        fallback = get_top_assets_for_cluster(cluster_id, existing_portfolio)
-        if fallback:
-            return fallback
 
-    # 2) Try infer from engineered dataset (for true FAR customers)
-    inferred_cluster = _infer_cluster_from_dataset(customer_id)
-    if inferred_cluster is not None:
-        fallback = get_top_assets_for_cluster(inferred_cluster, existing_portfolio)
-        if fallback:
-            return fallback
+def get_recommendations_batch(
+    requests: Sequence[Tuple[str, List[str], Optional[int]]],
+) -> List[Tuple[Optional[list], Optional[str]]]:
+    """
+    ``get_recommendations`` for many ``(customer_id, existing_portfolio, cluster_id)``
+    requests, returning ``(recommendations, error)`` per request in the same order.
 
-    # 3) Last-resort: use cluster 1 (you can pick any default)
-    fallback = get_top_assets_for_cluster(1, existing_portfolio)
-    if fallback:
-        return fallback
+    Customers not served from the materialized store are scored together through
+    ``models_integration.recommend_batch`` (one forward pass per model), then fall
+    back to cluster popularity one by one like the single endpoint.
+    """
+    requests = [
+        (str(customer_id), [s for s in (existing_portfolio or []) if s], cluster_id)
+        for customer_id, existing_portfolio, cluster_id in requests
+    ]
+    recs: List[Optional[list]] = [_materialized(customer_id, portfolio) for customer_id, portfolio, _ in requests]
 
-    # If we reach here, nothing worked
-    raise ValueError(
-        f"No recommendations available for customer '{customer_id}'."
-    )
+    # A customer can appear more than once with different portfolios, so score in
+    # rounds that each hold a customer at most once.
+    pending = [position for position, found in enumerate(recs) if not found]
+    while pending:
+        round_positions, later, seen = [], [], set()
+        for position in pending:
+            customer_id = requests[position][0]
+            (later if customer_id in seen else round_positions).append(position)
+            seen.add(customer_id)
+        try:
+            results = recommend_batch(
+                [requests[position][0] for position in round_positions],
+                {requests[position][0]: requests[position][1] for position in round_positions},
+                timeout=settings.recommendation_model_timeout_seconds,
+            )
+        except Exception:
+            results = {}
+        for position in round_positions:
+            result = results.get(requests[position][0])
+            if result and not isinstance(result, Exception):
+                recs[position] = result
+        pending = later
+
+    outcomes: List[Tuple[Optional[list], Optional[str]]] = []
+    for (customer_id, portfolio, cluster_id), found in zip(requests, recs):
+        if found:
+            outcomes.append((found, None))
+            continue
+        try:
+            outcomes.append((_fallback(customer_id, portfolio, cluster_id), None))
+        except ValueError as e:
+            outcomes.append((None, str(e)))
+    return outcomes
@@ -0,0 +1,225 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from core.config import settings
+from core.dataset_store import BACKEND_ROOT
+from core.files import FileSignature, file_signature
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(BACKEND_ROOT, "cache", "recommendations.parquet")
+DEFAULT_BATCH_SIZE = 512
+COLUMNS = ["customerID", "rank", "ISIN", "assetName", "score", "sharpe", "portfolio_key", "generated_at"]
+
+
+def portfolio_key(existing_portfolio: Optional[Sequence[str]]) -> str:
+    """Stable key of a portfolio; order matters because the LSTM reads it as a sequence."""
+    normalized = [isin for isin in (existing_portfolio or []) if isin]
+    return hashlib.sha1(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+def materialize(
+    customer_ids: Iterable[str],
+    portfolios: Optional[Dict[str, List[str]]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> pd.DataFrame:
+    """
+    Ranked recommendations for every customer, one row per recommended ISIN.
+
+    Customers are scored ``batch_size`` at a time through ``recommend_batch``;
+    customers none of the models know are left out so requests for them fall
+    through to the live path.
+    """
+    from models_integration import recommend_batch
+
+    portfolios = portfolios or {}
+    customer_ids = list(dict.fromkeys(str(customer_id) for customer_id in customer_ids))
+    generated_at = datetime.now(timezone.utc)
+    rows = []
+    skipped = 0
+    for start in range(0, len(customer_ids), max(1, batch_size)):
+        batch = customer_ids[start:start + batch_size]
+        # No per-model budget: the first batch also pays for loading the models lazily.
+        results = recommend_batch(
+            batch,
+            {customer_id: portfolios.get(customer_id, []) for customer_id in batch},
+            timeout=None,
+        )
+        for customer_id, recommendations in results.items():
+            if isinstance(recommendations, Exception):
+                skipped += 1
+                continue
+            key = portfolio_key(portfolios.get(customer_id))
+            for rank, (isin, asset_name, score, sharpe) in enumerate(recommendations, start=1):
+                rows.append((customer_id, rank, isin, asset_name, score, sharpe, key, generated_at))
+        logger.info("Materialized %d/%d customers", min(start + batch_size, len(customer_ids)), len(customer_ids))
+
+    if skipped:
+        logger.info("Skipped %d customers without recommendations", skipped)
+    frame = pd.DataFrame(rows, columns=COLUMNS)
+    return frame.astype({"score": float, "sharpe": float})
+
+
+class RecommendationStore:
+    """
+    Precomputed recommendations written by ``materialize``, served without the models.
+
+    The Parquet file is read lazily and re-read when it changes on disk (checked at
+    most every ``check_interval`` seconds). A row set is only served when it was
+    computed for the same existing portfolio the request sends.
+    """
+
+    def __init__(self, path: str, check_interval: float = 30.0) -> None:
+        self.path = path
+        self.check_interval = max(0.0, float(check_interval))
+        self._lock = threading.Lock()
+        self._signature: Optional[FileSignature] = None
+        self._last_checked = 0.0
+        self._entries: Dict[str, Tuple[str, List[list]]] = {}
+        self.generated_at: Optional[datetime] = None
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._signature is not None and now - self._last_checked < self.check_interval:
+            return
+        with self._lock:
+            self._last_checked = now
+            signature = file_signature([self.path])
+            if signature == self._signature:
+                return
+            entries: Dict[str, Tuple[str, List[list]]] = {}
+            generated_at = None
+            if os.path.exists(self.path):
+                try:
+                    frame = pd.read_parquet(self.path, columns=COLUMNS).sort_values(
+                        ["customerID", "rank"], kind="mergesort"
+                    )
+                except Exception as error:
+                    logger.warning("Could not read materialized recommendations %s: %s", self.path, error)
+                    return
+                for customer_id, group in frame.groupby("customerID", sort=False):
+                    entries[str(customer_id)] = (
+                        group["portfolio_key"].iloc[0],
+                        [
+                            [isin, None if pd.isna(name) else name, float(score), float(sharpe)]
+                            for isin, name, score, sharpe in zip(
+                                group["ISIN"], group["assetName"], group["score"], group["sharpe"]
+                            )
+                        ],
+                    )
+                if not frame.empty:
+                    generated_at = frame["generated_at"].max()
+            self._entries = entries
+            self.generated_at = generated_at
+            self._signature = signature
+
+    def get(self, customer_id: str, existing_portfolio: Optional[Sequence[str]] = None) -> Optional[List[list]]:
+        """``[[ISIN, assetName, score, sharpe], ...]`` for ``customer_id``, or ``None`` if not materialized."""
+        self._refresh()
+        entry = self._entries.get(str(customer_id))
+        if entry is None or entry[0] != portfolio_key(existing_portfolio):
+            return None
+        return [list(row) for row in entry[1]]
+
+    def stats(self) -> Dict[str, object]:
+        self._refresh()
+        return {
+            "path": self.path,
+            "customers": len(self._entries),
+            "generated_at": self.generated_at,
+        }
+
+
+_store: Optional[RecommendationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_recommendation_store() -> Optional[RecommendationStore]:
+    """The shared store, or ``None`` when ``USE_MATERIALIZED_RECOMMENDATIONS`` is off."""
+    global _store
+    if not settings.use_materialized_recommendations:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RecommendationStore(
+                    settings.recommendation_store_path or DEFAULT_PATH,
+                    check_interval=settings.model_reload_check_seconds,
+                )
+    return _store
+
+
+def _holdings() -> Dict[str, List[str]]:
+    """Open FAR positions per customer, in the order they were first bought."""
+    from services.position_engine import position_book
+
+    holdings: Dict[str, List[str]] = {}
+    for customer_id in position_book.customers():
+        held = position_book.positions_for(customer_id)
+        holdings[customer_id] = held.loc[held["position"] > 0, "ISIN"].astype(str).tolist()
+    return holdings
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Precompute top-k recommendations for every known customer into a Parquet table.",
+    )
+    parser.add_argument(
+        "--output",
+        default=settings.recommendation_store_path or DEFAULT_PATH,
+        help="Parquet file to write (defaults to backend/cache/recommendations.parquet).",
+    )
+    parser.add_argument(
+        "--portfolio",
+        choices=("empty", "holdings"),
+        default="empty",
+        help="Existing portfolio to score against: none, or each customer's open FAR positions.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Customers scored per forward pass.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Only materialize the first N customers (for trial runs).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from models_integration import get_customer_clusters
+
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args(argv)
+    customer_ids = get_customer_clusters()["customerID"].astype(str).drop_duplicates().tolist()
+    if args.limit is not None:
+        customer_ids = customer_ids[: args.limit]
+    portfolios = _holdings() if args.portfolio == "holdings" else {}
+
+    started = time.monotonic()
+    frame = materialize(customer_ids, portfolios, batch_size=args.batch_size)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    tmp_path = f"{args.output}.tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, args.output)
+    print(
+        f"wrote    {args.output} ({frame['customerID'].nunique()} customers, "
+        f"{len(frame)} rows, {time.monotonic() - started:.1f}s)"
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
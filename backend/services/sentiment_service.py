@@ -1,19 +1,94 @@
+import hashlib
 import logging
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime
-from nltk.sentiment import SentimentIntensityAnalyzer
+
+from core.cache import TTLCache
+from core.config import settings
+from models.sentiment_model import HeadlineSentiment, SymbolSentiment
 
 logger = logging.getLogger(__name__)
 
+def ensure_vader() -> None:
+    """Download the VADER lexicon if nltk cannot find it."""
+    import nltk
+
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon', quiet=True)
+
+
+def _headline_key(title: str) -> str:
+    # VADER is case- and punctuation-sensitive, so the exact text is hashed.
+    return hashlib.sha1(title.encode("utf-8")).hexdigest()
+
+
 class SentimentService:
-    _vader = SentimentIntensityAnalyzer()
+    # Built on first use: importing nltk takes ~2s, which would otherwise hit every worker boot.
+    _vader = None
+    _vader_lock = threading.Lock()
+    # A failed build (usually the lexicon download without network) is re-raised for
+    # this long instead of retrying the download on every request.
+    _vader_error: Optional[Exception] = None
+    _vader_failed_at = 0.0
+    VADER_RETRY_SECONDS = 300.0
+    # Compound score per headline text; scores never change, so entries only age out by LRU.
+    _scores = TTLCache(maxsize=settings.sentiment_cache_size, name="sentiment")
 
     @staticmethod
     def score_headline(title: str) -> float:
-        """Return VADER compound score (-1..1)."""
+        """Return VADER compound score (-1..1), memoised per headline text."""
         if not title:
             return 0.0
-        return SentimentService._vader.polarity_scores(title).get("compound", 0.0)
+        key = _headline_key(title)
+        score = SentimentService._scores.get(key)
+        if score is None:
+            score = SentimentService.analyzer().polarity_scores(title).get("compound", 0.0)
+            SentimentService._scores.set(key, score)
+        return score
+
+    @staticmethod
+    def analyzer():
+        """
+        The shared VADER analyzer, created on first call.
+
+        Importing nltk and possibly downloading the lexicon blocks, so async callers
+        should build it through ``run_in_threadpool`` first.
+        """
+        if SentimentService._vader is None:
+            with SentimentService._vader_lock:
+                if SentimentService._vader is None:
+                    failed_for = time.monotonic() - SentimentService._vader_failed_at
+                    if SentimentService._vader_error is not None and failed_for < SentimentService.VADER_RETRY_SECONDS:
+                        raise SentimentService._vader_error
+                    try:
+                        from nltk.sentiment import SentimentIntensityAnalyzer
+
+                        ensure_vader()
+                        SentimentService._vader = SentimentIntensityAnalyzer()
+                    except Exception as e:
+                        logger.error("Could not build the VADER analyzer: %s", e)
+                        SentimentService._vader_error = e
+                        SentimentService._vader_failed_at = time.monotonic()
+                        raise
+                    SentimentService._vader_error = None
+        return SentimentService._vader
+
+    @staticmethod
+    def is_loaded() -> bool:
+        return SentimentService._vader is not None
+
+    @staticmethod
+    def score_headlines(titles: Iterable[str]) -> Dict[str, float]:
+        """Score many headlines at once; each distinct title is scored (or looked up) once."""
+        return {title: SentimentService.score_headline(title) for title in dict.fromkeys(titles)}
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Optional[float]]:
+        return SentimentService._scores.stats()
 
     @staticmethod
     def to_label(compound: float) -> str:
@@ -36,3 +111,55 @@ class SentimentService:
         if score100 < -30:
             return "down"
         return "flat"
+
+    @staticmethod
+    def summarize(
+        symbol: str,
+        headlines_raw: List[Dict],
+        scores: Optional[Dict[str, float]] = None,
+        **extra,
+    ) -> SymbolSentiment:
+        """Score ``headlines_raw`` (NewsService items) into a ``SymbolSentiment``."""
+        scored: List[HeadlineSentiment] = []
+        for item in headlines_raw:
+            title = item.get("title") or ""
+            comp = scores[title] if scores is not None and title in scores else SentimentService.score_headline(title)
+            scored.append(HeadlineSentiment(
+                title=title,
+                score=comp,
+                score100=SentimentService.to_score100(comp),
+                label=SentimentService.to_label(comp),
+                url=item.get("link"),
+                source=item.get("publisher"),
+                published_at=item.get("published_at"),
+            ))
+
+        # Choose a representative "picked" headline:
+        # priority: newest; tie-breaker: highest absolute sentiment
+        picked = None
+        if scored:
+            scored_sorted = sorted(
+                scored,
+                key=lambda h: (
+                    h.published_at or datetime.min,  # newest first
+                    abs(h.score),                    # stronger sentiment
+                ),
+                reverse=True
+            )
+            picked = scored_sorted[0]
+            # summary could be mean of most recent 3 or picked only; keep simple:
+            summary_score100 = picked.score100
+            summary_label = picked.label
+        else:
+            summary_score100 = 0
+            summary_label = "Neutral"
+
+        return SymbolSentiment(
+            symbol=symbol,
+            summary_label=summary_label,
+            summary_score100=summary_score100,
+            direction=SentimentService.direction_from_score(summary_score100),
+            picked_headline=picked,
+            headlines=scored,
+            **extra,
+        )
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from constants.common_stocks import common_stocks
+from core.config import settings
+from core.firebase_app import get_firestore_client
+from services.news_service import NewsService
+from services.sentiment_service import SentimentService
+
+logger = logging.getLogger(__name__)
+
+
+def _portfolio_symbols() -> List[str]:
+    """Symbols held in any user's Firestore portfolio (empty if Firestore is unavailable)."""
+    try:
+        documents = (
+            get_firestore_client()
+            .collection_group(settings.firestore_portfolio_collection)
+            .select(["symbol"])
+            .stream()
+        )
+        return [str(doc.to_dict().get("symbol") or "").upper() for doc in documents]
+    except Exception as error:
+        logger.info("Sentiment watchlist: Firestore portfolios unavailable (%s)", error)
+        return []
+
+
+def default_watchlist() -> List[str]:
+    """
+    ``SENTIMENT_WATCHLIST`` if set, else symbols from Firestore portfolios, else the
+    curated ``common_stocks`` list, capped at ``sentiment_watchlist_limit`` symbols.
+    """
+    configured = [symbol.strip().upper() for symbol in settings.sentiment_watchlist.split(",")]
+    symbols = [symbol for symbol in configured if symbol]
+    if not symbols:
+        symbols = [symbol for symbol in _portfolio_symbols() if symbol]
+    if not symbols:
+        symbols = [symbol for symbol, _ in common_stocks]
+    return list(dict.fromkeys(symbols))[: settings.sentiment_watchlist_limit]
+
+
+class SentimentSnapshots:
+    """
+    Periodically refreshed headlines for a watchlist, served without upstream calls.
+
+    A daemon thread refreshes every ``interval`` seconds (randomly jittered by up to
+    ``jitter`` of the interval so several workers do not hit Yahoo in lockstep),
+    fetching at most ``concurrency`` symbols at a time and pre-scoring their
+    headlines. ``get`` only returns snapshots younger than ``max_age`` that hold at
+    least the requested number of headlines.
+    """
+
+    def __init__(
+        self,
+        depth: int,
+        interval: float,
+        jitter: float,
+        max_age: float,
+        concurrency: int,
+    ) -> None:
+        self.depth = depth
+        self.interval = interval
+        self.jitter = jitter
+        self.max_age = max_age
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Tuple[List[Dict[str, Any]], datetime]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_refresh: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+
+    def get(self, symbol: str, limit: int) -> Optional[Tuple[List[Dict[str, Any]], datetime]]:
+        """``(headlines[:limit], as_of)`` for a fresh snapshot of ``symbol``, else ``None``."""
+        if limit > self.depth:
+            return None
+        with self._lock:
+            snapshot = self._snapshots.get(symbol)
+        if snapshot is None:
+            return None
+        items, as_of = snapshot
+        if (datetime.now(timezone.utc) - as_of).total_seconds() > self.max_age:
+            return None
+        return items[:limit], as_of
+
+    async def refresh(self, symbols: List[str]) -> int:
+        """Refetch news for ``symbols`` and replace their snapshots; returns how many succeeded."""
+        started = time.monotonic()
+        news = await NewsService.get_news_many(
+            symbols,
+            limit=self.depth,
+            concurrency=self.concurrency,
+            refresh=True,
+        )
+        as_of = datetime.now(timezone.utc)
+        fetched = {symbol: items for symbol, items in news.items() if items is not None}
+        # Warm the sentiment memo so requests served from snapshots never run VADER.
+        SentimentService.score_headlines(
+            item.get("title") or "" for items in fetched.values() for item in items
+        )
+        with self._lock:
+            for symbol, items in fetched.items():
+                self._snapshots[symbol] = (items, as_of)
+        self.last_refresh = as_of
+        self.last_duration = time.monotonic() - started
+        logger.info(
+            "Sentiment snapshots refreshed for %d/%d symbols in %.1fs",
+            len(fetched),
+            len(news),
+            self.last_duration,
+        )
+        return len(fetched)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                asyncio.run(self.refresh(default_watchlist()))
+            except Exception as error:
+                logger.exception("Sentiment snapshot refresh failed: %s", error)
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            self._stop.wait(max(1.0, delay))
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sentiment-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            symbols = len(self._snapshots)
+        return {
+            "running": self._thread is not None and self._thread.is_alive() and not self._stop.is_set(),
+            "symbols": symbols,
+            "last_refresh": self.last_refresh,
+            "last_duration_seconds": self.last_duration,
+            "interval_seconds": self.interval,
+            "max_age_seconds": self.max_age,
+        }
+
+
+sentiment_snapshots = SentimentSnapshots(
+    depth=settings.sentiment_snapshot_depth,
+    interval=settings.sentiment_refresh_seconds,
+    jitter=settings.sentiment_refresh_jitter,
+    max_age=settings.sentiment_snapshot_max_age_seconds,
+    concurrency=settings.sentiment_refresh_concurrency,
+)
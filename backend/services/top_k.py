@@ -0,0 +1,96 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def top_k_batch(scores: np.ndarray, k: int, exclude: Optional[np.ndarray] = None) -> List[np.ndarray]:
+    """
+    Indices of the ``k`` highest scores in each row of ``scores`` (shape ``(batch, n)``).
+
+    ``exclude`` is a boolean mask broadcastable to ``scores``; excluded and NaN entries
+    are never returned, so a row may yield fewer than ``k`` indices. Selection is an
+    O(n) ``argpartition``; only the ``k`` winners are sorted (descending score, ties
+    by index).
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim != 2:
+        raise ValueError("scores must be a (batch, n) array")
+    batch, n = scores.shape
+    k = min(int(k), n)
+    if k <= 0:
+        return [np.empty(0, dtype=np.int64) for _ in range(batch)]
+
+    masked = np.where(np.isnan(scores), -np.inf, scores)
+    if exclude is not None:
+        masked = np.where(exclude, -np.inf, masked)
+
+    if k < n:
+        candidates = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), (batch, n))
+    winners = np.take_along_axis(masked, candidates, axis=1)
+
+    results = []
+    for row_candidates, row_scores in zip(candidates, winners):
+        order = np.lexsort((row_candidates, -row_scores))
+        row = row_candidates[order]
+        results.append(row[np.isfinite(row_scores[order])])
+    return results
+
+
+def top_k(scores: np.ndarray, k: int, exclude: Optional[np.ndarray] = None) -> np.ndarray:
+    """``top_k_batch`` for a single 1-D score vector."""
+    mask = None if exclude is None else np.asarray(exclude)[np.newaxis, :]
+    return top_k_batch(np.asarray(scores)[np.newaxis, :], k, mask)[0]
+
+
+class CandidateIndex:
+    """
+    The ISIN behind every position of a model's score vector.
+
+    Built once per loaded model; ``select`` turns raw scores into the top-k
+    ``(ISIN, score)`` pairs, excluding positions without an ISIN and the ISINs in
+    a customer's existing portfolio through a boolean mask.
+    """
+
+    def __init__(self, isins: Sequence[Optional[str]]) -> None:
+        self.isins = np.asarray(list(isins), dtype=object)
+        self.missing = np.array([not isin for isin in self.isins], dtype=bool)
+        self._index = pd.Index(self.isins)
+
+    def __len__(self) -> int:
+        return len(self.isins)
+
+    def exclusion_mask(self, existing: Optional[Iterable[str]] = None) -> np.ndarray:
+        mask = self.missing.copy()
+        if existing:
+            positions = self._index.get_indexer_for(list(dict.fromkeys(existing)))
+            mask[positions[positions >= 0]] = True
+        return mask
+
+    def select(
+        self,
+        scores: np.ndarray,
+        k: int,
+        existing: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        scores = np.asarray(scores)
+        return [
+            (self.isins[position], float(scores[position]))
+            for position in top_k(scores, k, self.exclusion_mask(existing))
+        ]
+
+    def select_batch(
+        self,
+        scores: np.ndarray,
+        k: int,
+        existing: Sequence[Optional[Iterable[str]]],
+    ) -> List[List[Tuple[str, float]]]:
+        """``select`` for a ``(batch, n)`` score matrix with one portfolio per row."""
+        scores = np.asarray(scores)
+        masks = np.stack([self.exclusion_mask(portfolio) for portfolio in existing])
+        return [
+            [(self.isins[position], float(row[position])) for position in positions]
+            for row, positions in zip(scores, top_k_batch(scores, k, masks))
+        ]
@@ -0,0 +1,152 @@
+import argparse
+import logging
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_MODES = ("eager", "torchscript", "quantized", "quantized_torchscript")
+
+
+def set_num_threads(num_threads: int) -> None:
+    """Pin torch's intra-op thread pool for this worker; ``0`` keeps torch's default."""
+    if num_threads and num_threads > 0 and torch.get_num_threads() != num_threads:
+        torch.set_num_threads(int(num_threads))
+        logger.info("torch intra-op threads set to %d", num_threads)
+
+
+def optimize(module: nn.Module, mode: str, example_inputs: Tuple[torch.Tensor, ...]) -> nn.Module:
+    """
+    CPU inference variant of ``module`` for the given mode.
+
+    ``quantized`` applies dynamic int8 quantization to the Linear and LSTM layers
+    (weights stored as int8, activations quantized on the fly); ``torchscript``
+    traces the module with ``example_inputs`` and freezes it. The two combine in
+    ``quantized_torchscript``. ``eager`` returns the module unchanged. The result is
+    only meant for ``torch.no_grad`` inference.
+    """
+    if mode not in INFERENCE_MODES:
+        raise ValueError(f"Unknown inference mode {mode!r}; expected one of {', '.join(INFERENCE_MODES)}")
+    module.eval()
+    if mode == "eager":
+        return module
+    if mode.startswith("quantized"):
+        module = torch.ao.quantization.quantize_dynamic(module, {nn.Linear, nn.LSTM}, dtype=torch.qint8)
+    if mode.endswith("torchscript"):
+        with torch.no_grad():
+            module = torch.jit.freeze(torch.jit.trace(module, example_inputs).eval())
+    return module
+
+
+def _recall(reference: np.ndarray, candidate: np.ndarray, k: int) -> float:
+    reference_top = np.argsort(-reference, axis=1, kind="stable")[:, :k]
+    candidate_top = np.argsort(-candidate, axis=1, kind="stable")[:, :k]
+    hits = [len(set(a) & set(b)) for a, b in zip(reference_top, candidate_top)]
+    return float(np.mean(hits)) / k
+
+
+def _latency(score, repeats: int) -> float:
+    score()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        score()
+    return (time.perf_counter() - started) / repeats * 1000.0
+
+
+def parity_report(
+    modes: Sequence[str] = INFERENCE_MODES,
+    sample: int = 256,
+    k: int = 10,
+    repeats: int = 20,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Compare every inference mode against the float eager models on the exported artifacts.
+
+    For a random sample of customers it reports, per model and mode, the largest
+    absolute probability difference, top-``k`` recall against the float ranking, and
+    the mean latency of scoring one customer and the whole sample.
+    """
+    import models_integration as mi
+
+    rng = np.random.default_rng(seed)
+    ncf = mi.setup_ncf_pipeline(mi.MODEL_PATH)
+    lstm = mi.setup_lstm_pipeline(mi.MODEL_PATH, mi.HYPERPARAM_JSON_PATH)
+
+    user_ids = np.array(list(ncf['user_id_to_index']))
+    user_ids = rng.choice(user_ids, size=min(sample, len(user_ids)), replace=False)
+    user_feats = ncf['user_feat_array'][[ncf['user_id_to_index'][user_id] for user_id in user_ids]]
+
+    customer_idx = torch.tensor(
+        rng.choice(np.array(list(lstm['lstm_customer_to_idx'].values())), size=min(sample, len(lstm['lstm_customer_to_idx'])), replace=False),
+        dtype=torch.long,
+    )
+    asset_idx = np.array(list(lstm['lstm_isin_to_idx'].values()))
+    sequences = torch.tensor(
+        rng.choice(asset_idx, size=(len(customer_idx), lstm['window_size'])), dtype=torch.long
+    )
+
+    def lstm_scores(model, sequence, customers):
+        with torch.no_grad():
+            return torch.sigmoid(model(sequence, customers)).numpy()
+
+    float_scorer = mi.NCFScorer(ncf['bpr_model'], ncf['asset_id_to_index'], ncf['asset_feat_array'])
+    reference = {
+        "ncf": float_scorer.score_batch(user_ids, user_feats),
+        "lstm": lstm_scores(lstm['lstm_model'], sequences, customer_idx),
+    }
+
+    report: Dict[str, Dict[str, Dict[str, Any]]] = {"ncf": {}, "lstm": {}}
+    for mode in modes:
+        scorer = mi.NCFScorer(ncf['bpr_model'], ncf['asset_id_to_index'], ncf['asset_feat_array'], mode=mode)
+        lstm_model = mi.optimize_lstm(lstm['lstm_model'], mode, lstm['window_size'])
+        runs = {
+            "ncf": (
+                lambda: scorer.score_batch(user_ids, user_feats),
+                lambda: scorer.score_batch(user_ids[:1], user_feats[:1]),
+            ),
+            "lstm": (
+                lambda: lstm_scores(lstm_model, sequences, customer_idx),
+                lambda: lstm_scores(lstm_model, sequences[:1], customer_idx[:1]),
+            ),
+        }
+        for name, (score_all, score_one) in runs.items():
+            scores = score_all()
+            report[name][mode] = {
+                "max_abs_diff": float(np.max(np.abs(scores - reference[name]))),
+                f"recall@{k}": _recall(reference[name], scores, k),
+                "ms_single": _latency(score_one, repeats),
+                f"ms_batch_{len(scores)}": _latency(score_all, repeats),
+            }
+    return report
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check the optimized recommender inference modes against the float models.",
+    )
+    parser.add_argument("--modes", nargs="+", choices=INFERENCE_MODES, default=list(INFERENCE_MODES))
+    parser.add_argument("--sample", type=int, default=256, help="Customers scored per model.")
+    parser.add_argument("--k", type=int, default=10, help="Cut-off for the recall check.")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed repetitions per measurement.")
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 keeps the default).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
+    set_num_threads(args.threads)
+    report = parity_report(args.modes, sample=args.sample, k=args.k, repeats=args.repeats)
+    for name, modes in report.items():
+        print(name)
+        for mode, metrics in modes.items():
+            details = "  ".join(f"{metric}={value:.4g}" for metric, value in metrics.items())
+            print(f"  {mode:<22} {details}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
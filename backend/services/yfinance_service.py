@@ -1,11 +1,13 @@
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import pandas as pd
-import yfinance as yf
 
 from constants.common_stocks import common_stocks
+from services.bar_store import get_bar_store
+from services.market_data import get_fetch_pool, get_provider
+from services.quote_cache import quote_cache
 
 logger = logging.getLogger(__name__)
 
@@ -33,26 +35,38 @@ class YFinanceService:
             logger.error("Error searching stocks: %s", error)
             return []
 
+    @staticmethod
+    def _fetch_latest_price(symbol_upper: str) -> float:
+        history = get_provider().history(symbol_upper, period="1d")
+        if history.empty:
+            raise ValueError(f"Invalid stock symbol: {symbol_upper}")
+        return round(float(history["Close"].iloc[-1]), 2)
+
+    @staticmethod
+    def _fetch_company_name(symbol_upper: str) -> str:
+        info = get_provider().info(symbol_upper)
+        return info.get("longName", info.get("shortName", symbol_upper))
+
     @staticmethod
     def get_realtime_stock_data(symbol: str) -> Dict[str, Any]:
         """
         Fetch real-time stock information including current price and company name.
+
+        The price and the (slow to fetch) company name are cached with separate TTLs.
         """
+        symbol_upper = symbol.upper()
         try:
-            ticker = yf.Ticker(symbol.upper())
-            history = ticker.history(period="1d")
-
-            if history.empty:
-                raise ValueError(f"Invalid stock symbol: {symbol}")
-
-            current_price = float(history["Close"].iloc[-1])
-            info = ticker.info
-            company_name = info.get("longName", info.get("shortName", symbol.upper()))
+            current_price = quote_cache.get(
+                "price", symbol_upper, lambda: YFinanceService._fetch_latest_price(symbol_upper)
+            )
+            company_name = quote_cache.get(
+                "name", symbol_upper, lambda: YFinanceService._fetch_company_name(symbol_upper)
+            )
 
             return {
-                "symbol": symbol.upper(),
+                "symbol": symbol_upper,
                 "name": company_name,
-                "currentPrice": round(current_price, 2),
+                "currentPrice": current_price,
             }
         except ValueError:
             raise
@@ -61,19 +75,13 @@ class YFinanceService:
             raise ValueError(f"Failed to fetch stock data: {error}")
 
     @staticmethod
-    def get_batch_realtime_prices(symbols: List[str]) -> Dict[str, Optional[float]]:
-        """
-        Fetch real-time prices for multiple stocks.
-        """
+    def _fetch_batch_prices(symbols: List[str]) -> Dict[str, Optional[float]]:
         results: Dict[str, Optional[float]] = {}
+        histories = get_fetch_pool().histories(symbols, period="1d")
 
-        for symbol in symbols:
-            symbol_upper = symbol.upper()
+        for symbol_upper, history in histories.items():
             try:
-                ticker = yf.Ticker(symbol_upper)
-                history = ticker.history(period="1d")
-
-                if not history.empty:
+                if history is not None and not history.empty:
                     results[symbol_upper] = round(float(history["Close"].iloc[-1]), 2)
                 else:
                     results[symbol_upper] = None
@@ -87,39 +95,71 @@ class YFinanceService:
         return results
 
     @staticmethod
-    def get_historical_price(symbol: str, target_date: date) -> Dict[str, Any]:
+    def get_batch_realtime_prices(symbols: List[str]) -> Dict[str, Optional[float]]:
         """
-        Fetch the closing price for a stock on or before the specified date.
+        Fetch real-time prices for multiple stocks.
+
+        Cached prices are served directly; the rest are requested together through
+        the shared fetch pool (one bulk download, per-symbol fallback with timeouts).
         """
-        try:
-            ticker = yf.Ticker(symbol.upper())
+        symbols_upper = [symbol.upper() for symbol in symbols]
+        return quote_cache.get_many("price", symbols_upper, YFinanceService._fetch_batch_prices)
 
-            start_date = target_date - timedelta(days=10)
+    @staticmethod
+    def _fetch_historical_close(symbol_upper: str, target_date: date) -> Dict[str, Any]:
+        start_date = target_date - timedelta(days=10)
+        store = get_bar_store()
+        if store is not None:
+            history = store.get_bars([symbol_upper], start_date, target_date)[symbol_upper]
+        else:
             end_date = target_date + timedelta(days=1)
-            history = ticker.history(
+            history = get_provider().history(
+                symbol_upper,
                 start=start_date.isoformat(),
                 end=end_date.isoformat(),
             )
 
-            if history.empty:
-                raise ValueError(
-                    f"No historical pricing data found for {symbol.upper()} "
-                    f"around {target_date.isoformat()}"
-                )
+        if history.empty:
+            raise ValueError(
+                f"No historical pricing data found for {symbol_upper} "
+                f"around {target_date.isoformat()}"
+            )
 
-            history = history[history.index.date <= target_date]
+        history = history[history.index.date <= target_date]
 
-            if history.empty:
-                raise ValueError(
-                    "No trading data available on or before "
-                    f"{target_date.isoformat()} for {symbol.upper()}"
-                )
+        if history.empty:
+            raise ValueError(
+                "No trading data available on or before "
+                f"{target_date.isoformat()} for {symbol_upper}"
+            )
 
-            last_row = history.iloc[-1]
-            close_price = round(float(last_row["Close"]), 2)
-            price_date = history.index[-1].date()
+        last_row = history.iloc[-1]
+        return {
+            "price": round(float(last_row["Close"]), 2),
+            "price_date": history.index[-1].date().isoformat(),
+        }
 
-            return {"price": close_price, "price_date": price_date}
+    @staticmethod
+    def get_historical_price(symbol: str, target_date: date) -> Dict[str, Any]:
+        """
+        Fetch the closing price for a stock on or before the specified date.
+
+        Closes for past dates are cached for a day; today's close is still moving and
+        is cached only as long as a real-time price.
+        """
+        symbol_upper = symbol.upper()
+        try:
+            ttl = None if target_date < datetime.utcnow().date() else quote_cache.ttls["price"]
+            cached = quote_cache.get(
+                "close",
+                f"{symbol_upper}:{target_date.isoformat()}",
+                lambda: YFinanceService._fetch_historical_close(symbol_upper, target_date),
+                ttl_seconds=ttl,
+            )
+            return {
+                "price": cached["price"],
+                "price_date": date.fromisoformat(cached["price_date"]),
+            }
         except ValueError:
             raise
         except Exception as error:  # pragma: no cover - defensive logging
@@ -131,26 +171,35 @@ class YFinanceService:
             )
             raise ValueError(f"Failed to fetch historical price: {error}")
 
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        return quote_cache.stats()
+
     @staticmethod
     def get_historical_series(
         symbols: List[str], start_date: date, end_date: date
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Fetch daily closing prices for multiple symbols within a date range.
+
+        With the bar store enabled, only the days not stored yet are downloaded and
+        the series is read back from local storage.
         """
         results: Dict[str, List[Dict[str, Any]]] = {}
-        inclusive_end = end_date + timedelta(days=1)
+        store = get_bar_store()
+        if store is not None:
+            histories = store.get_bars(symbols, start_date, end_date)
+        else:
+            inclusive_end = end_date + timedelta(days=1)
+            histories = get_fetch_pool().histories(
+                symbols,
+                start=start_date.isoformat(),
+                end=inclusive_end.isoformat(),
+            )
 
-        for symbol in symbols:
-            symbol_upper = symbol.upper()
+        for symbol_upper, history in histories.items():
             try:
-                ticker = yf.Ticker(symbol_upper)
-                history = ticker.history(
-                    start=start_date.isoformat(),
-                    end=inclusive_end.isoformat(),
-                )
-
-                if history.empty:
+                if history is None or history.empty:
                     logger.warning(
                         "No historical series found for %s between %s and %s",
                         symbol_upper,
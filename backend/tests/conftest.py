@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The backend is not an installed package; its modules import each other from
+# the backend directory (``from core.config import settings``).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
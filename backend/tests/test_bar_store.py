@@ -0,0 +1,57 @@
+from datetime import date
+
+import pandas as pd
+
+from services import bar_store
+from services.bar_store import BarStore
+
+
+class DailyPool:
+    """Fetch pool stub returning one bar per calendar day and recording each request."""
+
+    def __init__(self):
+        self.requests = []
+
+    def histories(self, symbols, period=None, start=None, end=None):
+        self.requests.append((tuple(symbols), start, end))
+        days = pd.date_range(start, end, inclusive="left")
+        frame = pd.DataFrame({column: 1.0 for column in bar_store.BAR_COLUMNS}, index=days)
+        return {symbol: frame for symbol in symbols}
+
+
+def make_store(tmp_path, monkeypatch):
+    pool = DailyPool()
+    monkeypatch.setattr(bar_store, "get_fetch_pool", lambda: pool)
+    return BarStore(str(tmp_path / "bars.sqlite")), pool
+
+
+def test_query_after_covered_range_fetches_the_days_in_between(tmp_path, monkeypatch):
+    store, pool = make_store(tmp_path, monkeypatch)
+    store.get_bars(["AAA"], date(2024, 1, 1), date(2024, 1, 10))
+    store.get_bars(["AAA"], date(2024, 2, 1), date(2024, 2, 5))
+
+    bars = store.get_bars(["AAA"], date(2024, 1, 1), date(2024, 2, 5))["AAA"]
+
+    assert len(bars) == 36
+    assert pool.requests[1] == (("AAA",), "2024-01-11", "2024-02-06")
+    assert len(pool.requests) == 2
+
+
+def test_query_before_covered_range_fetches_the_days_in_between(tmp_path, monkeypatch):
+    store, pool = make_store(tmp_path, monkeypatch)
+    store.get_bars(["AAA"], date(2024, 2, 1), date(2024, 2, 5))
+    store.get_bars(["AAA"], date(2024, 1, 1), date(2024, 1, 10))
+
+    bars = store.get_bars(["AAA"], date(2024, 1, 1), date(2024, 2, 5))["AAA"]
+
+    assert len(bars) == 36
+    assert pool.requests[1] == (("AAA",), "2024-01-01", "2024-02-01")
+    assert len(pool.requests) == 2
+
+
+def test_covered_range_is_not_fetched_again(tmp_path, monkeypatch):
+    store, pool = make_store(tmp_path, monkeypatch)
+    store.get_bars(["AAA", "BBB"], date(2024, 1, 1), date(2024, 1, 31))
+    store.get_bars(["AAA", "BBB"], date(2024, 1, 5), date(2024, 1, 20))
+
+    assert pool.requests == [(("AAA", "BBB"), "2024-01-01", "2024-02-01")]
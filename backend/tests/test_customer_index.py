@@ -0,0 +1,15 @@
+import pandas as pd
+
+from services.customer_index import CustomerIndex
+
+
+def test_padded_ids_match_in_both_tables():
+    transactions = pd.DataFrame({"customerID": ["C2 ", "C1", " C2", None, "C1"], "amount": [1, 2, 3, 4, 5]})
+    customers = pd.DataFrame({"customerID": [" C1", "C2"]})
+
+    index = CustomerIndex.build(transactions, customers)
+
+    assert "C1" in index and " C2 " in index
+    assert index.transactions_for(transactions, "C2")["amount"].tolist() == [1, 3]
+    assert index.transactions_for(transactions, " C1")["amount"].tolist() == [2, 5]
+    assert index.transactions_for(transactions, "C3").empty
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from services.market_data import FetchPool, StubProvider
+
+
+def closes(start, days):
+    index = pd.date_range(start, periods=days)
+    return pd.DataFrame({"Close": [float(day) for day in range(days)]}, index=index)
+
+
+def test_bulk_download_serves_the_whole_batch():
+    provider = StubProvider({"AAA": closes("2024-01-01", 10), "BBB": closes("2024-01-01", 10)})
+    pool = FetchPool(provider, workers=2)
+
+    histories = pool.histories(["aaa", "BBB"], start="2024-01-03", end="2024-01-06")
+
+    assert list(histories) == ["AAA", "BBB"]
+    assert [len(frame) for frame in histories.values()] == [3, 3]
+    assert provider.calls == [("download", ("AAA", "BBB"))]
+
+
+def test_symbols_missing_from_the_bulk_download_are_fetched_individually():
+    provider = StubProvider({"AAA": closes("2024-01-01", 10)})
+    pool = FetchPool(provider, workers=2)
+
+    histories = pool.histories(["AAA", "ZZZ"], period="5d")
+
+    assert len(histories["AAA"]) == 5
+    assert histories["ZZZ"].empty
+    assert provider.calls == [("download", ("AAA", "ZZZ")), ("history", "ZZZ")]
+
+
+def test_failed_bulk_download_falls_back_to_per_symbol_fetches():
+    provider = StubProvider({"AAA": closes("2024-01-01", 3), "BBB": closes("2024-01-01", 3)}, bulk=False)
+    pool = FetchPool(provider, workers=2)
+
+    histories = pool.histories(["AAA", "BBB"])
+
+    assert [len(frame) for frame in histories.values()] == [3, 3]
+    assert sorted(call for call in provider.calls if call[0] == "history") == [("history", "AAA"), ("history", "BBB")]
+
+
+def test_slow_symbol_times_out_without_holding_up_the_batch():
+    provider = StubProvider(
+        {"AAA": closes("2024-01-01", 3), "SLOW": closes("2024-01-01", 3)},
+        latency={"SLOW": 1.0},
+        bulk=False,
+    )
+    pool = FetchPool(provider, workers=2, symbol_timeout=0.2)
+
+    histories = pool.histories(["AAA", "SLOW"])
+
+    assert len(histories["AAA"]) == 3
+    assert histories["SLOW"] is None
@@ -0,0 +1,12 @@
+import pandas as pd
+
+from services.position_engine import PositionBook
+
+
+def test_empty_transactions_give_empty_positions():
+    for transactions in (None, pd.DataFrame()):
+        book = PositionBook(lambda: transactions)
+
+        assert book.positions_for("C1").empty
+        assert book.customers() == []
+        assert book.loaded